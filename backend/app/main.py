@@ -3,12 +3,32 @@ FastAPI application entry point.
 Mental Health Chatbot MVP - Backend API
 """
 
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from app.routes import auth, chat, mood, assessment
-from app.database import engine, Base
+from app.routes import admin, auth, chat, mood, assessment
+from app.database import engine, Base, async_session_maker
+from app.services.analysis_cache import analysis_cache
+from app.services.artifact_registry import artifact_registry, run_watch_loop
+from app.services.auth_cache import auth_cache
+from app.services.conversation_memory import conversation_memory
+from app.services.kv_context import kv_context_store
+from app.services.batching import intent_batcher, sentiment_batcher
+from app.services.embedding_service import embedding_executor, embedding_service
+from app.services.executor import ExecutorSaturated, nlp_executor, password_executor
+from app.services.llm import start_http_client, close_http_client
+from app.services.response_cache import response_cache
+from app.services.resource_index import run_refresh_loop
+from app.services.warmup import model_warmup
+
+model_warmup.record_import("app.main", (time.perf_counter() - _import_started) * 1000)
 
 
 @asynccontextmanager
@@ -17,8 +37,29 @@ async def lifespan(app: FastAPI):
     # Startup: Create database tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Startup: Open the pooled Ollama client
+    await start_http_client()
+    # Startup: Load models and the resource index concurrently in the
+    # background; routes that need them load lazily until they are warm
+    model_warmup.start()
+    refresh_task = asyncio.create_task(run_refresh_loop(async_session_maker))
+    # Startup: Watch for newly published model/lexicon/resource versions
+    artifact_task = asyncio.create_task(run_watch_loop())
     yield
     # Shutdown: cleanup if needed
+    refresh_task.cancel()
+    artifact_task.cancel()
+    await asyncio.gather(refresh_task, artifact_task, return_exceptions=True)
+    await model_warmup.stop()
+    await close_http_client()
+    await intent_batcher.close()
+    await sentiment_batcher.close()
+    await embedding_service.close()
+    # A warm-up load can still be blocked (e.g. retrying a model download);
+    # don't wait for it
+    nlp_executor.shutdown(wait=False)
+    embedding_executor.shutdown(wait=False)
+    password_executor.shutdown()
     await engine.dispose()
 
 
@@ -38,11 +79,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated):
+    """Shed load when a worker pool is full instead of queueing without bound."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # Mount routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(chat.router, prefix="/chat", tags=["Chat"])
 app.include_router(mood.router, prefix="/mood", tags=["Mood Tracking"])
 app.include_router(assessment.router, prefix="/assessment", tags=["Assessments"])
+app.include_router(admin.router, prefix="/admin", tags=["Admin"])
 
 
 @app.get("/", tags=["Health"])
@@ -59,3 +112,31 @@ async def root():
 async def health_check():
     """Health check endpoint for monitoring."""
     return {"status": "healthy"}
+
+
+@app.get("/ready", tags=["Health"])
+async def readiness(models: bool = False):
+    """
+    Readiness probe with per-model warm-up status, import times and the
+    active version of each hot-swappable artifact.
+
+    Ready as soon as startup finishes; with ?models=true, returns 503 until
+    every model is warm.
+    """
+    report = {**model_warmup.report(), "artifacts": artifact_registry.report()}
+    if models and not model_warmup.warm:
+        return JSONResponse(status_code=503, content={"status": "warming", **report})
+    return {"status": "ready", **report}
+
+
+@app.get("/health/cache", tags=["Health"])
+async def cache_stats():
+    """Hit-rate and memory counters for in-process caches."""
+    return {
+        "llm_responses": response_cache.stats(),
+        "query_embeddings": embedding_service.stats(),
+        "nlp_analysis": analysis_cache.stats(),
+        "auth": auth_cache.stats(),
+        "conversation_memory": conversation_memory.stats(),
+        "ollama_kv_contexts": kv_context_store.stats(),
+    }
@@ -0,0 +1,3 @@
+"""
+ML package - training data, model training and artifacts.
+"""
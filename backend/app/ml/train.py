@@ -0,0 +1,248 @@
+"""
+Intent model training script.
+Trains on ml/intents.json, evaluates, and publishes a versioned artifact.
+
+Steps: build the (pattern, tag) dataset, run stratified k-fold
+cross-validation, fit on all data, measure single-item and batched
+inference latency of the exported compact model, then write
+<artifact dir>/<version>/model.bin plus report.json.
+
+The new version is only published (CURRENT swapped) if its CV accuracy
+reaches --min-accuracy (also for the first version, which would replace
+the keyword fallback) and accuracy and p99 single-item latency have not
+regressed against the currently published report; otherwise the run
+exits non-zero and the version stays unpublished.
+
+Usage:
+    poetry run python -m app.ml.train [--folds 5] [--force] [--min-accuracy 0.6]
+        [--accuracy-tolerance 0.01] [--latency-tolerance 0.25]
+"""
+
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.services.intent import ARTIFACT_MODEL_FILE, INTENT_ARTIFACT_DIR, fit_intent_pipeline
+from app.services.intent_model import export_pipeline, load_model
+from app.utils import artifacts
+
+INTENTS_PATH = Path(__file__).parent / "intents.json"
+REPORT_FILE = "report.json"
+
+LATENCY_ROUNDS = 20  # passes over the dataset for single-item timing
+BATCH_SIZE = 32
+LATENCY_NOISE_FLOOR_MS = 0.05  # sub-0.1 ms p99s jitter; smaller increases never fail
+MIN_ACCURACY = 0.6  # absolute floor on mean CV accuracy, with or without a previous version
+
+
+def load_dataset(path: Path = INTENTS_PATH) -> List[Tuple[str, str]]:
+    """(pattern, tag) pairs from intents.json."""
+    with open(path) as f:
+        intents = json.load(f)["intents"]
+    return [(pattern, intent["tag"]) for intent in intents for pattern in intent["patterns"]]
+
+
+def cross_validate(data: List[Tuple[str, str]], folds: int) -> dict:
+    """Stratified k-fold accuracy and macro F1 of the training pipeline."""
+    from sklearn.metrics import accuracy_score, f1_score
+    from sklearn.model_selection import StratifiedKFold
+
+    texts = np.array([text for text, _ in data], dtype=object)
+    labels = np.array([label for _, label in data])
+    # Every fold needs each class at least once
+    smallest_class = min(np.unique(labels, return_counts=True)[1])
+    folds = max(2, min(folds, smallest_class))
+
+    accuracies, f1s = [], []
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=0)
+    for train_idx, test_idx in splitter.split(texts, labels):
+        model = fit_intent_pipeline(list(zip(texts[train_idx], labels[train_idx])))
+        predicted = model.predict(list(texts[test_idx]))
+        accuracies.append(accuracy_score(labels[test_idx], predicted))
+        f1s.append(f1_score(labels[test_idx], predicted, average="macro", zero_division=0))
+
+    return {
+        "folds": folds,
+        "accuracy_mean": round(float(np.mean(accuracies)), 4),
+        "accuracy_std": round(float(np.std(accuracies)), 4),
+        "macro_f1_mean": round(float(np.mean(f1s)), 4),
+        "fold_accuracies": [round(float(a), 4) for a in accuracies],
+    }
+
+
+def _percentiles(samples_ms: List[float]) -> dict:
+    p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+    return {"p50_ms": round(float(p50), 4), "p95_ms": round(float(p95), 4), "p99_ms": round(float(p99), 4)}
+
+
+def measure_latency(model, texts: List[str]) -> dict:
+    """Single-item and batched predict_proba latency of the served model."""
+    model.predict_proba(texts[:BATCH_SIZE])  # warm caches
+
+    single = []
+    for _ in range(LATENCY_ROUNDS):
+        for text in texts:
+            start = time.perf_counter()
+            model.predict_proba([text])
+            single.append((time.perf_counter() - start) * 1000)
+
+    batches = [texts[i:i + BATCH_SIZE] for i in range(0, len(texts), BATCH_SIZE)]
+    batched = []
+    for _ in range(LATENCY_ROUNDS):
+        for batch in batches:
+            start = time.perf_counter()
+            model.predict_proba(batch)
+            batched.append((time.perf_counter() - start) * 1000 / len(batch))
+
+    return {
+        "single": {"samples": len(single), **_percentiles(single)},
+        f"batch_{BATCH_SIZE}_per_item": {"samples": len(batched), **_percentiles(batched)},
+    }
+
+
+def check_regression(
+    report: dict,
+    previous: Optional[dict],
+    accuracy_tolerance: float,
+    latency_tolerance: float,
+    min_accuracy: float = MIN_ACCURACY,
+) -> List[str]:
+    """Reasons the new model must not be published (empty = OK)."""
+    failures = []
+    accuracy = report["cv"]["accuracy_mean"]
+    if accuracy < min_accuracy:
+        failures.append(f"accuracy {accuracy:.4f} < minimum {min_accuracy}")
+    if previous is None:
+        return failures
+    previous_accuracy = previous["cv"]["accuracy_mean"]
+    if accuracy < previous_accuracy - accuracy_tolerance:
+        failures.append(
+            f"accuracy {accuracy:.4f} < previous {previous_accuracy:.4f} - {accuracy_tolerance}"
+        )
+    p99, previous_p99 = report["latency"]["single"]["p99_ms"], previous["latency"]["single"]["p99_ms"]
+    if p99 > previous_p99 * (1 + latency_tolerance) and p99 - previous_p99 > LATENCY_NOISE_FLOOR_MS:
+        failures.append(
+            f"p99 latency {p99:.4f} ms > previous {previous_p99:.4f} ms * {1 + latency_tolerance}"
+        )
+    return failures
+
+
+def read_report(root: Path, version: Optional[str]) -> Optional[dict]:
+    if version is None:
+        return None
+    try:
+        with open(root / version / REPORT_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def train(
+    folds: int = 5,
+    force: bool = False,
+    accuracy_tolerance: float = 0.01,
+    latency_tolerance: float = 0.25,
+    min_accuracy: float = MIN_ACCURACY,
+    root: Path = INTENT_ARTIFACT_DIR,
+) -> Tuple[dict, List[str]]:
+    """Run the full training job; returns the report and any gate failures."""
+    import sklearn
+
+    # Step 1: Dataset
+    data = load_dataset()
+    texts = [text for text, _ in data]
+    print(f"📚 {len(data)} patterns, {len({label for _, label in data})} intents")
+
+    # Step 2: Cross-validation
+    cv = cross_validate(data, folds)
+    print(f"🧪 {cv['folds']}-fold accuracy {cv['accuracy_mean']:.4f} ± {cv['accuracy_std']:.4f}, "
+          f"macro F1 {cv['macro_f1_mean']:.4f}")
+
+    # Step 3: Final model, exported in the served (compact) format
+    root.mkdir(parents=True, exist_ok=True)
+    version = artifacts.next_version(root)
+    version_dir = root / version
+    version_dir.mkdir()
+    model_path = version_dir / ARTIFACT_MODEL_FILE
+    export_pipeline(fit_intent_pipeline(data), model_path)
+    model = load_model(model_path)
+
+    # Step 4: Latency of the artifact as served
+    latency = measure_latency(model, texts)
+    print(f"⏱️  single p50 {latency['single']['p50_ms']:.3f} ms, p99 {latency['single']['p99_ms']:.3f} ms")
+
+    previous_version = artifacts.read_current(root)
+    report = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "previous_version": previous_version,
+        "dataset": {
+            "path": INTENTS_PATH.name,
+            "sha256": hashlib.sha256(INTENTS_PATH.read_bytes()).hexdigest(),
+            "samples": len(data),
+            "classes": sorted({label for _, label in data}),
+        },
+        "model": {"format": "compact", "file": ARTIFACT_MODEL_FILE, **model.params},
+        "cv": cv,
+        "latency": latency,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sklearn": sklearn.__version__,
+            "machine": platform.machine(),
+        },
+    }
+
+    # Step 5: Accuracy floor and regression gate against the published version
+    failures = check_regression(
+        report, read_report(root, previous_version), accuracy_tolerance, latency_tolerance, min_accuracy
+    )
+    report["published"] = not failures or force
+    report["regressions"] = failures
+    with open(version_dir / REPORT_FILE, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if report["published"]:
+        artifacts.publish(root, version)
+        artifacts.prune(root)
+    return report, failures
+
+
+def main():
+    """Entry point for the script."""
+    parser = argparse.ArgumentParser(description="Train and publish the intent model")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--force", action="store_true", help="publish even if metrics regress")
+    parser.add_argument("--min-accuracy", type=float, default=MIN_ACCURACY,
+                        help="minimum mean CV accuracy, also for the first published version")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.01,
+                        help="allowed absolute drop in mean CV accuracy")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25,
+                        help="allowed relative increase in p99 single-item latency")
+    args = parser.parse_args()
+
+    report, failures = train(
+        folds=args.folds,
+        force=args.force,
+        accuracy_tolerance=args.accuracy_tolerance,
+        latency_tolerance=args.latency_tolerance,
+        min_accuracy=args.min_accuracy,
+    )
+    for failure in failures:
+        print(f"❌ Rejected: {failure}")
+    if not report["published"]:
+        print(f"❌ {report['version']} not published (use --force to override)")
+        sys.exit(1)
+    print(f"✅ Published intent model {report['version']} to {INTENT_ARTIFACT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,10 @@ Uses UUID for all primary keys.
 """
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 
-from sqlalchemy import String, Text, Integer, Float, Boolean, ForeignKey, DateTime, JSON
+from sqlalchemy import String, Text, Integer, Float, Boolean, ForeignKey, Date, DateTime, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -44,6 +44,19 @@ class Conversation(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
+    # Denormalized from messages so the history list never reads that table
+    # (filled for older rows by python -m app.utils.backfill_conversation_summaries)
+    message_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    last_message_preview: Mapped[Optional[str]] = mapped_column(String(200))
+    max_crisis_severity: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    # Rolling LLM memory (see services/conversation_memory.py)
+    memory_summary: Mapped[Optional[str]] = mapped_column(Text)
+    memory_summarized_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")  # Messages covered by the summary
+
+    # Keyset pagination of a user's history on (updated_at, id)
+    __table_args__ = (Index("ix_conversations_user_updated", "user_id", "updated_at", "id"),)
+
     # Relationships (One-to-Many)
     user: Mapped["User"] = relationship(back_populates="conversations")
     messages: Mapped[List["Message"]] = relationship(back_populates="conversation", cascade="all, delete-orphan")
@@ -66,6 +79,9 @@ class Message(Base):
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    # Keyset pagination of a conversation on (created_at, id)
+    __table_args__ = (Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),)
+
     # Relationships
     conversation: Mapped["Conversation"] = relationship(back_populates="messages")
 
@@ -80,10 +96,25 @@ class MoodEntry(Base):
     notes: Mapped[Optional[str]] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    # Mood history windows scan one user's entries by time
+    __table_args__ = (Index("ix_mood_entries_user_created", "user_id", "created_at"),)
+
     # Relationships
     user: Mapped["User"] = relationship(back_populates="mood_entries")
 
 
+class MoodDailyRollup(Base):
+    """Per-user, per-day (UTC) mood aggregates, updated with every logged entry."""
+    __tablename__ = "mood_daily_rollup"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    entry_count: Mapped[int] = mapped_column(Integer)
+    score_sum: Mapped[int] = mapped_column(Integer)
+    score_min: Mapped[int] = mapped_column(Integer)
+    score_max: Mapped[int] = mapped_column(Integer)
+
+
 class Assessment(Base):
     """PHQ-9 or other assessment results."""
     __tablename__ = "assessments"
@@ -118,3 +149,4 @@ class Resource(Base):
     is_crisis_resource: Mapped[bool] = mapped_column(Boolean, default=False)
     priority: Mapped[int] = mapped_column(Integer, default=0)  # Higher = show first
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
@@ -2,6 +2,6 @@
 Routes package - exports all routers.
 """
 
-from app.routes import auth, chat, mood, assessment
+from app.routes import admin, auth, chat, mood, assessment
 
-__all__ = ["auth", "chat", "mood", "assessment"]
+__all__ = ["admin", "auth", "chat", "mood", "assessment"]
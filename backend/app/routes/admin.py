@@ -0,0 +1,35 @@
+"""
+Admin routes - operational triggers (artifact reloads).
+
+Disabled unless ADMIN_TOKEN is set; callers send it in X-Admin-Token.
+"""
+
+import os
+import secrets
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.services.artifact_registry import artifact_registry
+
+router = APIRouter()
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+async def require_admin(x_admin_token: Annotated[Optional[str], Header()] = None) -> None:
+    """Dependency that checks the admin token."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+@router.post("/artifacts/reload", dependencies=[Depends(require_admin)])
+async def reload_artifacts(name: Optional[str] = None):
+    """Load newly published artifact versions now instead of waiting for the poll."""
+    try:
+        outcomes = await artifact_registry.check(name)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.args[0]))
+    return {"outcomes": outcomes, "artifacts": artifact_registry.report()}
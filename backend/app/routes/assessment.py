@@ -2,6 +2,7 @@
 Assessment routes - PHQ-9 and other mental health assessments.
 """
 
+import uuid
 from typing import Annotated, List
 
 from fastapi import APIRouter, Depends
@@ -9,9 +10,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import User, Assessment
+from app.models import Assessment
 from app.schemas import PHQ9Submit, AssessmentResult
-from app.routes.auth import get_current_user
+from app.routes.auth import get_current_user_id
 
 router = APIRouter()
 
@@ -81,7 +82,7 @@ def get_phq9_recommendations(severity: str, has_suicidal_ideation: bool) -> List
 @router.post("/phq9", response_model=AssessmentResult, status_code=201)
 async def submit_phq9(
     submission: PHQ9Submit,
-    current_user: Annotated[User, Depends(get_current_user)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -101,7 +102,7 @@ async def submit_phq9(
 
     # Save assessment
     assessment = Assessment(
-        user_id=current_user.id,
+        user_id=user_id,
         assessment_type="phq9",
         responses=responses_dict,
         total_score=total_score,
@@ -124,14 +125,14 @@ async def submit_phq9(
 
 @router.get("/history", response_model=List[AssessmentResult])
 async def get_assessment_history(
-    current_user: Annotated[User, Depends(get_current_user)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     db: AsyncSession = Depends(get_db),
     limit: int = 10,
 ):
     """Get user's assessment history."""
     result = await db.execute(
         select(Assessment)
-        .where(Assessment.user_id == current_user.id)
+        .where(Assessment.user_id == user_id)
         .order_by(Assessment.created_at.desc())
         .limit(limit)
     )
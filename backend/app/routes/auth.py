@@ -5,17 +5,20 @@ Authentication routes - register, login, get current user.
 from datetime import datetime, timedelta
 from typing import Annotated
 import os
+import uuid
 
+import bcrypt
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import User
-from app.schemas import UserCreate, UserResponse, Token, TokenData
+from app.schemas import UserCreate, UserResponse, Token
+from app.services.auth_cache import UserSnapshot, auth_cache
+from app.services.executor import password_executor
 
 router = APIRouter()
 
@@ -24,18 +27,31 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_MAX_BYTES = 72  # bcrypt ignores (bcrypt>=5 rejects) anything longer
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(plain_password.encode()[:BCRYPT_MAX_BYTES], hashed_password.encode())
+    except ValueError:
+        return False  # Not a bcrypt hash
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode()[:BCRYPT_MAX_BYTES], bcrypt.gensalt()).decode()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password executor, off the event loop."""
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password executor, off the event loop."""
+    return await password_executor.run(get_password_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -46,52 +62,106 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Dependency to get current authenticated user."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_user_id(token: str) -> uuid.UUID:
+    """Verify the token and return its subject (cached until the token expires)."""
+    user_id = auth_cache.get_user_id(token)
+    if user_id is not None:
+        return user_id
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        subject = payload.get("sub")
+        if subject is None:
+            raise _credentials_exception()
+        user_id = uuid.UUID(str(subject))
+    except (JWTError, ValueError):
+        raise _credentials_exception()
+    auth_cache.set_user_id(token, user_id, payload.get("exp"))
+    return user_id
+
+
+async def get_current_user_snapshot(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_db),
+) -> UserSnapshot:
+    """Dependency for the authenticated user's cached snapshot (no query when warm)."""
+    user_id = _decode_user_id(token)
+    snapshot = auth_cache.get_user(user_id)
+    if snapshot is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise _credentials_exception()
+        snapshot = UserSnapshot.from_user(user)
+        auth_cache.set_user(snapshot)
+    if not snapshot.is_active:
+        raise _credentials_exception()
+    return snapshot
+
+
+async def get_current_user_id(
+    snapshot: Annotated[UserSnapshot, Depends(get_current_user_snapshot)],
+) -> uuid.UUID:
+    """Dependency for routes that only need the authenticated user's id."""
+    return snapshot.id
 
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Dependency to get current authenticated user.
+    
+    Always loads the ORM row (for routes that modify the user); prefer
+    get_current_user_id when only the id is needed.
+    """
+    user_id = _decode_user_id(token)
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
-    if user is None:
-        raise credentials_exception
+    if user is None or not user.is_active:
+        raise _credentials_exception()
+    auth_cache.set_user(UserSnapshot.from_user(user))
     return user
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
-    # Check if email already exists
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    if result.scalar_one_or_none():
+    # Check for an existing account first, so duplicates never cost a hash
+    result = await db.execute(
+        select(User.email).where((User.email == user_data.email) | (User.username == user_data.username))
+    )
+    taken = result.scalars().all()
+    # End the read transaction so the pooled connection isn't held while
+    # bcrypt runs
+    await db.commit()
+    if taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
+            detail="Email already registered" if user_data.email in taken else "Username already taken",
         )
 
+    hashed_password = await get_password_hash_async(user_data.password)
+
     # Create new user
     user = User(
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
-        display_name=user_data.display_name,
+        username=user_data.username,
+        hashed_password=hashed_password,
+        full_name=user_data.full_name,
     )
     db.add(user)
     await db.commit()
     await db.refresh(user)
-    return user
+    return _user_response(UserSnapshot.from_user(user))
 
 
 @router.post("/login", response_model=Token)
@@ -102,8 +172,11 @@ async def login(
     """Login and get access token."""
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
+    # End the read transaction so the pooled connection isn't held while
+    # bcrypt runs (expire_on_commit=False keeps user loaded)
+    await db.commit()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -111,13 +184,25 @@ async def login(
         )
 
     access_token = create_access_token(
-        data={"sub": user.id},
+        data={"sub": str(user.id)},
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
     )
-    return Token(access_token=access_token)
+    return Token(access_token=access_token, expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: Annotated[User, Depends(get_current_user)]):
+async def get_me(current_user: Annotated[UserSnapshot, Depends(get_current_user_snapshot)]):
     """Get current user info."""
-    return current_user
+    return _user_response(current_user)
+
+
+def _user_response(snapshot: UserSnapshot) -> UserResponse:
+    return UserResponse(
+        id=str(snapshot.id),
+        email=snapshot.email,
+        username=snapshot.username,
+        full_name=snapshot.full_name,
+        is_active=snapshot.is_active,
+        created_at=snapshot.created_at,
+        updated_at=snapshot.updated_at,
+    )
@@ -1,19 +1,24 @@
 """
-Chat routes - send messages, get conversation history.
+Chat routes - send messages, stream responses, get conversation history.
 """
 
-from typing import Annotated, List
+import json
+import uuid
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.models import User, Conversation, Message
-from app.schemas import MessageCreate, ChatResponse, ConversationResponse, MessageResponse
-from app.routes.auth import get_current_user
-from app.services.chatbot import process_message
+from app.database import get_db, async_session_maker
+from app.models import Conversation, Message
+from app.schemas import (
+    MessageCreate, ChatResponse, ConversationPage, ConversationResponse, ConversationSummary, MessagePage,
+)
+from app.routes.auth import get_current_user_id
+from app.services.chatbot import process_message, stream_message
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, before_cursor, encode_cursor
 
 router = APIRouter()
 
@@ -21,7 +26,7 @@ router = APIRouter()
 @router.post("/send", response_model=ChatResponse)
 async def send_message(
     message: MessageCreate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -33,7 +38,7 @@ async def send_message(
         result = await db.execute(
             select(Conversation).where(
                 Conversation.id == message.conversation_id,
-                Conversation.user_id == current_user.id,
+                Conversation.user_id == user_id,
             )
         )
         conversation = result.scalar_one_or_none()
@@ -43,7 +48,7 @@ async def send_message(
                 detail="Conversation not found",
             )
     else:
-        conversation = Conversation(user_id=current_user.id)
+        conversation = Conversation(user_id=user_id)
         db.add(conversation)
         await db.flush()
 
@@ -51,45 +56,152 @@ async def send_message(
     response = await process_message(
         user_message=message.content,
         conversation_id=conversation.id,
-        user_id=current_user.id,
+        user_id=user_id,
         db=db,
     )
 
     return response
 
 
-@router.get("/history", response_model=List[ConversationResponse])
+@router.post("/stream")
+async def stream_chat_message(
+    message: MessageCreate,
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Send a message and stream the chatbot response as Server-Sent Events.
+    
+    Events: "crisis" (first, only when crisis is detected), "token" (reply
+    text fragments), "done" (saved messages and timing metadata), or
+    "error" if processing fails mid-stream.
+    """
+    # Validate the conversation up front so a bad id is still a plain 404
+    conversation_id = None
+    if message.conversation_id:
+        result = await db.execute(
+            select(Conversation.id).where(
+                Conversation.id == message.conversation_id,
+                Conversation.user_id == user_id,
+            )
+        )
+        conversation_id = result.scalar_one_or_none()
+        if conversation_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found",
+            )
+
+    async def event_stream():
+        # The stream outlives the request-scoped session, so use its own
+        async with async_session_maker() as session:
+            try:
+                conv_id = conversation_id
+                if conv_id is None:
+                    conversation = Conversation(user_id=user_id)
+                    session.add(conversation)
+                    await session.flush()
+                    conv_id = conversation.id
+
+                async for event, data in stream_message(
+                    user_message=message.content,
+                    conversation_id=conv_id,
+                    user_id=user_id,
+                    db=session,
+                ):
+                    if event == "done":
+                        # Persist before telling the client we're done
+                        await session.commit()
+                    yield _format_sse(event, data)
+            except Exception as e:
+                await session.rollback()
+                print(f"Chat stream error: {e}")
+                yield _format_sse("error", {"detail": "Unable to complete the response"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _format_sse(event: str, data: dict) -> str:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/history", response_model=ConversationPage)
 async def get_conversations(
-    current_user: Annotated[User, Depends(get_current_user)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     db: AsyncSession = Depends(get_db),
-    limit: int = 20,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ):
-    """Get user's conversation history."""
+    """
+    Get user's conversation history, most recently updated first.
+    
+    Pass the returned next_cursor to get the following page. Rows come
+    from the conversations table alone (summary columns are denormalized).
+    """
+    query = select(Conversation).where(Conversation.user_id == user_id)
+    after = before_cursor(Conversation.updated_at, Conversation.id, cursor)
+    if after is not None:
+        query = query.where(after)
     result = await db.execute(
-        select(Conversation)
-        .where(Conversation.user_id == current_user.id)
-        .options(selectinload(Conversation.messages))
-        .order_by(Conversation.updated_at.desc())
-        .limit(limit)
+        query
+        .order_by(Conversation.updated_at.desc(), Conversation.id.desc())
+        .limit(limit + 1)
     )
     conversations = result.scalars().all()
-    return conversations
+
+    next_cursor = None
+    if len(conversations) > limit:
+        conversations = conversations[:limit]
+        last = conversations[-1]
+        next_cursor = encode_cursor(last.updated_at, last.id)
+    return ConversationPage(items=conversations, next_cursor=next_cursor)
 
 
 @router.get("/conversation/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
-    conversation_id: int,
-    current_user: Annotated[User, Depends(get_current_user)],
+    conversation_id: uuid.UUID,
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Get a specific conversation with its newest page of messages."""
+    conversation = await _get_owned_conversation(conversation_id, user_id, db)
+    messages = await _message_page(conversation_id, db, limit, cursor=None)
+    return ConversationResponse(
+        **ConversationSummary.model_validate(conversation).model_dump(),
+        messages=messages,
+    )
+
+
+@router.get("/conversation/{conversation_id}/messages", response_model=MessagePage)
+async def get_conversation_messages(
+    conversation_id: uuid.UUID,
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     db: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ):
-    """Get a specific conversation with all messages."""
+    """Get older messages of a conversation, newest first, from a next_cursor."""
+    await _get_owned_conversation(conversation_id, user_id, db)
+    return await _message_page(conversation_id, db, limit, cursor)
+
+
+async def _get_owned_conversation(
+    conversation_id: uuid.UUID,
+    user_id: uuid.UUID,
+    db: AsyncSession,
+) -> Conversation:
+    """The user's conversation, or a 404 (also for other users' conversations)."""
     result = await db.execute(
-        select(Conversation)
-        .where(
+        select(Conversation).where(
             Conversation.id == conversation_id,
-            Conversation.user_id == current_user.id,
+            Conversation.user_id == user_id,
         )
-        .options(selectinload(Conversation.messages))
     )
     conversation = result.scalar_one_or_none()
 
@@ -100,3 +212,29 @@ async def get_conversation(
         )
 
     return conversation
+
+
+async def _message_page(
+    conversation_id: uuid.UUID,
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str],
+) -> MessagePage:
+    """One page of a conversation's messages on (created_at, id), newest first."""
+    query = select(Message).where(Message.conversation_id == conversation_id)
+    after = before_cursor(Message.created_at, Message.id, cursor)
+    if after is not None:
+        query = query.where(after)
+    result = await db.execute(
+        query
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(limit + 1)
+    )
+    messages = result.scalars().all()
+
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        last = messages[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return MessagePage(items=messages, next_cursor=next_cursor)
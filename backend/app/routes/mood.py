@@ -1,18 +1,20 @@
 """
-Mood tracking routes - log mood, view history.
+Mood tracking routes - log mood, view history and summaries.
 """
 
 from datetime import datetime, timedelta
-from typing import Annotated, List
+import uuid
+from typing import Annotated, List, Literal
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import select, func
+from sqlalchemy import case, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import User, MoodEntry
-from app.schemas import MoodCreate, MoodResponse, MoodHistoryResponse
-from app.routes.auth import get_current_user
+from app.models import MoodDailyRollup, MoodEntry
+from app.schemas import MoodCreate, MoodResponse, MoodHistoryResponse, MoodSummaryBucket, MoodSummaryResponse
+from app.routes.auth import get_current_user_id
+from app.services.mood_rollup import merge_buckets, upsert_statement
 
 router = APIRouter()
 
@@ -20,16 +22,21 @@ router = APIRouter()
 @router.post("/log", response_model=MoodResponse, status_code=201)
 async def log_mood(
     mood: MoodCreate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     db: AsyncSession = Depends(get_db),
 ):
-    """Log a mood entry (1-10 scale)."""
+    """Log a mood entry (1-10 scale) and fold it into the daily rollup."""
     entry = MoodEntry(
-        user_id=current_user.id,
+        user_id=user_id,
         score=mood.score,
         notes=mood.notes,
     )
     db.add(entry)
+    await db.flush()
+    # Same transaction: the rollup commits (or rolls back) with the entry
+    await db.execute(upsert_statement(
+        db.get_bind().dialect.name, user_id, entry.created_at.date(), entry.score,
+    ))
     await db.commit()
     await db.refresh(entry)
     return entry
@@ -37,40 +44,79 @@ async def log_mood(
 
 @router.get("/history", response_model=MoodHistoryResponse)
 async def get_mood_history(
-    current_user: Annotated[User, Depends(get_current_user)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     db: AsyncSession = Depends(get_db),
     days: int = 30,
+    entries: bool = True,
 ):
-    """Get mood history for the past N days with trend analysis."""
+    """
+    Get mood history for the past N days with trend analysis.
+    
+    One query returns the entries together with the average and the
+    newer/older half averages the trend is based on. With entries=false
+    only the aggregates are returned (cheap enough to poll).
+    """
     since = datetime.utcnow() - timedelta(days=days)
+    ranked = _ranked_entries(user_id, since)
+    recent = ranked.c.rn * 2 <= ranked.c.n  # rn <= n // 2: the newer half
+    aggregates = (
+        func.count(),
+        func.avg(ranked.c.score),
+        func.avg(case((recent, ranked.c.score))),
+        func.avg(case((~recent, ranked.c.score))),
+    )
+
+    if not entries:
+        result = await db.execute(select(*aggregates))
+        count, average, recent_avg, older_avg = result.one()
+        return _history_response([], count, average, recent_avg, older_avg)
 
+    # Same aggregates as window functions over the whole window, repeated on every row
     result = await db.execute(
-        select(MoodEntry)
-        .where(
-            MoodEntry.user_id == current_user.id,
-            MoodEntry.created_at >= since,
+        select(
+            ranked.c.id, ranked.c.score, ranked.c.notes, ranked.c.created_at,
+            *(aggregate.over() for aggregate in aggregates),
         )
-        .order_by(MoodEntry.created_at.desc())
+        .order_by(ranked.c.rn)
     )
-    entries = result.scalars().all()
+    rows = result.all()
+    if not rows:
+        return _history_response([], 0, None, None, None)
+    _, _, _, _, count, average, recent_avg, older_avg = rows[0]
+    return _history_response(
+        [MoodResponse(id=row[0], score=row[1], notes=row[2], created_at=row[3]) for row in rows],
+        count, average, recent_avg, older_avg,
+    )
+
 
-    # Calculate average
-    avg_result = await db.execute(
-        select(func.avg(MoodEntry.score))
+def _ranked_entries(user_id: uuid.UUID, since: datetime):
+    """The user's entries since a time, numbered newest first (rn) with the total (n)."""
+    return (
+        select(
+            MoodEntry.id,
+            MoodEntry.score,
+            MoodEntry.notes,
+            MoodEntry.created_at,
+            func.row_number().over(order_by=(MoodEntry.created_at.desc(), MoodEntry.id.desc())).label("rn"),
+            func.count().over().label("n"),
+        )
         .where(
-            MoodEntry.user_id == current_user.id,
+            MoodEntry.user_id == user_id,
             MoodEntry.created_at >= since,
         )
+        .cte("ranked")
     )
-    average_score = avg_result.scalar()
 
-    # Determine trend (compare first half to second half)
-    trend = None
-    if len(entries) >= 4:
-        mid = len(entries) // 2
-        recent_avg = sum(e.score for e in entries[:mid]) / mid
-        older_avg = sum(e.score for e in entries[mid:]) / (len(entries) - mid)
 
+def _history_response(entries, count, average, recent_avg, older_avg) -> MoodHistoryResponse:
+    """Round the aggregates and derive the trend (newer half vs older half)."""
+    # Postgres returns avg() of integers as Decimal
+    average, recent_avg, older_avg = (
+        float(value) if value is not None else None for value in (average, recent_avg, older_avg)
+    )
+
+    trend = None
+    if count >= 4:
         if recent_avg > older_avg + 0.5:
             trend = "improving"
         elif recent_avg < older_avg - 0.5:
@@ -80,14 +126,59 @@ async def get_mood_history(
 
     return MoodHistoryResponse(
         entries=entries,
-        average_score=round(average_score, 1) if average_score else None,
+        entry_count=count,
+        average_score=round(average, 1) if average else None,
+        recent_average=round(recent_avg, 2) if recent_avg is not None else None,
+        older_average=round(older_avg, 2) if older_avg is not None else None,
         trend=trend,
     )
 
 
+@router.get("/summary", response_model=MoodSummaryResponse)
+async def get_mood_summary(
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    db: AsyncSession = Depends(get_db),
+    bucket: Literal["day", "week", "month"] = "day",
+    days: int = 30,
+):
+    """
+    Get mood aggregates per day, week or month for the past N days.
+    
+    Reads only the daily rollups (one row per day with entries), never the
+    raw mood entries. Whole UTC days are counted, including today.
+    """
+    since = (datetime.utcnow() - timedelta(days=days)).date()
+    result = await db.execute(
+        select(MoodDailyRollup)
+        .where(
+            MoodDailyRollup.user_id == user_id,
+            MoodDailyRollup.day >= since,
+        )
+        .order_by(MoodDailyRollup.day)
+    )
+    buckets = merge_buckets(result.scalars().all(), bucket)
+
+    entry_count = sum(b.entry_count for b in buckets)
+    return MoodSummaryResponse(
+        bucket=bucket,
+        buckets=[
+            MoodSummaryBucket(
+                start=b.start,
+                entry_count=b.entry_count,
+                average_score=round(b.average, 2),
+                min_score=b.score_min,
+                max_score=b.score_max,
+            )
+            for b in buckets
+        ],
+        entry_count=entry_count,
+        average_score=round(sum(b.score_sum for b in buckets) / entry_count, 1) if entry_count else None,
+    )
+
+
 @router.get("/today", response_model=List[MoodResponse])
 async def get_today_mood(
-    current_user: Annotated[User, Depends(get_current_user)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     db: AsyncSession = Depends(get_db),
 ):
     """Get today's mood entries."""
@@ -96,7 +187,7 @@ async def get_today_mood(
     result = await db.execute(
         select(MoodEntry)
         .where(
-            MoodEntry.user_id == current_user.id,
+            MoodEntry.user_id == user_id,
             MoodEntry.created_at >= today_start,
         )
         .order_by(MoodEntry.created_at.desc())
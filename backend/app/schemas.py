@@ -2,9 +2,13 @@
 Pydantic schemas for request/response validation.
 """
 
-from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field
+import uuid
+from datetime import date, datetime
+from typing import Annotated, Optional, List, Dict
+from pydantic import BaseModel, BeforeValidator, EmailStr, Field
+
+# ORM primary keys are uuid.UUID; responses carry them as strings
+UUIDStr = Annotated[str, BeforeValidator(lambda v: str(v) if isinstance(v, uuid.UUID) else v)]
 
 
 # ============== Auth Schemas ==============
@@ -25,7 +29,7 @@ class UserLogin(BaseModel):
 
 class UserResponse(BaseModel):
     """Schema for user info response."""
-    id: str # UUID as string
+    id: UUIDStr  # UUID as string
     email: EmailStr
     username: str
     full_name: Optional[str]
@@ -55,12 +59,12 @@ class TokenData(BaseModel):
 class MessageCreate(BaseModel):
     """Schema for sending a chat message."""
     content: str = Field(min_length=1, max_length=5000)
-    conversation_id: Optional[str] = None  # None = start new conversation (UUID as string)
+    conversation_id: Optional[uuid.UUID] = None  # None = start new conversation
 
 
 class MessageResponse(BaseModel):
     """Schema for message response."""
-    id: str  # UUID as string
+    id: UUIDStr  # UUID as string
     role: str  # "user" or "assistant"
     content: str
     detected_intent: Optional[str]
@@ -76,20 +80,41 @@ class ChatResponse(BaseModel):
     """Schema for chatbot response."""
     message: MessageResponse
     bot_response: MessageResponse
-    conversation_id: str  # UUID as string
+    conversation_id: UUIDStr  # UUID as string
     crisis_alert: Optional[dict] = None  # Included if crisis detected
+    stage_timings: Optional[Dict[str, float]] = None  # Milliseconds per pipeline stage
 
 
-class ConversationResponse(BaseModel):
-    """Schema for conversation with messages."""
-    id: str  # UUID as string
+class ConversationSummary(BaseModel):
+    """Schema for a conversation in the history list (no messages)."""
+    id: UUIDStr  # UUID as string
     title: Optional[str]
     created_at: datetime
-    messages: List[MessageResponse] = []
+    updated_at: datetime
+    message_count: int
+    last_message_preview: Optional[str]
+    max_crisis_severity: int  # 0-10 scale, highest of any message
 
     model_config = {"from_attributes": True}
 
 
+class ConversationPage(BaseModel):
+    """One page of conversations, most recently updated first."""
+    items: List[ConversationSummary]
+    next_cursor: Optional[str] = None  # None = no more pages
+
+
+class MessagePage(BaseModel):
+    """One page of messages, newest first."""
+    items: List[MessageResponse]
+    next_cursor: Optional[str] = None  # None = no more pages
+
+
+class ConversationResponse(ConversationSummary):
+    """Schema for a conversation with its newest page of messages."""
+    messages: MessagePage
+
+
 # ============== Mood Schemas ==============
 
 class MoodCreate(BaseModel):
@@ -100,7 +125,7 @@ class MoodCreate(BaseModel):
 
 class MoodResponse(BaseModel):
     """Schema for mood entry response."""
-    id: str  # UUID as string
+    id: UUIDStr  # UUID as string
     score: int
     notes: Optional[str]
     created_at: datetime
@@ -110,11 +135,31 @@ class MoodResponse(BaseModel):
 
 class MoodHistoryResponse(BaseModel):
     """Schema for mood history."""
-    entries: List[MoodResponse]
+    entries: List[MoodResponse] = []  # Empty when requested with entries=false
+    entry_count: int = 0
     average_score: Optional[float]
+    recent_average: Optional[float] = None  # Newer half of the entries
+    older_average: Optional[float] = None  # Older half of the entries
     trend: Optional[str]  # "improving", "stable", "declining"
 
 
+class MoodSummaryBucket(BaseModel):
+    """Mood aggregates for one day, week (starting Monday) or month."""
+    start: date
+    entry_count: int
+    average_score: float
+    min_score: int
+    max_score: int
+
+
+class MoodSummaryResponse(BaseModel):
+    """Schema for bucketed mood aggregates (read from daily rollups)."""
+    bucket: str  # "day", "week", "month"
+    buckets: List[MoodSummaryBucket]  # Oldest first
+    entry_count: int
+    average_score: Optional[float]
+
+
 # ============== Assessment Schemas ==============
 
 class PHQ9Response(BaseModel):
@@ -130,7 +175,7 @@ class PHQ9Submit(BaseModel):
 
 class AssessmentResult(BaseModel):
     """Schema for assessment result."""
-    id: str  # UUID as string
+    id: UUIDStr  # UUID as string
     assessment_type: str
     total_score: int
     severity_level: str
@@ -145,7 +190,7 @@ class AssessmentResult(BaseModel):
 
 class ResourceResponse(BaseModel):
     """Schema for resource response."""
-    id: str  # UUID as string
+    id: UUIDStr  # UUID as string
     title: str
     description: str
     category: str
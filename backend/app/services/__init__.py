@@ -1,24 +1,36 @@
 """
 Services package - exports all services.
+
+Exports are resolved lazily (PEP 562) so importing one service module
+doesn't import every other service and its ML dependencies.
 """
 
-from app.services.chatbot import process_message
-from app.services.crisis import detect_crisis, CrisisResult
-from app.services.sentiment import analyze_sentiment, SentimentResult
-from app.services.intent import classify_intent, IntentResult
-from app.services.llm import generate_response
-from app.services.embeddings import generate_embedding
-from app.services.resource_matcher import get_relevant_resources
-
-__all__ = [
-    "process_message",
-    "detect_crisis",
-    "CrisisResult",
-    "analyze_sentiment",
-    "SentimentResult",
-    "classify_intent",
-    "IntentResult",
-    "generate_response",
-    "generate_embedding",
-    "get_relevant_resources",
-]
+import importlib
+
+_EXPORTS = {
+    "process_message": "app.services.chatbot",
+    "detect_crisis": "app.services.crisis",
+    "CrisisResult": "app.services.crisis",
+    "analyze_sentiment": "app.services.sentiment",
+    "SentimentResult": "app.services.sentiment",
+    "classify_intent": "app.services.intent",
+    "IntentResult": "app.services.intent",
+    "generate_response": "app.services.llm",
+    "generate_embedding": "app.services.embeddings",
+    "get_relevant_resources": "app.services.resource_matcher",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
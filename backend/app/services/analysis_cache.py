@@ -0,0 +1,135 @@
+"""
+NLP analysis cache service.
+Memoizes the intent/sentiment/crisis triple for short, frequent messages.
+
+Much of the traffic is "hi", "thanks", "ok" or "not really", and each of
+those used to pay for three executor hand-offs. Short messages are keyed
+on their case- and whitespace-folded text plus the active intent model,
+sentiment lexicon and crisis lexicon versions, so publishing a new model
+or lexicon simply stops old entries from matching.
+
+Crisis safety:
+- Results with any crisis signal (severity > 0, matched keywords or a
+  "crisis" intent) are never stored, so they are always re-derived.
+- Every hit re-runs crisis detection on the raw message (a few
+  microseconds for a short text). A hit whose fresh result is
+  crisis-positive is dropped and counted as an audit failure.
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from app.services import crisis, intent, sentiment
+from app.services.crisis import CrisisResult, detect_crisis
+from app.services.intent import IntentResult
+from app.services.sentiment import SentimentResult
+from app.utils.cache import LRUCache
+
+# Cache configuration
+ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "2048"))
+ANALYSIS_CACHE_MAX_CHARS = int(os.getenv("ANALYSIS_CACHE_MAX_CHARS", "64"))  # Longer messages are rarely repeated
+
+
+@dataclass
+class Analysis:
+    """Intent, sentiment and crisis results for one message."""
+    intent: IntentResult
+    sentiment: SentimentResult
+    crisis: CrisisResult
+    cost_ms: float = 0.0  # Analysis stage time of the original (uncached) run
+
+
+def is_crisis_positive(intent_result: IntentResult, crisis_result: CrisisResult) -> bool:
+    return (
+        crisis_result.severity > 0
+        or bool(crisis_result.matched_keywords)
+        or intent_result.label == "crisis"
+    )
+
+
+def _sizeof_analysis(analysis: Analysis) -> int:
+    return (
+        sys.getsizeof(analysis)
+        + sys.getsizeof(analysis.intent) + sys.getsizeof(analysis.intent.alternatives)
+        + sys.getsizeof(analysis.sentiment)
+        + sys.getsizeof(analysis.crisis)
+    )
+
+
+class AnalysisCache:
+    """LRU cache of NLP analysis results for short messages."""
+
+    def __init__(
+        self,
+        maxsize: int = ANALYSIS_CACHE_SIZE,
+        max_chars: int = ANALYSIS_CACHE_MAX_CHARS,
+        enabled: bool = ANALYSIS_CACHE_ENABLED,
+    ):
+        self.max_chars = max_chars
+        self.enabled = enabled
+        self._entries = LRUCache(maxsize, sizeof=_sizeof_analysis)
+        self.skipped = 0  # Too long, or not stored because crisis-positive
+        self.audit_failures = 0
+        self.audit_ms = 0.0  # Time spent re-running crisis detection on hits
+        self.ms_saved = 0.0  # Analysis stage time hits did not have to spend
+
+    def key(self, text: str) -> Optional[Hashable]:
+        """Cache key for text, or None if it's not worth caching."""
+        if not self.enabled or len(text) > self.max_chars:
+            return None
+        normalized = " ".join(text.lower().split())
+        return (
+            normalized,
+            intent.model_version(),
+            sentiment.lexicon_version(),
+            crisis.lexicon_version(),
+        )
+
+    def get(self, text: str) -> Optional[Analysis]:
+        """Cached analysis for text with a freshly derived crisis result."""
+        key = self.key(text)
+        if key is None:
+            return None
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+
+        # Audit: crisis detection is cheap on short text, so it always runs
+        start = time.perf_counter()
+        fresh = detect_crisis(text)
+        self.audit_ms += (time.perf_counter() - start) * 1000
+        if is_crisis_positive(cached.intent, fresh):
+            print(f"Analysis cache audit failed for {key[0]!r}: severity {fresh.severity}")
+            self.audit_failures += 1
+            self._entries.pop(key)
+            return None
+
+        self.ms_saved += cached.cost_ms
+        return Analysis(cached.intent, cached.sentiment, fresh, cached.cost_ms)
+
+    def store(self, text: str, analysis: Analysis) -> None:
+        """Remember a completed analysis unless it carries any crisis signal."""
+        key = self.key(text)
+        if key is None or is_crisis_positive(analysis.intent, analysis.crisis):
+            self.skipped += 1
+            return
+        self._entries.set(key, analysis)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self._entries.stats(),
+            "skipped": self.skipped,
+            "audit_failures": self.audit_failures,
+            "audit_ms": round(self.audit_ms, 2),
+            "ms_saved": round(self.ms_saved, 2),
+        }
+
+
+analysis_cache = AnalysisCache()
@@ -0,0 +1,240 @@
+"""
+Artifact registry service.
+Hot-swaps published ML artifacts without restarting workers.
+
+Each artifact (intent model, crisis lexicon, crisis resource list) lives in
+a versioned directory with a CURRENT pointer (see app.utils.artifacts).
+When CURRENT changes - noticed by the poll loop or an admin trigger - the
+new version is loaded and validated off the event loop, then swapped in
+with a single assignment. Requests already running keep the object they
+started with; a version that fails validation is never activated.
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.schemas import ResourceResponse
+from app.services import crisis, intent, resource_matcher
+from app.services.crisis import CrisisLexicon
+from app.services.executor import nlp_executor
+from app.services.intent_model import load_model
+from app.utils import artifacts
+
+# Registry configuration
+ARTIFACT_ROOT = Path(os.getenv(
+    "ARTIFACT_ROOT",
+    str(Path(__file__).parent.parent / "ml" / "artifacts"),
+))
+ARTIFACT_POLL_SECONDS = float(os.getenv("ARTIFACT_POLL_SECONDS", "30"))  # 0 disables polling
+
+# Phrases any crisis lexicon must still flag, with their minimum severity
+CRISIS_CANARIES = {
+    "i want to kill myself": 8,
+    "i am thinking about suicide": 8,
+    "i overdosed last night": 9,
+    "i have been self-harming": 7,
+    "i feel hopelessness": 5,
+    "i am giving up on everything": 7,
+}
+
+# Phrases no crisis lexicon may flag, with their maximum severity
+CRISIS_NEGATIVE_CANARIES = {
+    "i have given up smoking": 0,
+    "i am a killer myself": 0,
+    "the sadness in that song": 0,
+}
+
+
+@dataclass
+class ArtifactSpec:
+    """How to load, validate and activate one kind of artifact."""
+    name: str
+    directory: Path
+    load: Callable[[Path], Any]  # version dir -> validated object; raises if invalid
+    activate: Callable[[Any, str], None]  # swap the object in as the given version
+    active_version: Callable[[], Optional[str]]
+
+
+@dataclass
+class ArtifactStatus:
+    """Outcome of the latest load attempt for one artifact."""
+    loaded_at: Optional[float] = None
+    load_ms: Optional[float] = None
+    last_error: Optional[str] = None
+    rejected_version: Optional[str] = None
+
+
+# ============== Loaders (run in a worker thread) ==============
+
+def _load_intent_model(version_dir: Path):
+    model = load_model(version_dir / intent.ARTIFACT_MODEL_FILE)
+    if len(model.classes_) == 0:
+        raise ValueError("intent model has no classes")
+    probabilities = model.predict_proba(["hello", "i feel anxious"])
+    if probabilities.shape != (2, len(model.classes_)) or abs(probabilities.sum(axis=1) - 1).max() > 1e-6:
+        raise ValueError("intent model produced invalid probabilities")
+    return model
+
+
+def _recycle_nlp_workers() -> None:
+    if nlp_executor.kind == "process":
+        # Worker processes hold their own copy; new ones load the intent
+        # model from CURRENT and get the parent's active crisis lexicon
+        nlp_executor.recycle()
+
+
+def _activate_intent_model(model, version: str) -> None:
+    intent.set_model(model, version)
+    _recycle_nlp_workers()
+
+
+def _load_crisis_lexicon(version_dir: Path) -> CrisisLexicon:
+    with open(version_dir / "lexicon.json") as f:
+        config = json.load(f)
+    keywords = config["keywords"]
+    for category, entry in keywords.items():
+        severity = entry.get("base_severity")
+        if not isinstance(severity, int) or not 0 <= severity <= 10:
+            raise ValueError(f"category {category!r} needs an integer base_severity in 0-10")
+        if not entry.get("keywords"):
+            raise ValueError(f"category {category!r} has no keywords")
+
+    lexicon = CrisisLexicon(
+        keywords,
+        config.get("negation_patterns", crisis.NEGATION_PATTERNS),
+        config.get("context_patterns", crisis.CONTEXT_PATTERNS),
+    )
+    for phrase, min_severity in CRISIS_CANARIES.items():
+        severity = crisis.detect_crisis(phrase, lexicon=lexicon).severity
+        if severity < min_severity:
+            raise ValueError(f"lexicon scores {phrase!r} {severity}, below {min_severity}")
+    for phrase, max_severity in CRISIS_NEGATIVE_CANARIES.items():
+        severity = crisis.detect_crisis(phrase, lexicon=lexicon).severity
+        if severity > max_severity:
+            raise ValueError(f"lexicon scores {phrase!r} {severity}, above {max_severity}")
+    return lexicon
+
+
+def _activate_crisis_lexicon(lexicon: CrisisLexicon, version: str) -> None:
+    crisis.install_lexicon(lexicon, version)
+    # detect_crisis runs in the workers with NLP_EXECUTOR=process
+    _recycle_nlp_workers()
+
+
+def _load_crisis_resources(version_dir: Path) -> List[ResourceResponse]:
+    with open(version_dir / "resources.json") as f:
+        entries = json.load(f)["resources"]
+    resources = [
+        ResourceResponse(**{**entry, "id": str(entry.get("id", "")), "tags": entry.get("tags") or []})
+        for entry in entries
+        if entry.get("is_crisis_resource")
+    ]
+    if not any(r.phone for r in resources):
+        raise ValueError("resources.json must include at least one crisis resource with a phone number")
+    return resources
+
+
+DEFAULT_SPECS = [
+    ArtifactSpec(
+        name="intent",
+        directory=intent.INTENT_ARTIFACT_DIR,
+        load=_load_intent_model,
+        activate=_activate_intent_model,
+        active_version=intent.model_version,
+    ),
+    ArtifactSpec(
+        name="crisis_lexicon",
+        directory=ARTIFACT_ROOT / "crisis_lexicon",
+        load=_load_crisis_lexicon,
+        activate=_activate_crisis_lexicon,
+        active_version=crisis.lexicon_version,
+    ),
+    ArtifactSpec(
+        name="resources",
+        directory=ARTIFACT_ROOT / "resources",
+        load=_load_crisis_resources,
+        activate=resource_matcher.set_crisis_resources,
+        active_version=resource_matcher.crisis_resources_version,
+    ),
+]
+
+
+class ArtifactRegistry:
+    """Watches artifact directories and swaps in newly published versions."""
+
+    def __init__(self, specs: List[ArtifactSpec]):
+        self.specs = {spec.name: spec for spec in specs}
+        self.status = {spec.name: ArtifactStatus() for spec in specs}
+        self._lock = asyncio.Lock()
+
+    async def check(self, name: Optional[str] = None) -> Dict[str, str]:
+        """
+        Load any artifact whose published version differs from the active one.
+
+        Returns {name: outcome} where outcome is "unchanged", "unpublished",
+        "swapped" or "rejected".
+        """
+        names = [name] if name is not None else list(self.specs)
+        unknown = [n for n in names if n not in self.specs]
+        if unknown:
+            raise KeyError(f"Unknown artifact {unknown[0]!r}")
+        # One reload at a time, so two triggers can't race on the same artifact
+        async with self._lock:
+            return {n: await self._check_one(self.specs[n]) for n in names}
+
+    async def _check_one(self, spec: ArtifactSpec) -> str:
+        status = self.status[spec.name]
+        published = artifacts.read_current(spec.directory)
+        if published is None:
+            return "unpublished"
+        if published == spec.active_version() or published == status.rejected_version:
+            return "unchanged"
+
+        start = time.perf_counter()
+        try:
+            loaded = await asyncio.to_thread(spec.load, spec.directory / published)
+        except Exception as e:
+            print(f"Artifact {spec.name} {published} rejected: {e}")
+            status.last_error = f"{published}: {e}"
+            status.rejected_version = published
+            return "rejected"
+
+        spec.activate(loaded, published)
+        status.loaded_at = time.time()
+        status.load_ms = round((time.perf_counter() - start) * 1000, 1)
+        status.last_error = None
+        status.rejected_version = None
+        return "swapped"
+
+    def report(self) -> dict:
+        report = {}
+        for name, spec in self.specs.items():
+            status = self.status[name]
+            report[name] = {
+                "version": spec.active_version(),
+                "published": artifacts.read_current(spec.directory),
+                "loaded_at": status.loaded_at,
+                "load_ms": status.load_ms,
+                "last_error": status.last_error,
+            }
+        return report
+
+
+artifact_registry = ArtifactRegistry(DEFAULT_SPECS)
+
+
+async def run_watch_loop(interval: float = ARTIFACT_POLL_SECONDS) -> None:
+    """Sync once, then poll artifact directories for new versions (until cancelled)."""
+    while True:
+        try:
+            await artifact_registry.check()
+        except Exception as e:
+            print(f"Artifact registry check failed: {e}")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
@@ -0,0 +1,154 @@
+"""
+Auth cache service.
+Caches verified JWT claims and user snapshots for request authentication.
+
+Every authenticated request used to verify the token signature and
+SELECT the user row. Verified tokens now map to their user id until the
+token expires, and user ids map to a lightweight UserSnapshot for
+AUTH_USER_CACHE_TTL seconds, so a warm request needs no query at all.
+
+Invalidation: ORM updates and deletes of a User drop its snapshot at
+flush and again after commit (a request that re-cached the row between
+the two can't keep pre-commit data). Bulk UPDATE statements bypass ORM
+events and must call auth_cache.invalidate_user(). The TTL bounds how
+long other worker processes, which this cache can't reach, stay stale.
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.models import User
+from app.utils.cache import LRUCache
+
+# Cache configuration
+AUTH_CACHE_ENABLED = os.getenv("AUTH_CACHE_ENABLED", "true").lower() == "true"
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "3600"))  # Seconds; never past token expiry
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))  # Seconds
+
+_PENDING_KEY = "auth_cache_invalidate"
+
+
+@dataclass
+class UserSnapshot:
+    """The user fields authentication and /auth/me need, detached from any session."""
+    id: uuid.UUID
+    email: str
+    username: str
+    full_name: Optional[str]
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+def _token_key(token: str) -> bytes:
+    """Tokens are credentials; only a digest is kept in memory."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class AuthCache:
+    """LRU/TTL caches of token -> user id and user id -> UserSnapshot."""
+
+    def __init__(
+        self,
+        token_cache_size: int = AUTH_TOKEN_CACHE_SIZE,
+        token_ttl: float = AUTH_TOKEN_CACHE_TTL,
+        user_cache_size: int = AUTH_USER_CACHE_SIZE,
+        user_ttl: float = AUTH_USER_CACHE_TTL,
+        enabled: bool = AUTH_CACHE_ENABLED,
+    ):
+        self.enabled = enabled
+        self.token_ttl = token_ttl
+        self._tokens = LRUCache(token_cache_size, ttl=token_ttl)
+        self._users = LRUCache(user_cache_size, ttl=user_ttl)
+        self.invalidations = 0
+
+    def get_user_id(self, token: str) -> Optional[uuid.UUID]:
+        """User id of an already-verified, unexpired token."""
+        if not self.enabled:
+            return None
+        return self._tokens.get(_token_key(token))
+
+    def set_user_id(self, token: str, user_id: uuid.UUID, expires_at: Optional[float]) -> None:
+        """Remember a verified token until its exp claim (a Unix timestamp)."""
+        if not self.enabled:
+            return
+        ttl = self.token_ttl
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+            if ttl <= 0:
+                return
+        self._tokens.set(_token_key(token), user_id, ttl=ttl)
+
+    def get_user(self, user_id: uuid.UUID) -> Optional[UserSnapshot]:
+        if not self.enabled:
+            return None
+        return self._users.get(user_id)
+
+    def set_user(self, snapshot: UserSnapshot) -> None:
+        if self.enabled:
+            self._users.set(snapshot.id, snapshot)
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Drop a user's snapshot so the next request reloads it."""
+        if self._users.pop(user_id) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._users.clear()
+
+    def stats(self) -> dict:
+        users = self._users.stats()
+        return {
+            "tokens": self._tokens.stats(),
+            "users": users,
+            "user_queries_saved": users["hits"],
+            "invalidations": self.invalidations,
+        }
+
+
+auth_cache = AuthCache()
+
+
+# ============== Invalidation on User changes ==============
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    auth_cache.invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        auth_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back_users(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
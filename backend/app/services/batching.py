@@ -0,0 +1,116 @@
+"""
+Micro-batching service.
+Coalesces concurrent single-item inference calls into vectorized batches.
+
+Requests arriving within NLP_BATCH_MAX_WAIT_MS of each other (up to
+NLP_BATCH_MAX_SIZE) are run as one batch on the NLP executor, and each
+result is handed back to the coroutine that asked for it.
+"""
+
+import asyncio
+import os
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from app.services.executor import BoundedExecutor, nlp_executor
+from app.services.intent import classify_intent_batch
+from app.services.sentiment import analyze_sentiment_batch
+
+# Batching configuration
+NLP_BATCH_MAX_SIZE = int(os.getenv("NLP_BATCH_MAX_SIZE", "32"))
+NLP_BATCH_MAX_WAIT_MS = float(os.getenv("NLP_BATCH_MAX_WAIT_MS", "2"))
+
+
+class MicroBatcher:
+    """
+    Collects items submitted concurrently and runs them as one batch.
+
+    A batch is dispatched when it reaches max_batch_size or when
+    max_wait_ms has passed since its first item, whichever comes first.
+    batch_fn must map a list of items to a list of results of equal length.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = NLP_BATCH_MAX_SIZE,
+        max_wait_ms: float = NLP_BATCH_MAX_WAIT_MS,
+        executor: BoundedExecutor = nlp_executor,
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.executor = executor
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._batches = 0
+        self._items = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item for the next batch and await its result."""
+        if self.max_batch_size == 1:
+            self._batches += 1
+            self._items += 1
+            return (await self.executor.run(self.batch_fn, [item]))[0]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Dispatch everything queued so far as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        self._batches += 1
+        self._items += len(batch)
+        try:
+            results = await self.executor.run(self.batch_fn, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Flush anything still queued and wait for in-flight batches."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+        }
+
+
+intent_batcher = MicroBatcher("intent", classify_intent_batch)
+sentiment_batcher = MicroBatcher("sentiment", analyze_sentiment_batch)
@@ -3,15 +3,34 @@ Main chatbot orchestration service.
 Coordinates NLP pipeline: intent → sentiment → crisis → response generation.
 """
 
+import asyncio
+import os
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import case, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Message, Conversation
 from app.schemas import ChatResponse, MessageResponse, CrisisAlert
-from app.services.intent import classify_intent
-from app.services.sentiment import analyze_sentiment
+from app.services.analysis_cache import Analysis, analysis_cache
 from app.services.crisis import detect_crisis
-from app.services.llm import generate_response
+from app.services.batching import intent_batcher, sentiment_batcher
+from app.services.conversation_memory import MemoryState, conversation_memory
+from app.services.executor import nlp_executor
+from app.services.intent import IntentResult
+from app.services.llm import generate_response, stream_response, _get_fallback_response
+from app.services.pipeline import PipelineRun, Stage, StageGraph
 from app.services.resource_matcher import get_relevant_resources
+from app.services.sentiment import SentimentResult
+
+# Per-stage timeouts (seconds)
+NLP_STAGE_TIMEOUT = float(os.getenv("NLP_STAGE_TIMEOUT", "5"))
+REPLY_STAGE_TIMEOUT = float(os.getenv("REPLY_STAGE_TIMEOUT", "45"))
+DB_STAGE_TIMEOUT = float(os.getenv("DB_STAGE_TIMEOUT", "10"))
+
+# Characters of the latest message kept on the conversation for list views
+CONVERSATION_PREVIEW_CHARS = 120
 
 
 async def process_message(
@@ -23,88 +42,332 @@ async def process_message(
     """
     Process a user message through the NLP pipeline and generate a response.
     
-    Pipeline:
-    1. Intent classification
-    2. Sentiment analysis
-    3. Crisis detection
-    4. Response generation (template or LLM)
-    5. Resource matching (if needed)
+    Pipeline (stages run as soon as their inputs are ready):
+    1. Intent classification, sentiment analysis, crisis detection and
+       conversation memory loading (in parallel)
+    2. Save user message        <- 1
+    3. Response generation      <- 1 (template or LLM, overlaps with 2)
+    4. Resource matching        <- crisis detection only
+    5. Save bot response        <- 2, 3
+    6. Touch conversation       <- 1, 2, 5 (updated_at, summary columns, memory)
     """
-    # Step 1: Classify intent
-    intent = classify_intent(user_message)
+    # AsyncSession does not allow concurrent operations, so DB stages
+    # take turns on the session while NLP/LLM stages run alongside them
+    db_lock = asyncio.Lock()
+
+    async def load_memory():
+        async with db_lock:
+            return await conversation_memory.load(conversation_id, db)
+
+    # Waits for memory so its query can't see this (unsaved) message yet
+    async def save_user_message(intent, sentiment, crisis, memory):
+        user_msg = Message(
+            conversation_id=conversation_id,
+            role="user",
+            content=user_message,
+            detected_intent=intent.label,
+            sentiment_score=sentiment.compound_score,
+            crisis_severity=crisis.severity,
+        )
+        async with db_lock:
+            db.add(user_msg)
+            await db.flush()
+        return user_msg
+
+    async def reply(intent, sentiment, crisis, memory):
+        template = _select_template_reply(intent, sentiment, crisis)
+        if template is not None:
+            return template
+        # Unknown/complex - use LLM
+        return await generate_response(
+            user_message=user_message,
+            intent=intent.label,
+            sentiment=sentiment,
+            conversation_id=conversation_id,
+            crisis_severity=crisis.severity,
+            history=conversation_memory.context(memory),
+            message_count=memory.message_count if memory is not None else None,
+        )
+
+    async def crisis_resources(crisis):
+        if crisis.severity < 5:
+            return None
+        async with db_lock:
+            resources = await get_relevant_resources(
+                query="crisis support",
+                is_crisis=True,
+                db=db,
+            )
+        return CrisisAlert(
+            severity=crisis.severity,
+            message=crisis.recommended_action,
+            resources=resources,
+        )
+
+    async def save_bot_message(reply, save_user_message):
+        bot_msg = Message(
+            conversation_id=conversation_id,
+            role="assistant",
+            content=reply,
+        )
+        async with db_lock:
+            db.add(bot_msg)
+            await db.flush()
+        return bot_msg
+
+    async def touch_conversation(save_user_message, save_bot_message, memory):
+        memory = conversation_memory.record(conversation_id, memory, user_message, save_bot_message.content)
+        async with db_lock:
+            await db.execute(_touch_conversation(conversation_id, save_user_message, save_bot_message, memory))
+
+    cached = analysis_cache.get(user_message)
+    graph = StageGraph([
+        *_analysis_stages(user_message, cached),
+        # A memory load that times out just means this turn has no context
+        Stage("memory", load_memory, timeout=DB_STAGE_TIMEOUT, fallback=lambda: None),
+        Stage("save_user_message", save_user_message, ("intent", "sentiment", "crisis", "memory"),
+              timeout=DB_STAGE_TIMEOUT),
+        Stage("reply", reply, ("intent", "sentiment", "crisis", "memory"), timeout=REPLY_STAGE_TIMEOUT,
+              fallback=lambda intent, sentiment, crisis, memory: _get_fallback_response(intent.label)),
+        Stage("crisis_resources", crisis_resources, ("crisis",), timeout=DB_STAGE_TIMEOUT),
+        Stage("save_bot_message", save_bot_message, ("reply", "save_user_message"),
+              timeout=DB_STAGE_TIMEOUT),
+        Stage("touch_conversation", touch_conversation, ("save_user_message", "save_bot_message", "memory"),
+              timeout=DB_STAGE_TIMEOUT),
+    ])
+    run = await graph.run()
+    if cached is None:
+        _remember_analysis(user_message, run)
+    results = run.results
+    crisis_alert = results["crisis_resources"]
     
-    # Step 2: Analyze sentiment
-    sentiment_result = analyze_sentiment(user_message)
+    return ChatResponse(
+        message=MessageResponse.model_validate(results["save_user_message"]),
+        bot_response=MessageResponse.model_validate(results["save_bot_message"]),
+        conversation_id=conversation_id,
+        crisis_alert=crisis_alert.model_dump() if crisis_alert else None,
+        stage_timings={**run.timings, "total": run.total_ms},
+    )
+
+
+async def stream_message(
+    user_message: str,
+    conversation_id: int,
+    user_id: int,
+    db: AsyncSession,
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Process a user message and stream the response as (event, data) pairs.
     
-    # Step 3: Crisis detection
-    crisis_result = detect_crisis(user_message)
+    Events, in order:
+    - "crisis": crisis alert with resources (only if severity >= 5, always first)
+    - "token": a fragment of assistant text (template replies arrive as one token)
+    - "done": saved messages plus timing metadata
     
-    # Save user message
+    The caller commits the session; the assistant message is only
+    persisted once the full reply has been assembled.
+    """
+    started = time.perf_counter()
+    first_event_at = None
+    first_token_at = None
+
+    async def load_memory():
+        return await conversation_memory.load(conversation_id, db)
+
+    cached = analysis_cache.get(user_message)
+    analysis = await StageGraph([
+        *_analysis_stages(user_message, cached),
+        Stage("memory", load_memory, timeout=DB_STAGE_TIMEOUT, fallback=lambda: None),
+    ]).run()
+    if cached is None:
+        _remember_analysis(user_message, analysis)
+    intent = analysis.results["intent"]
+    sentiment = analysis.results["sentiment"]
+    crisis = analysis.results["crisis"]
+    memory = analysis.results["memory"]
+
     user_msg = Message(
         conversation_id=conversation_id,
         role="user",
         content=user_message,
         detected_intent=intent.label,
-        sentiment_score=sentiment_result.compound_score,
-        crisis_severity=crisis_result.severity,
+        sentiment_score=sentiment.compound_score,
+        crisis_severity=crisis.severity,
     )
     db.add(user_msg)
     await db.flush()
-    
-    # Step 4: Generate response
-    if crisis_result.severity >= 8:
-        # High crisis - use crisis response template
-        bot_content = _get_crisis_response(crisis_result)
-    elif intent.label in TEMPLATE_RESPONSES:
-        # Known intent - use template with personalization
-        bot_content = _get_template_response(intent.label, sentiment_result)
+
+    # Crisis alert goes out before any model text
+    if crisis.severity >= 5:
+        resources = await get_relevant_resources(
+            query="crisis support",
+            is_crisis=True,
+            db=db,
+        )
+        crisis_alert = CrisisAlert(
+            severity=crisis.severity,
+            message=crisis.recommended_action,
+            resources=resources,
+        )
+        first_event_at = time.perf_counter()
+        yield "crisis", crisis_alert.model_dump()
+
+    fragments: List[str] = []
+    template = _select_template_reply(intent, sentiment, crisis)
+    if template is not None:
+        tokens = _single(template)
     else:
-        # Unknown/complex - use LLM
-        bot_content = await generate_response(
+        tokens = stream_response(
             user_message=user_message,
             intent=intent.label,
-            sentiment=sentiment_result,
+            sentiment=sentiment,
             conversation_id=conversation_id,
+            crisis_severity=crisis.severity,
+            history=conversation_memory.context(memory),
+            message_count=memory.message_count if memory is not None else None,
         )
-    
-    # Save bot response
+    async for token in tokens:
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+            first_event_at = first_event_at or first_token_at
+        fragments.append(token)
+        yield "token", {"text": token}
+
     bot_msg = Message(
         conversation_id=conversation_id,
         role="assistant",
-        content=bot_content,
+        content="".join(fragments),
     )
     db.add(bot_msg)
     await db.flush()
+
+    memory = conversation_memory.record(conversation_id, memory, user_message, bot_msg.content)
+    await db.execute(_touch_conversation(conversation_id, user_msg, bot_msg, memory))
+
+    yield "done", {
+        "message": MessageResponse.model_validate(user_msg).model_dump(mode="json"),
+        "bot_response": MessageResponse.model_validate(bot_msg).model_dump(mode="json"),
+        "conversation_id": str(conversation_id),
+        "metadata": {
+            "ttfb_ms": round((first_event_at - started) * 1000, 2),
+            "time_to_first_token_ms": round((first_token_at - started) * 1000, 2),
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+            "stage_timings": analysis.timings,
+        },
+    }
+
+
+def _analysis_stages(user_message: str, cached: Optional[Analysis] = None) -> List[Stage]:
+    """
+    Intent, sentiment and crisis detection stages (no dependencies).
     
-    # Update conversation timestamp
-    await db.execute(
-        Conversation.__table__.update()
-        .where(Conversation.id == conversation_id)
-        .values(updated_at=user_msg.created_at)
-    )
+    They are CPU-bound, so they run on the NLP executor; intent and
+    sentiment are micro-batched across concurrent requests. With a cached
+    analysis (crisis already re-derived by the cache) they just return it.
+    """
+    if cached is not None:
+        async def cached_stage(result):
+            return result
+
+        return [
+            Stage("intent", lambda: cached_stage(cached.intent)),
+            Stage("sentiment", lambda: cached_stage(cached.sentiment)),
+            Stage("crisis", lambda: cached_stage(cached.crisis)),
+        ]
+
+    async def intent_stage():
+        return await intent_batcher.submit(user_message)
+
+    async def sentiment_stage():
+        return await sentiment_batcher.submit(user_message)
+
+    async def crisis_stage():
+        return await nlp_executor.run(detect_crisis, user_message)
+
+    return [
+        Stage("intent", intent_stage, timeout=NLP_STAGE_TIMEOUT,
+              fallback=lambda: IntentResult(label="unknown", confidence=0.0, alternatives=[])),
+        Stage("sentiment", sentiment_stage, timeout=NLP_STAGE_TIMEOUT,
+              fallback=_neutral_sentiment),
+        # Crisis detection must never be skipped: fall back to running it inline
+        Stage("crisis", crisis_stage, timeout=NLP_STAGE_TIMEOUT,
+              fallback=lambda: detect_crisis(user_message)),
+    ]
+
+
+def _remember_analysis(user_message: str, run: PipelineRun) -> None:
+    """Cache the analysis triple unless a stage fell back after a timeout."""
+    stages = ("intent", "sentiment", "crisis")
+    if any(stage in run.timed_out for stage in stages):
+        return
+    analysis_cache.store(user_message, Analysis(
+        intent=run.results["intent"],
+        sentiment=run.results["sentiment"],
+        crisis=run.results["crisis"],
+        cost_ms=sum(run.timings[stage] for stage in stages),
+    ))
+
+
+def _touch_conversation(
+    conversation_id,
+    user_msg: Message,
+    bot_msg: Message,
+    memory: Optional[MemoryState] = None,
+):
+    """
+    UPDATE for one user/assistant exchange: bump updated_at, keep the
+    denormalized message count, preview and peak crisis severity current,
+    and persist the conversation memory summary.
     
-    # Build response
-    crisis_alert = None
-    if crisis_result.severity >= 5:
-        resources = await get_relevant_resources(
-            query="crisis support",
-            is_crisis=True,
-            db=db,
-        )
-        crisis_alert = CrisisAlert(
-            severity=crisis_result.severity,
-            message=crisis_result.recommended_action,
-            resources=resources,
+    The counters are computed in SQL so concurrent exchanges on the same
+    conversation don't overwrite each other.
+    """
+    conversations = Conversation.__table__
+    count = func.coalesce(conversations.c.message_count, 0)
+    peak = func.coalesce(conversations.c.max_crisis_severity, 0)
+    severity = user_msg.crisis_severity or 0
+    return (
+        conversations.update()
+        .where(conversations.c.id == conversation_id)
+        .values(
+            updated_at=bot_msg.created_at,
+            message_count=count + 2,
+            last_message_preview=_preview(bot_msg.content),
+            max_crisis_severity=case((peak < severity, severity), else_=peak),
+            **(conversation_memory.columns(memory) if memory is not None else {}),
         )
-    
-    return ChatResponse(
-        message=MessageResponse.model_validate(user_msg),
-        bot_response=MessageResponse.model_validate(bot_msg),
-        conversation_id=conversation_id,
-        crisis_alert=crisis_alert.model_dump() if crisis_alert else None,
     )
 
 
+def _preview(text: str) -> str:
+    """Single-line, length-capped excerpt of a message."""
+    text = " ".join(text.split())
+    if len(text) <= CONVERSATION_PREVIEW_CHARS:
+        return text
+    return text[:CONVERSATION_PREVIEW_CHARS - 1].rstrip() + "…"
+
+
+def _select_template_reply(intent, sentiment, crisis) -> Optional[str]:
+    """Return a canned reply when one applies, or None to use the LLM."""
+    if crisis.severity >= 8:
+        # High crisis - use crisis response template
+        return _get_crisis_response(crisis)
+    if intent.label in TEMPLATE_RESPONSES:
+        # Known intent - use template with personalization
+        return _get_template_response(intent.label, sentiment)
+    return None
+
+
+async def _single(text: str) -> AsyncIterator[str]:
+    """Wrap a complete reply as a one-token stream."""
+    yield text
+
+
+def _neutral_sentiment() -> SentimentResult:
+    """Sentiment used when analysis doesn't finish in time."""
+    return SentimentResult(compound_score=0.0, polarity=0.0, subjectivity=0.0, label="neutral")
+
+
 # Template responses for common intents
 TEMPLATE_RESPONSES = {
     "greeting": [
@@ -0,0 +1,258 @@
+"""
+Conversation memory service.
+Bounded LLM context: the last few turns verbatim plus a rolling summary.
+
+Re-sending the whole history would make prompt cost grow with every turn.
+Instead each conversation keeps its MEMORY_RECENT_TURNS newest turns
+verbatim; a turn that falls out of that window is folded into an
+extractive summary (its most informative user sentence), and the oldest
+summary lines are dropped once the summary exceeds MEMORY_SUMMARY_TOKENS.
+Folding only ever touches the evicted turn, so a turn costs the same at
+message 10 and message 1000.
+
+The summary and the number of messages it covers are persisted on the
+Conversation row (written by the same UPDATE that bumps message_count),
+so a cold load reads one row plus the few unsummarized messages. Warm
+states live in an LRU cache and are only trusted while their
+message_count matches the row, which also catches turns written by other
+worker processes or rolled back.
+
+Token counts are estimates (about four characters per token); the
+assembled context never exceeds MEMORY_TOKEN_BUDGET by that estimate.
+"""
+
+import math
+import os
+import re
+import sys
+import uuid
+from dataclasses import dataclass, field, replace
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Conversation, Message
+from app.utils.cache import LRUCache
+
+# Memory configuration
+MEMORY_ENABLED = os.getenv("MEMORY_ENABLED", "true").lower() == "true"
+MEMORY_RECENT_TURNS = int(os.getenv("MEMORY_RECENT_TURNS", "4"))  # User/assistant exchanges kept verbatim
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "768"))  # Summary + recent turns in the prompt
+MEMORY_SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", "256"))
+MEMORY_CACHE_SIZE = int(os.getenv("MEMORY_CACHE_SIZE", "2048"))
+
+CHARS_PER_TOKEN = 4
+SUMMARY_LINE_WORDS = 30  # Longest sentence kept in the summary
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z']+")
+_STOPWORDS = frozenset("""
+    a about after again all also am an and any are as at be been being but by can could did do does
+    doing don't for from had has have having he her here him his how i i'm if in into is it it's its
+    just like me more most my myself no not now of off on once only or other our out over really
+    same she should so some such than that that's the their them then there these they this those
+    through to too under until up very was we were what when where which while who why will with
+    would you your yeah okay ok yes thanks thank hello hey bye goodbye
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class Turn:
+    """One user message and the assistant's reply."""
+    user: str
+    assistant: str
+
+    def render(self) -> str:
+        return f"User: {self.user}\nAssistant: {self.assistant}"
+
+
+@dataclass
+class MemoryState:
+    """Everything needed to build the LLM context for one conversation."""
+    summary: List[str] = field(default_factory=list)  # Extractive lines, oldest first
+    turns: List[Turn] = field(default_factory=list)  # Verbatim, oldest first
+    message_count: int = 0  # Conversation.message_count this state reflects
+    summarized_count: int = 0  # Messages folded into (or dropped from) the summary
+
+
+def salient_sentence(text: str) -> Optional[str]:
+    """The user sentence with the most distinct content words, or None for small talk."""
+    best, best_score = None, 0
+    for sentence in _SENTENCE_BOUNDARY.split(text.strip()):
+        words = {w for w in _WORD.findall(sentence.lower()) if len(w) > 2 and w not in _STOPWORDS}
+        if len(words) > best_score:
+            best, best_score = sentence, len(words)
+    if best is None:
+        return None
+    words = best.split()
+    if len(words) > SUMMARY_LINE_WORDS:
+        return " ".join(words[:SUMMARY_LINE_WORDS]) + "…"
+    return best
+
+
+def _sizeof_state(state: MemoryState) -> int:
+    return (
+        sys.getsizeof(state)
+        + sum(sys.getsizeof(line) for line in state.summary)
+        + sum(sys.getsizeof(t.user) + sys.getsizeof(t.assistant) for t in state.turns)
+    )
+
+
+class ConversationMemory:
+    """Per-conversation recent turns and rolling summary, cached by conversation id."""
+
+    def __init__(
+        self,
+        recent_turns: int = MEMORY_RECENT_TURNS,
+        token_budget: int = MEMORY_TOKEN_BUDGET,
+        summary_tokens: int = MEMORY_SUMMARY_TOKENS,
+        cache_size: int = MEMORY_CACHE_SIZE,
+        enabled: bool = MEMORY_ENABLED,
+    ):
+        self.recent_turns = max(1, recent_turns)
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.enabled = enabled
+        self._states = LRUCache(cache_size, sizeof=_sizeof_state)
+        self.cold_loads = 0
+
+    async def load(self, conversation_id: uuid.UUID, db: AsyncSession) -> Optional[MemoryState]:
+        """Current memory of a conversation (None when memory is disabled)."""
+        if not self.enabled:
+            return None
+        result = await db.execute(
+            select(
+                Conversation.message_count,
+                Conversation.memory_summary,
+                Conversation.memory_summarized_count,
+            ).where(Conversation.id == conversation_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return MemoryState()
+        message_count = row.message_count or 0
+
+        cached = self._states.get(conversation_id)
+        if cached is not None and cached.message_count == message_count:
+            return cached
+
+        # Cold (or stale): rebuild from the persisted summary and the
+        # messages it doesn't cover yet
+        self.cold_loads += 1
+        summarized_count = row.memory_summarized_count or 0
+        unsummarized = min(max(message_count - summarized_count, 0), 2 * self.recent_turns)
+        turns: List[Turn] = []
+        if unsummarized:
+            result = await db.execute(
+                select(Message.role, Message.content)
+                .where(Message.conversation_id == conversation_id)
+                .order_by(Message.created_at.desc(), Message.id.desc())
+                .limit(unsummarized)
+            )
+            for role, content in reversed(result.all()):
+                if role == "user" or not turns or turns[-1].assistant:
+                    turns.append(Turn(user=content if role == "user" else "", assistant=""))
+                if role != "user":
+                    turns[-1].assistant = content
+        state = MemoryState(
+            summary=row.memory_summary.splitlines() if row.memory_summary else [],
+            turns=turns,
+            message_count=message_count,
+            summarized_count=message_count - 2 * len(turns),
+        )
+        self._states.set(conversation_id, state)
+        return state
+
+    def context(self, state: Optional[MemoryState]) -> Optional[str]:
+        """
+        Prompt section for a state, newest material first within the budget.
+
+        Recent turns get the budget before the summary; whatever doesn't
+        fit is left out (oldest first).
+        """
+        if state is None or (not state.turns and not state.summary):
+            return None
+        remaining = self.token_budget
+
+        turns: List[str] = []
+        for turn in reversed(state.turns):
+            text = turn.render()
+            cost = estimate_tokens(text) + 1
+            if cost > remaining:
+                break
+            turns.append(text)
+            remaining -= cost
+
+        summary: List[str] = []
+        for line in reversed(state.summary):
+            cost = estimate_tokens(line) + 1
+            if cost > remaining:
+                break
+            summary.append(line)
+            remaining -= cost
+
+        sections = []
+        if summary:
+            sections.append("Earlier in this conversation the user said:\n" + "\n".join(reversed(summary)))
+        if turns:
+            sections.append("Recent turns:\n" + "\n".join(reversed(turns)))
+        return "\n\n".join(sections) or None
+
+    def record(
+        self,
+        conversation_id: uuid.UUID,
+        state: Optional[MemoryState],
+        user_message: str,
+        reply: str,
+    ) -> Optional[MemoryState]:
+        """
+        State after one more exchange; folds evicted turns into the summary.
+
+        The caller persists the result with columns() in the same
+        transaction as the messages.
+        """
+        if state is None:
+            return None
+        turns = state.turns + [Turn(user=user_message, assistant=reply)]
+        summary = list(state.summary)
+        summarized_count = state.summarized_count
+        while len(turns) > self.recent_turns:
+            evicted = turns.pop(0)
+            summarized_count += 2
+            line = salient_sentence(evicted.user)
+            if line and f"- {line}" not in summary:
+                summary.append(f"- {line}")
+        while summary and estimate_tokens("\n".join(summary)) > self.summary_tokens:
+            summary.pop(0)
+
+        new_state = replace(
+            state,
+            summary=summary,
+            turns=turns,
+            message_count=state.message_count + 2,
+            summarized_count=summarized_count,
+        )
+        self._states.set(conversation_id, new_state)
+        return new_state
+
+    @staticmethod
+    def columns(state: MemoryState) -> dict:
+        """Conversation column values persisting a state."""
+        return {
+            "memory_summary": "\n".join(state.summary) or None,
+            "memory_summarized_count": state.summarized_count,
+        }
+
+    def clear(self) -> None:
+        self._states.clear()
+
+    def stats(self) -> dict:
+        return {**self._states.stats(), "cold_loads": self.cold_loads}
+
+
+conversation_memory = ConversationMemory()
@@ -1,10 +1,16 @@
 """
 Crisis detection service.
 Keyword-based detection with severity scoring.
+
+The lexicon is compiled once (at import, via reload_lexicon, or when the
+artifact registry installs a published version) into an
+Aho-Corasick automaton plus precompiled negation/context regexes, so each
+message is scanned in a single pass regardless of lexicon size.
 """
 
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
 
 
@@ -64,6 +70,16 @@ NEGATION_PATTERNS = [
     r"never\s+(?:suicidal|self-harm)",
 ]
 
+# Categories whose keywords also match inflected forms ("overdosed",
+# "self-harming", "hopelessness"); low-distress words stay exact so "scared"
+# does not fire on "scar"
+INFLECTED_CATEGORIES = ("critical", "high", "moderate")
+
+# Suffixes an inflected keyword word may take. Agent nouns (-er) and
+# irregular forms are left out, so "killer" does not count as "kill" and
+# "given up" does not count as "give up".
+INFLECTION_SUFFIXES = ("s", "es", "ed", "ing", "ness")
+
 # Context patterns that indicate third-party or educational mentions
 CONTEXT_PATTERNS = [
     r"friend\s+(?:mentioned|said|told)",
@@ -73,37 +89,264 @@ CONTEXT_PATTERNS = [
 ]
 
 
-def detect_crisis(text: str) -> CrisisResult:
+@dataclass
+class KeywordMatch:
+    """A single crisis keyword hit in the (lower-cased) message."""
+    keyword: str
+    category: str
+    start: int
+    end: int
+
+
+# Keywords and messages are matched as sequences of word tokens (internal
+# apostrophes and hyphens kept, as in "can't" or "self-harm"), so every hit
+# starts and ends on a word boundary by construction.
+_TOKEN_RE = re.compile(r"\w+(?:[-']\w+)*")
+# Splitting on the captured token pattern yields [sep, token, sep, token, ..., sep]
+_SPLIT_RE = re.compile(r"(\w+(?:[-']\w+)*)")
+# Shorter keyword tokens ("up", "my", "to") never match inflected forms
+MIN_INFLECTED_LENGTH = 3
+
+
+def _inflections(token: str) -> List[str]:
+    """Inflected forms of a keyword token, with the silent "e" dropped before -ing/-ed."""
+    if len(token) < MIN_INFLECTED_LENGTH:
+        return []
+    forms = [token + suffix for suffix in INFLECTION_SUFFIXES]
+    if token.endswith("e"):
+        # "overdose" -> "overdosed", "overdosing"; "give" -> "giving"
+        forms += [token + "d", token[:-1] + "ing"]
+    return forms
+
+
+class KeywordAutomaton:
+    """
+    Token-level Aho-Corasick automaton over (keyword, category) pairs.
+
+    Finds every keyword occurrence in one pass over the message tokens, in
+    O(tokens + matches) time independent of the number of keywords.
+    Only whole-word hits are reported; words of keywords in
+    inflected_categories also match their INFLECTION_SUFFIXES forms
+    ("overdose" matches "overdosed").
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, str]], inflected_categories: Iterable[str] = ()):
+        self._patterns: List[Tuple[str, str, int, Tuple[str, ...]]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        inflected_categories = set(inflected_categories)
+        keywords = [(keyword.lower(), category) for keyword, category in keywords]
+
+        # Message tokens are mapped from an inflected form back to the keyword
+        # token before the walk; forms that are keyword tokens themselves
+        # ("trapped") keep matching only as written
+        keyword_tokens = {token for keyword, _ in keywords for token in _TOKEN_RE.findall(keyword)}
+        self._inflected: Dict[str, str] = {}
+        for keyword, category in keywords:
+            if category not in inflected_categories:
+                continue
+            for token in _TOKEN_RE.findall(keyword):
+                for form in _inflections(token):
+                    if form not in keyword_tokens:
+                        self._inflected.setdefault(form, token)
+
+        for keyword, category in keywords:
+            parts = _SPLIT_RE.split(keyword)
+            tokens = parts[1::2]
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][token] = next_state
+                state = next_state
+            self._out[state] += (len(self._patterns),)
+            self._patterns.append((keyword, category, len(tokens), tuple(parts[2:-1:2])))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first construction of failure links and merged outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """Return all whole-word keyword hits in text (expected lower-cased)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        parts = _SPLIT_RE.split(text)
+        tokens = parts[1::2]
+        if self._inflected:
+            inflected = self._inflected
+            tokens = [inflected.get(token, token) for token in tokens]
+        hits = []
+        state = 0
+
+        for index, token in enumerate(tokens):
+            if state:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            else:
+                state = root.get(token, 0)
+            if out[state]:
+                hits.append((index, state))
+
+        matches = []
+        offset, offset_part = 0, 0
+        for index, state in hits:
+            for pattern_idx in out[state]:
+                keyword, category, n_tokens, separators = self._patterns[pattern_idx]
+                first_part, last_part = 2 * (index - n_tokens + 1) + 1, 2 * index + 2
+                # Tokens must be laid out exactly as in the keyword
+                # ("give up", not "give, up" or "give   up")
+                if n_tokens > 1 and tuple(parts[first_part + 1:last_part - 1:2]) != separators:
+                    continue
+                # Offsets are only computed for hits, advancing monotonically
+                if first_part < offset_part:
+                    offset, offset_part = 0, 0
+                offset += sum(map(len, parts[offset_part:first_part]))
+                offset_part = first_part
+                length = sum(map(len, parts[first_part:last_part]))
+                matches.append(KeywordMatch(keyword, category, offset, offset + length))
+
+        return matches
+
+
+def _compile_patterns(patterns: Iterable[str]) -> List[re.Pattern]:
+    """Precompile raw regex strings once instead of on every message."""
+    return [re.compile(pattern) for pattern in patterns]
+
+
+class CrisisLexicon:
+    """Compiled crisis lexicon: keyword automaton plus negation/context regexes."""
+
+    def __init__(
+        self,
+        keywords: Dict[str, dict],
+        negation_patterns: Iterable[str],
+        context_patterns: Iterable[str],
+    ):
+        self.base_severity = {
+            category: config["base_severity"] for category, config in keywords.items()
+        }
+        # Report matched keywords in lexicon order, as the per-keyword loop did
+        self.keyword_order = {}
+        pairs = []
+        for category, config in keywords.items():
+            for keyword in config["keywords"]:
+                keyword = keyword.lower()
+                self.keyword_order.setdefault(keyword, len(self.keyword_order))
+                pairs.append((keyword, category))
+
+        self.automaton = KeywordAutomaton(pairs, inflected_categories=INFLECTED_CATEGORIES)
+        self.negation_patterns = _compile_patterns(negation_patterns)
+        self.context_patterns = _compile_patterns(context_patterns)
+
+    def scan(self, text_lower: str) -> List[KeywordMatch]:
+        """Find all keyword hits with their categories and offsets."""
+        return self.automaton.find_all(text_lower)
+
+    def is_negated(self, text_lower: str) -> bool:
+        return any(pattern.search(text_lower) for pattern in self.negation_patterns)
+
+    def is_context_mention(self, text_lower: str) -> bool:
+        return any(pattern.search(text_lower) for pattern in self.context_patterns)
+
+
+_lexicon = CrisisLexicon(CRISIS_KEYWORDS, NEGATION_PATTERNS, CONTEXT_PATTERNS)
+_lexicon_version = "builtin"
+
+
+def reload_lexicon(
+    keywords: Optional[Dict[str, dict]] = None,
+    negation_patterns: Optional[List[str]] = None,
+    context_patterns: Optional[List[str]] = None,
+) -> CrisisLexicon:
+    """
+    Recompile the crisis lexicon and swap it in.
+
+    Arguments left as None fall back to the module-level defaults.
+    In-flight detect_crisis calls keep using the lexicon they started with.
+    """
+    lexicon = CrisisLexicon(
+        keywords if keywords is not None else CRISIS_KEYWORDS,
+        negation_patterns if negation_patterns is not None else NEGATION_PATTERNS,
+        context_patterns if context_patterns is not None else CONTEXT_PATTERNS,
+    )
+    custom = any(arg is not None for arg in (keywords, negation_patterns, context_patterns))
+    install_lexicon(lexicon, "custom" if custom else "builtin")
+    return lexicon
+
+
+def install_lexicon(lexicon: CrisisLexicon, version: str) -> None:
+    """Swap in an already compiled lexicon (e.g. a published artifact)."""
+    global _lexicon, _lexicon_version
+    _lexicon, _lexicon_version = lexicon, version
+
+
+def lexicon_version() -> str:
+    return _lexicon_version
+
+
+def active_lexicon() -> Tuple[CrisisLexicon, str]:
+    """The installed lexicon and its version (handed to NLP worker processes)."""
+    return _lexicon, _lexicon_version
+
+
+def detect_crisis(text: str, lexicon: Optional[CrisisLexicon] = None) -> CrisisResult:
     """
     Analyze text for crisis indicators.
     
     Returns CrisisResult with severity score (0-10) and matched keywords.
     Higher scores indicate more urgent need for intervention.
+    Uses the active lexicon unless one is given (e.g. to validate a new one).
     """
+    lexicon = lexicon if lexicon is not None else _lexicon
     text_lower = text.lower()
-    matched_keywords = []
     max_severity = 0
     
     # Check for negation patterns first
-    is_negated = any(re.search(pattern, text_lower) for pattern in NEGATION_PATTERNS)
+    is_negated = lexicon.is_negated(text_lower)
     
     # Check for third-party/educational context
-    is_context_mention = any(re.search(pattern, text_lower) for pattern in CONTEXT_PATTERNS)
+    is_context_mention = lexicon.is_context_mention(text_lower)
+    
+    # Scan for crisis keywords (single pass over the message)
+    matched = {}
+    for match in lexicon.scan(text_lower):
+        matched.setdefault(match.keyword, match.category)
+    matched_keywords = sorted(matched, key=lexicon.keyword_order.__getitem__)
     
-    # Scan for crisis keywords
-    for category, config in CRISIS_KEYWORDS.items():
-        for keyword in config["keywords"]:
-            if keyword in text_lower:
-                matched_keywords.append(keyword)
-                severity = config["base_severity"]
-                
-                # Adjust for context
-                if is_negated and category in ["critical", "high"]:
-                    severity = min(severity, 3)  # Cap at low severity
-                elif is_context_mention:
-                    severity = max(1, severity - 3)  # Reduce but don't eliminate
-                
-                max_severity = max(max_severity, severity)
+    for keyword in matched_keywords:
+        category = matched[keyword]
+        severity = lexicon.base_severity[category]
+        
+        # Adjust for context
+        if is_negated and category in ["critical", "high"]:
+            severity = min(severity, 3)  # Cap at low severity
+        elif is_context_mention:
+            severity = max(1, severity - 3)  # Reduce but don't eliminate
+        
+        max_severity = max(max_severity, severity)
     
     # Compound effect: multiple keywords increase severity
     if len(matched_keywords) > 2:
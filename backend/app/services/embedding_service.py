@@ -0,0 +1,137 @@
+"""
+Query embedding service.
+Async, batched and cached text embeddings for request paths.
+
+Concurrent embed() calls are coalesced into a single model.encode batch
+on a dedicated worker thread, and recent query embeddings are kept in an
+LRU cache keyed by a hash of the text. Results are read-only float32
+NumPy arrays, so nothing is converted to Python lists on the way.
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.batching import MicroBatcher
+from app.services.embeddings import EMBEDDING_MODEL, encode_batch
+from app.services.executor import BoundedExecutor
+from app.utils.cache import LRUCache
+
+# Embedding service configuration
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "2"))
+EMBEDDING_EXECUTOR_WORKERS = int(os.getenv("EMBEDDING_EXECUTOR_WORKERS", "1"))  # torch already uses intra-op threads
+EMBEDDING_EXECUTOR_MAX_QUEUE = int(os.getenv("EMBEDDING_EXECUTOR_MAX_QUEUE", "16"))  # queued batches
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+
+
+def _encode_rows(texts: List[str]) -> List[Optional[np.ndarray]]:
+    """Batch function for the batcher: one read-only row (or None) per text."""
+    embeddings = encode_batch(texts)
+    if embeddings is None:
+        return [None] * len(texts)
+    # Each row owns its memory: a view would keep the whole batch array
+    # alive in the cache while nbytes counted a single row
+    rows = [row.copy() for row in embeddings]
+    for row in rows:
+        row.setflags(write=False)
+    return rows
+
+
+def _text_key(text: str) -> bytes:
+    """Compact cache key; the model name is mixed in so a model swap never hits."""
+    return hashlib.blake2b(f"{EMBEDDING_MODEL}\0{text}".encode(), digest_size=16).digest()
+
+
+def _sizeof_embedding(embedding: Optional[np.ndarray]) -> int:
+    return embedding.nbytes if embedding is not None else 0
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark a failure retrieved, so one whose callers all left isn't logged as lost."""
+    if not task.cancelled():
+        task.exception()
+
+
+class EmbeddingService:
+    """Batched, cached query embeddings."""
+
+    def __init__(
+        self,
+        batcher: MicroBatcher,
+        cache_size: int = EMBEDDING_CACHE_SIZE,
+    ):
+        self.batcher = batcher
+        self._cache = LRUCache(cache_size, sizeof=_sizeof_embedding)
+        # Identical texts requested while an encode is in flight share it
+        self._in_flight: Dict[bytes, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embedding for one text as a read-only float32 array.
+
+        Returns None if sentence-transformers is not available.
+        """
+        key = _text_key(text)
+        embedding = self._cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+        else:
+            # The encode is owned by the service, not the first caller, so a
+            # cancelled request can't fail the others waiting on the same text
+            in_flight = asyncio.get_running_loop().create_task(self._encode(key, text))
+            in_flight.add_done_callback(_retrieve_exception)
+            self._in_flight[key] = in_flight
+        return await asyncio.shield(in_flight)
+
+    async def _encode(self, key: bytes, text: str) -> Optional[np.ndarray]:
+        try:
+            embedding = await self.batcher.submit(text)
+        finally:
+            del self._in_flight[key]
+        if embedding is not None:
+            self._cache.set(key, embedding)
+        return embedding
+
+    async def embed_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Embed several texts; uncached ones share batches with other callers."""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    async def close(self) -> None:
+        await self.batcher.close()
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "coalesced": self.coalesced,
+            "batching": self.batcher.stats(),
+        }
+
+
+embedding_executor = BoundedExecutor(
+    name="embedding",
+    kind="thread",
+    max_workers=EMBEDDING_EXECUTOR_WORKERS,
+    max_queue=EMBEDDING_EXECUTOR_MAX_QUEUE,
+)
+
+embedding_service = EmbeddingService(
+    MicroBatcher(
+        "embedding",
+        _encode_rows,
+        max_batch_size=EMBEDDING_BATCH_MAX_SIZE,
+        max_wait_ms=EMBEDDING_BATCH_MAX_WAIT_MS,
+        executor=embedding_executor,
+    )
+)
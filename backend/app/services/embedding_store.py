@@ -0,0 +1,113 @@
+"""
+Embedding store service.
+Memory-mapped, versioned float32 embedding files shared across workers.
+
+A build step (app.utils.build_embeddings) writes the L2-normalized
+embedding matrix as embeddings.npy plus an ids.json row map into a new
+version directory and publishes it. meta.json records built_at, the
+newest Resource.updated_at the build saw; rows updated after it are stale
+in the store. Workers open the active version with
+mmap, so all uvicorn processes share the same physical pages and startup
+does no parsing or copying.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.embeddings import normalize_rows
+from app.utils import artifacts
+
+EMBEDDING_STORE_DIR = Path(os.getenv(
+    "EMBEDDING_STORE_DIR",
+    str(Path(__file__).parent.parent / "ml" / "artifacts" / "resource_embeddings"),
+))
+
+MATRIX_FILE = "embeddings.npy"
+IDS_FILE = "ids.json"
+META_FILE = "meta.json"
+
+
+@dataclass
+class EmbeddingStore:
+    """An opened store version: read-only mmap matrix plus id -> row map."""
+    version: str
+    ids: List[str]
+    matrix: np.ndarray  # [n, dim] float32 memmap, rows L2-normalized
+    rows: Dict[str, int]
+    built_at: datetime  # rows with a later updated_at changed after the build
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1]
+
+
+def write_store(
+    ids: Sequence[str],
+    embeddings: np.ndarray,
+    root: Path = EMBEDDING_STORE_DIR,
+    keep: int = 3,
+    built_at: Optional[datetime] = None,
+) -> str:
+    """
+    Write a new store version, publish it and prune old versions.
+
+    built_at defaults to now (UTC); builds from the database pass the
+    newest updated_at of the rows they read.
+    """
+    matrix = normalize_rows(np.asarray(embeddings, dtype=np.float32))
+    if matrix.shape[0] != len(ids):
+        raise ValueError(f"{len(ids)} ids but {matrix.shape[0]} embedding rows")
+
+    root.mkdir(parents=True, exist_ok=True)
+    version = artifacts.next_version(root)
+    version_dir = root / version
+    version_dir.mkdir()
+    np.save(version_dir / MATRIX_FILE, np.ascontiguousarray(matrix))
+    with open(version_dir / IDS_FILE, "w") as f:
+        json.dump([str(i) for i in ids], f)
+    with open(version_dir / META_FILE, "w") as f:
+        json.dump({"built_at": (built_at or datetime.utcnow()).isoformat()}, f)
+
+    artifacts.publish(root, version)
+    artifacts.prune(root, keep=keep)
+    return version
+
+
+def open_store(root: Path = EMBEDDING_STORE_DIR) -> Optional[EmbeddingStore]:
+    """Memory-map the active version, or return None if none is published."""
+    version = artifacts.read_current(root)
+    if version is None:
+        return None
+    version_dir = root / version
+    matrix = np.load(version_dir / MATRIX_FILE, mmap_mode="r")
+    with open(version_dir / IDS_FILE) as f:
+        ids = json.load(f)
+    return EmbeddingStore(
+        version=version,
+        ids=ids,
+        matrix=matrix,
+        rows={resource_id: row for row, resource_id in enumerate(ids)},
+        built_at=_read_built_at(version_dir),
+    )
+
+
+def _read_built_at(version_dir: Path) -> datetime:
+    try:
+        with open(version_dir / META_FILE) as f:
+            return datetime.fromisoformat(json.load(f)["built_at"])
+    except FileNotFoundError:
+        # Versions written before meta.json: the write time is the best bound
+        return datetime.utcfromtimestamp((version_dir / IDS_FILE).stat().st_mtime)
+
+
+def current_version(root: Path = EMBEDDING_STORE_DIR) -> Optional[str]:
+    return artifacts.read_current(root)
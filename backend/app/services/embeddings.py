@@ -1,11 +1,17 @@
 """
 Embeddings service.
 Uses Sentence-Transformers for text embeddings.
+
+Similarity search runs on EmbeddingMatrix, which keeps candidates as
+pre-normalized float32 rows so scoring is one matrix-vector product and
+top-k selection is an argpartition instead of a full sort.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence, Union
 import os
 
+import numpy as np
+
 # Model configuration
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 
@@ -46,44 +52,124 @@ def generate_embeddings_batch(texts: List[str]) -> Optional[List[List[float]]]:
     
     More efficient than calling generate_embedding multiple times.
     """
+    embeddings = encode_batch(texts)
+    if embeddings is None:
+        return None
+    return [emb.tolist() for emb in embeddings]
+
+
+def encode_batch(texts: List[str]) -> Optional[np.ndarray]:
+    """
+    Encode texts in one model call as a float32 array of shape [n, dim].
+    
+    Skips the per-element list conversion; returns None if
+    sentence-transformers is not available.
+    """
     model = _load_model()
     if model is None:
         return None
     
-    embeddings = model.encode(texts, convert_to_numpy=True)
-    return [emb.tolist() for emb in embeddings]
+    embeddings = model.encode(texts, batch_size=max(1, len(texts)), convert_to_numpy=True)
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+class EmbeddingMatrix:
+    """
+    Candidate embeddings stored as L2-normalized float32 rows.
+    
+    Cosine similarity against every row is a single matrix-vector product.
+    Zero vectors stay zero, so they score 0.0 against anything.
+    """
+
+    def __init__(self, embeddings: Union[np.ndarray, Sequence[Sequence[float]]], normalized: bool = False):
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1) if matrix.size else matrix.reshape(0, 0)
+        if not normalized:
+            matrix = normalize_rows(matrix)
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1]
+
+    def scores(self, queries: Union[np.ndarray, Sequence]) -> np.ndarray:
+        """
+        Cosine similarity of one query (shape [n]) or a batch (shape [q, n]).
+        
+        Returns shape [n_candidates] for a single query, [q, n_candidates] for a batch.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        single = queries.ndim == 1
+        queries = normalize_rows(queries.reshape(1, -1) if single else queries)
+        result = queries @ self.matrix.T
+        return result[0] if single else result
+
+    def top_k(self, queries: Union[np.ndarray, Sequence], k: int = 5) -> Union[List[tuple], List[List[tuple]]]:
+        """
+        Most similar rows as (index, score) tuples, best first.
+        
+        Accepts a single query or a batch; a batch returns one list per query.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        single = queries.ndim == 1
+        scores = self.scores(queries.reshape(1, -1) if single else queries)
+        results = [_top_k_row(row, k) for row in scores]
+        return results[0] if single else results
+
 
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row, leaving all-zero rows as zeros."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.size == 0:
+        return matrix
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
 
-def calculate_similarity(embedding1: List[float], embedding2: List[float]) -> float:
+
+def _top_k_row(scores: np.ndarray, k: int) -> List[tuple]:
+    """Indices/scores of the k largest values, sorted descending."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return []
+    if k < scores.shape[0]:
+        # Sorted so ties keep index order, as a stable full sort would
+        candidates = np.sort(np.argpartition(-scores, k - 1)[:k])
+    else:
+        candidates = np.arange(scores.shape[0])
+    ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(int(i), float(scores[i])) for i in ordered]
+
+
+def calculate_similarity(embedding1: Sequence[float], embedding2: Sequence[float]) -> float:
     """
     Calculate cosine similarity between two embeddings.
     """
-    import math
-    
-    dot_product = sum(a * b for a, b in zip(embedding1, embedding2))
-    magnitude1 = math.sqrt(sum(a ** 2 for a in embedding1))
-    magnitude2 = math.sqrt(sum(b ** 2 for b in embedding2))
-    
-    if magnitude1 == 0 or magnitude2 == 0:
+    a = np.asarray(embedding1, dtype=np.float32)
+    b = np.asarray(embedding2, dtype=np.float32)
+    magnitude = float(np.linalg.norm(a) * np.linalg.norm(b))
+    if magnitude == 0:
         return 0.0
-    
-    return dot_product / (magnitude1 * magnitude2)
+    return float(np.dot(a, b) / magnitude)
 
 
 def find_most_similar(
-    query_embedding: List[float],
-    candidate_embeddings: List[List[float]],
+    query_embedding: Sequence[float],
+    candidate_embeddings: Union[np.ndarray, Sequence[Sequence[float]], EmbeddingMatrix],
     top_k: int = 5,
 ) -> List[tuple]:
     """
     Find the most similar embeddings to the query.
     
     Returns list of (index, similarity_score) tuples, sorted by similarity.
+    Pass an EmbeddingMatrix to avoid re-normalizing candidates per call.
     """
-    similarities = [
-        (i, calculate_similarity(query_embedding, emb))
-        for i, emb in enumerate(candidate_embeddings)
-    ]
-    
-    similarities.sort(key=lambda x: x[1], reverse=True)
-    return similarities[:top_k]
+    if not isinstance(candidate_embeddings, EmbeddingMatrix):
+        if len(candidate_embeddings) == 0:
+            return []
+        candidate_embeddings = EmbeddingMatrix(candidate_embeddings)
+    return candidate_embeddings.top_k(query_embedding, top_k)
@@ -0,0 +1,209 @@
+"""
+Executor service.
+Runs CPU-bound work (NLP inference, hashing) off the asyncio event loop.
+
+Each BoundedExecutor wraps a thread or process pool with a hard cap on
+queued work, so a burst of requests is rejected quickly instead of piling
+up behind the pool and stalling every other route on the worker.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# NLP executor configuration
+NLP_EXECUTOR = os.getenv("NLP_EXECUTOR", "thread")  # "thread", "process" or "inline"
+NLP_EXECUTOR_WORKERS = int(os.getenv("NLP_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+NLP_EXECUTOR_MAX_QUEUE = int(os.getenv("NLP_EXECUTOR_MAX_QUEUE", "64"))
+
+# Password hashing executor configuration (bcrypt releases the GIL, so threads run in parallel)
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", str(max(1, (os.cpu_count() or 2) // 2))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+EXECUTOR_KINDS = ("thread", "process", "inline")
+
+
+class ExecutorSaturated(Exception):
+    """Raised when an executor already has its maximum amount of queued work."""
+
+    def __init__(self, name: str, retry_after: int = 1, status_code: int = 503):
+        super().__init__(f"{name} executor is at capacity")
+        self.name = name
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool with bounded queue depth.
+
+    At most max_workers calls run at once and at most max_queue more wait
+    for a free worker; anything beyond that raises ExecutorSaturated.
+    The "inline" kind runs calls directly on the event loop (debugging only).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        max_workers: int,
+        max_queue: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Optional[Callable[[], tuple]] = None,
+        retry_after: int = 1,
+        saturated_status: int = 503,
+    ):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind {kind!r}, expected one of {EXECUTOR_KINDS}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.initializer = initializer
+        # Evaluated whenever a pool starts, so recycled workers get current state
+        self.initargs = initargs
+        self.retry_after = retry_after
+        self.saturated_status = saturated_status
+
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _initargs(self) -> tuple:
+        return self.initargs() if self.initargs is not None else ()
+
+    def start(self) -> None:
+        """Create the underlying pool (idempotent)."""
+        if self._pool is not None or self.kind == "inline":
+            return
+        if self.kind == "process":
+            # spawn: never fork a process that is running an event loop and threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+                initargs=self._initargs(),
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"{self.name}-worker",
+                initializer=self.initializer,
+                initargs=self._initargs(),
+            )
+
+    async def warm_up(self) -> None:
+        """Start every worker now so the first real request doesn't pay for it."""
+        self.start()
+        if self._pool is None:
+            if self.initializer is not None:
+                self.initializer(*self._initargs())
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _noop) for _ in range(self.max_workers)
+        ))
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool and await its result."""
+        if self._pending >= self.capacity:
+            self._rejected += 1
+            raise ExecutorSaturated(self.name, self.retry_after, self.saturated_status)
+
+        self._pending += 1
+        try:
+            if self.kind == "inline":
+                return fn(*args)
+            self.start()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, fn, *args)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    def recycle(self) -> None:
+        """
+        Replace the pool with fresh workers (e.g. to pick up new models).
+
+        Calls already submitted finish on the old workers.
+        """
+        old, self._pool = self._pool, None
+        self.start()
+        if old is not None:
+            old.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool; it is recreated on next use."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+
+def _noop() -> None:
+    """Trivial task used to force worker start-up."""
+    return None
+
+
+def _nlp_worker_state() -> tuple:
+    """Parent-side state each NLP worker process starts from: the active crisis lexicon."""
+    from app.services.crisis import active_lexicon
+
+    return active_lexicon()
+
+
+def _warm_nlp_worker(crisis_lexicon=None, crisis_lexicon_version: Optional[str] = None) -> None:
+    """Pre-load NLP models in each worker so no request pays the load cost."""
+    # A failing initializer marks the whole pool as broken, so a model that
+    # can't be loaded here must only cost us the warm-up, not the pool
+    try:
+        from app.services.intent import _load_model
+        from app.services.sentiment import analyze_sentiment
+        from app.services.crisis import detect_crisis, install_lexicon
+
+        # Scan with the lexicon the parent reports, not this module's builtin one
+        if crisis_lexicon is not None:
+            install_lexicon(crisis_lexicon, crisis_lexicon_version)
+        _load_model()
+        analyze_sentiment("warm up")
+        detect_crisis("warm up")
+    except Exception as e:
+        print(f"NLP worker warm-up failed: {e}")
+
+
+nlp_executor = BoundedExecutor(
+    name="nlp",
+    kind=NLP_EXECUTOR,
+    max_workers=NLP_EXECUTOR_WORKERS,
+    max_queue=NLP_EXECUTOR_MAX_QUEUE,
+    # Threads share the models loaded once by app.services.warmup; each
+    # worker process needs its own copy
+    initializer=_warm_nlp_worker if NLP_EXECUTOR == "process" else None,
+    initargs=_nlp_worker_state if NLP_EXECUTOR == "process" else None,
+)
+
+password_executor = BoundedExecutor(
+    name="password",
+    kind="thread",
+    max_workers=PASSWORD_HASH_CONCURRENCY,
+    max_queue=PASSWORD_HASH_MAX_QUEUE,
+    # A login storm is the clients' burst, not an outage: ask them to back off
+    retry_after=2,
+    saturated_status=429,
+)
@@ -1,17 +1,24 @@
 """
 Intent classification service.
 Uses scikit-learn for text classification.
+
+Inference prefers the compact memory-mapped model (see intent_model),
+which needs neither pickle nor scikit-learn; the pickled Pipeline is the
+fallback. scikit-learn is only imported when training or unpickling.
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 import os
 import pickle
+import re
 from pathlib import Path
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.pipeline import Pipeline
+from app.services.intent_model import CompactIntentModel, export_pipeline, load_model
+from app.utils import artifacts
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
 
 
 @dataclass
@@ -35,88 +42,201 @@ INTENT_KEYWORDS = {
 }
 
 
+MODEL_PATH = Path(__file__).parent.parent / "ml" / "intent_model.pkl"
+COMPACT_MODEL_PATH = MODEL_PATH.with_suffix(".bin")
+
+# Versioned artifacts published by `python -m app.ml.train`
+INTENT_ARTIFACT_DIR = Path(os.getenv(
+    "INTENT_ARTIFACT_DIR",
+    str(Path(__file__).parent.parent / "ml" / "artifacts" / "intent"),
+))
+ARTIFACT_MODEL_FILE = "model.bin"
+
 # Global model cache
-_model: Optional[Pipeline] = None
+_model: Optional[Union[CompactIntentModel, "Pipeline"]] = None
+_model_version: Optional[str] = None
 
 
-def _load_model() -> Optional[Pipeline]:
-    """Load the trained intent model if available."""
-    global _model
+def _load_model() -> Optional[Union[CompactIntentModel, "Pipeline"]]:
+    """
+    Load the trained intent model if available.
+    
+    Order: published artifact, compact model file, pickled Pipeline.
+    """
+    global _model, _model_version
     if _model is not None:
         return _model
     
-    model_path = Path(__file__).parent.parent / "ml" / "intent_model.pkl"
-    if model_path.exists():
-        with open(model_path, "rb") as f:
+    candidates = []
+    version = artifacts.read_current(INTENT_ARTIFACT_DIR)
+    if version is not None:
+        candidates.append((version, INTENT_ARTIFACT_DIR / version / ARTIFACT_MODEL_FILE))
+    candidates.append(("compact", COMPACT_MODEL_PATH))
+    for label, path in candidates:
+        if not path.exists():
+            continue
+        try:
+            _model = load_model(path)
+            _model_version = label
+            return _model
+        except (OSError, ValueError) as e:
+            print(f"Error loading compact intent model {path}: {e}")
+    
+    if MODEL_PATH.exists():
+        with open(MODEL_PATH, "rb") as f:
             _model = pickle.load(f)
+        _model_version = "pickle"
         return _model
     
     return None
 
 
+def set_model(model: Union[CompactIntentModel, "Pipeline"], version: str) -> None:
+    """Swap in a loaded model; batches already running keep the old one."""
+    global _model, _model_version
+    _model, _model_version = model, version
+
+
+def model_version() -> Optional[str]:
+    """Which model is loaded: an artifact version, "compact", "pickle" or None."""
+    return _model_version
+
+
 def classify_intent(text: str) -> IntentResult:
     """
     Classify the intent of user input.
     
     Uses trained ML model if available, falls back to keyword matching.
     """
+    return classify_intent_batch([text])[0]
+
+
+def classify_intent_batch(texts: List[str]) -> List[IntentResult]:
+    """
+    Classify a batch of user inputs.
+    
+    Runs a single vectorized predict_proba over the whole batch, so the
+    TF-IDF/classifier per-call overhead is paid once instead of per text.
+    """
     # Try ML model first
     model = _load_model()
-    if model is not None:
+    if model is not None and texts:
         try:
-            probabilities = model.predict_proba([text])[0]
+            probabilities = model.predict_proba(list(texts))
             classes = model.classes_
-            
-            # Get top prediction
-            top_idx = probabilities.argmax()
-            label = classes[top_idx]
-            confidence = probabilities[top_idx]
-            
-            # Get alternatives (top 3)
-            sorted_indices = probabilities.argsort()[::-1][:3]
-            alternatives = [
-                (classes[i], probabilities[i])
-                for i in sorted_indices[1:]  # Exclude top
-            ]
-            
-            return IntentResult(
-                label=label,
-                confidence=confidence,
-                alternatives=alternatives,
-            )
+            return [_intent_from_probabilities(row, classes) for row in probabilities]
         except Exception:
             pass  # Fall back to keyword matching
     
-    # Fallback: keyword-based classification
-    text_lower = text.lower()
+    return [_classify_by_keywords(text) for text in texts]
+
+
+def _intent_from_probabilities(probabilities, classes) -> IntentResult:
+    """Build an IntentResult from one row of predict_proba output."""
+    # Get top prediction
+    top_idx = probabilities.argmax()
+    label = classes[top_idx]
+    confidence = probabilities[top_idx]
     
-    for intent, keywords in INTENT_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                return IntentResult(
-                    label=intent,
-                    confidence=0.6,  # Lower confidence for keyword match
-                    alternatives=[],
-                )
+    # Get alternatives (top 3)
+    sorted_indices = probabilities.argsort()[::-1][:3]
+    alternatives = [
+        (classes[i], probabilities[i])
+        for i in sorted_indices[1:]  # Exclude top
+    ]
     
-    # Default to unknown
     return IntentResult(
-        label="unknown",
-        confidence=0.5,
-        alternatives=[],
+        label=label,
+        confidence=confidence,
+        alternatives=alternatives,
     )
 
 
-def train_intent_model(training_data: List[tuple]) -> Pipeline:
+def _trie_pattern(words: List[str]) -> str:
+    """Regex alternation of words factored into a character trie (shared prefixes are tried once)."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordIntentClassifier:
+    """
+    Keyword fallback compiled into one word-boundary regex.
+    
+    Every intent is scored in a single C-level scan of the message, and
+    only whole-word hits count ("hi" does not match inside "this"). At each
+    word the longest keyword starting there counts ("help me find", not
+    also "help"). Each distinct keyword scores its length in words, so
+    phrases outweigh single words. Confidence is 0.5 + 0.3 * the intent's
+    share of the total score; ties keep INTENT_KEYWORDS order.
     """
-    Train a new intent classification model.
+    
+    def __init__(self, keywords: Dict[str, List[str]]):
+        self._order = {intent: i for i, intent in enumerate(keywords)}
+        self._intents: Dict[str, List[str]] = {}
+        for intent, words in keywords.items():
+            for keyword in words:
+                intents = self._intents.setdefault(keyword.lower(), [])
+                if intent not in intents:
+                    intents.append(intent)
+        self._weights = {keyword: float(len(keyword.split())) for keyword in self._intents}
+        # Zero-width match at every word start, capturing the longest keyword
+        # that ends on a word boundary (apostrophes and hyphens are word characters)
+        self._pattern = re.compile(
+            r"(?<![\w'-])(?=(" + _trie_pattern(list(self._intents)) + r")(?![\w'-]))"
+        ) if self._intents else None
+    
+    def classify(self, text: str) -> IntentResult:
+        scores: Dict[str, float] = {}
+        if self._pattern is not None:
+            for keyword in set(self._pattern.findall(text.lower())):
+                for intent in self._intents[keyword]:
+                    scores[intent] = scores.get(intent, 0.0) + self._weights[keyword]
+        
+        if not scores:
+            return IntentResult(label="unknown", confidence=0.5, alternatives=[])
+        if len(scores) == 1:
+            # One intent holds the whole score: 0.5 + 0.3 * 1
+            return IntentResult(label=next(iter(scores)), confidence=0.8, alternatives=[])
+        
+        total = sum(scores.values())
+        ranked = sorted(scores, key=lambda intent: (-scores[intent], self._order[intent]))
+        confidences = [(intent, round(0.5 + 0.3 * scores[intent] / total, 4)) for intent in ranked]
+        label, confidence = confidences[0]
+        return IntentResult(label=label, confidence=confidence, alternatives=confidences[1:3])
+
+
+_keyword_classifier = KeywordIntentClassifier(INTENT_KEYWORDS)
+
+
+def _classify_by_keywords(text: str) -> IntentResult:
+    """Fallback: keyword-based classification."""
+    return _keyword_classifier.classify(text)
+
+
+def fit_intent_pipeline(training_data: List[tuple]) -> "Pipeline":
+    """
+    Fit the TF-IDF + Naive Bayes pipeline without saving it.
     
     Args:
         training_data: List of (text, intent_label) tuples
-    
-    Returns:
-        Trained sklearn Pipeline
     """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.pipeline import Pipeline
+
     texts, labels = zip(*training_data)
     
     model = Pipeline([
@@ -125,15 +245,32 @@ def train_intent_model(training_data: List[tuple]) -> Pipeline:
     ])
     
     model.fit(texts, labels)
+    return model
+
+
+def train_intent_model(training_data: List[tuple]) -> "Pipeline":
+    """
+    Train a new intent classification model.
+    
+    Saves both the pickled Pipeline and the compact model file.
+    
+    Args:
+        training_data: List of (text, intent_label) tuples
+    
+    Returns:
+        Trained sklearn Pipeline
+    """
+    model = fit_intent_pipeline(training_data)
     
     # Save model
-    model_path = Path(__file__).parent.parent / "ml" / "intent_model.pkl"
-    model_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(model_path, "wb") as f:
+    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(MODEL_PATH, "wb") as f:
         pickle.dump(model, f)
+    export_pipeline(model, COMPACT_MODEL_PATH)
     
     # Update global cache
-    global _model
-    _model = model
+    global _model, _model_version
+    _model = load_model(COMPACT_MODEL_PATH)
+    _model_version = "compact"
     
     return model
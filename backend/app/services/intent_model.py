@@ -0,0 +1,207 @@
+"""
+Compact intent model format.
+TF-IDF + Multinomial NB as flat arrays in one memory-mapped file.
+
+Replaces unpickling a full sklearn Pipeline: the sorted vocabulary, IDF
+weights, per-class feature log-probabilities and class priors are written
+as raw NumPy arrays behind a small JSON header. Loading maps the file
+read-only (workers share the pages), and inference is a vectorized
+re-implementation of the sklearn transform + predict_proba that needs
+neither sklearn nor pickle.
+
+File layout:
+    8 bytes   magic b"INTENTM1"
+    4 bytes   little-endian uint32 header length
+    header    UTF-8 JSON: params + {name: {dtype, shape, offset}}
+    arrays    raw C-order data, each aligned to 64 bytes
+"""
+
+import json
+import re
+import struct
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"INTENTM1"
+_ALIGN = 64
+
+# TfidfVectorizer settings the scorer reproduces; anything else is rejected at export
+_DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+class CompactIntentModel:
+    """
+    Memory-mapped TF-IDF + Multinomial NB scorer.
+
+    Exposes classes_ and predict_proba() like the sklearn Pipeline it was
+    exported from, so callers can use either interchangeably.
+    """
+
+    def __init__(self, params: dict, arrays: Dict[str, np.ndarray]):
+        self.params = params
+        self.vocab = arrays["vocab"]  # [V] sorted terms; position = feature column
+        self.idf = arrays["idf"]  # [V]
+        self.feature_log_prob_t = arrays["feature_log_prob_t"]  # [V, C]
+        self.class_log_prior = arrays["class_log_prior"]  # [C]
+        self.classes_ = arrays["classes"]  # [C]
+
+        self.lowercase = params["lowercase"]
+        self.ngram_range = tuple(params["ngram_range"])
+        self.sublinear_tf = params["sublinear_tf"]
+        self.norm = params["norm"]
+        self._token_re = re.compile(params["token_pattern"])
+
+    def _ngrams(self, text: str) -> List[str]:
+        """Word n-grams exactly as sklearn's word analyzer produces them."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def transform(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        TF-IDF features as sparse (doc, column, value) triples.
+
+        Rows are L2-normalized when the exported vectorizer used norm="l2".
+        """
+        docs: List[int] = []
+        grams: List[str] = []
+        for i, text in enumerate(texts):
+            text_grams = self._ngrams(text)
+            grams.extend(text_grams)
+            docs.extend([i] * len(text_grams))
+        if not grams:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        # Vocabulary lookup: binary search, then drop grams that aren't terms
+        gram_array = np.array(grams)
+        cols = np.searchsorted(self.vocab, gram_array)
+        cols[cols == len(self.vocab)] = 0
+        known = self.vocab[cols] == gram_array
+        docs_array = np.asarray(docs, dtype=np.int64)[known]
+        cols = cols[known].astype(np.int64)
+
+        # Term counts per (doc, column)
+        keys, counts = np.unique(docs_array * len(self.vocab) + cols, return_counts=True)
+        docs_array, cols = np.divmod(keys, len(self.vocab))
+        tf = counts.astype(np.float64)
+        if self.sublinear_tf:
+            tf = np.log(tf) + 1
+        values = tf * self.idf[cols]
+
+        if self.norm == "l2":
+            norms = np.sqrt(np.bincount(docs_array, weights=values ** 2, minlength=len(texts)))
+            norms[norms == 0] = 1.0
+            values = values / norms[docs_array]
+        elif self.norm == "l1":
+            norms = np.bincount(docs_array, weights=np.abs(values), minlength=len(texts))
+            norms[norms == 0] = 1.0
+            values = values / norms[docs_array]
+        return docs_array, cols, values
+
+    def predict_log_proba(self, texts: Sequence[str]) -> np.ndarray:
+        docs, cols, values = self.transform(texts)
+        joint = np.tile(self.class_log_prior, (len(texts), 1))
+        np.add.at(joint, docs, values[:, None] * self.feature_log_prob_t[cols])
+        # log-sum-exp normalization, as MultinomialNB.predict_log_proba
+        peak = joint.max(axis=1, keepdims=True)
+        log_norm = peak + np.log(np.exp(joint - peak).sum(axis=1, keepdims=True))
+        return joint - log_norm
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        return np.exp(self.predict_log_proba(texts))
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        return self.classes_[self.predict_log_proba(texts).argmax(axis=1)]
+
+
+def export_pipeline(pipeline, path: Union[str, Path]) -> None:
+    """Write a fitted TfidfVectorizer + MultinomialNB pipeline in compact form."""
+    vectorizer, classifier = pipeline.steps[0][1], pipeline.steps[-1][1]
+    unsupported = {
+        "analyzer": vectorizer.analyzer != "word",
+        "preprocessor": vectorizer.preprocessor is not None,
+        "tokenizer": vectorizer.tokenizer is not None,
+        "stop_words": vectorizer.stop_words is not None,
+        "strip_accents": vectorizer.strip_accents is not None,
+        "binary": vectorizer.binary,
+        "use_idf": not vectorizer.use_idf,
+    }
+    rejected = [name for name, bad in unsupported.items() if bad]
+    if rejected:
+        raise ValueError(f"Compact format does not support vectorizer settings: {', '.join(rejected)}")
+
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    order = np.argsort(np.array(terms))  # sklearn columns -> sorted term order
+    arrays = {
+        "vocab": np.array(terms)[order],
+        "idf": vectorizer.idf_[order].astype(np.float64),
+        "feature_log_prob_t": np.ascontiguousarray(classifier.feature_log_prob_[:, order].T, dtype=np.float64),
+        "class_log_prior": classifier.class_log_prior_.astype(np.float64),
+        "classes": np.array([str(c) for c in classifier.classes_]),
+    }
+    params = {
+        "lowercase": bool(vectorizer.lowercase),
+        "token_pattern": vectorizer.token_pattern or _DEFAULT_TOKEN_PATTERN,
+        "ngram_range": list(vectorizer.ngram_range),
+        "sublinear_tf": bool(vectorizer.sublinear_tf),
+        "norm": vectorizer.norm,
+    }
+    write_model(path, params, arrays)
+
+
+def write_model(path: Union[str, Path], params: dict, arrays: Dict[str, np.ndarray]) -> None:
+    """Serialize params and arrays into the single-file layout."""
+    # Offsets depend on the header size, which depends on the offsets;
+    # iterate until the header length settles
+    header_len = 0
+    while True:
+        offset = _aligned(len(MAGIC) + 4 + header_len)
+        layout = {}
+        for name, array in arrays.items():
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset = _aligned(offset + array.nbytes)
+        header = json.dumps({"params": params, "arrays": layout}).encode()
+        if len(header) == header_len:
+            break
+        header_len = len(header)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        for name, array in arrays.items():
+            f.seek(layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    tmp.replace(path)
+
+
+def load_model(path: Union[str, Path]) -> CompactIntentModel:
+    """Memory-map a compact model file."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a compact intent model")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len))
+
+    # One read-only mapping of the whole file; arrays are views into it
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {
+        name: np.ndarray(tuple(spec["shape"]), dtype=np.dtype(spec["dtype"]),
+                         buffer=buffer, offset=spec["offset"])
+        for name, spec in header["arrays"].items()
+    }
+    return CompactIntentModel(header["params"], arrays)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
@@ -0,0 +1,120 @@
+"""
+Ollama KV context store.
+Keeps each conversation's returned `context` so the next turn skips the prefix.
+
+/api/generate returns a `context` token array encoding everything the
+model has processed so far (system prompt, prompts and replies). Passing
+it back with the next prompt lets Ollama reuse that prefix instead of
+evaluating it again, so a turn only pays for its own new tokens.
+
+An entry is only reused for the exact next turn: it records the message
+count it leads up to, and any turn that didn't go through the model
+(template replies, cached replies, another worker) makes it stale. The
+caller then falls back to the conversation-memory prompt, which re-primes
+a fresh context. Contexts longer than OLLAMA_CONTEXT_MAX_TOKENS are not
+kept, which restarts the conversation from its bounded memory before the
+model's own window fills up.
+
+Every entry is tagged with a fingerprint of the model and system prompt;
+when that changes, the whole store is dropped.
+"""
+
+import os
+import sys
+import uuid
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.utils.cache import LRUCache
+
+# Store configuration
+OLLAMA_CONTEXT_REUSE = os.getenv("OLLAMA_CONTEXT_REUSE", "true").lower() == "true"
+OLLAMA_CONTEXT_CACHE_SIZE = int(os.getenv("OLLAMA_CONTEXT_CACHE_SIZE", "1024"))
+OLLAMA_CONTEXT_CACHE_MB = float(os.getenv("OLLAMA_CONTEXT_CACHE_MB", "64"))
+OLLAMA_CONTEXT_MAX_TOKENS = int(os.getenv("OLLAMA_CONTEXT_MAX_TOKENS", "3072"))  # Keep below the model's num_ctx
+
+
+@dataclass
+class KVContext:
+    """A conversation's Ollama context and the turn it leads into."""
+    tokens: array  # Token ids, int32
+    fingerprint: str  # Model and system prompt the tokens were produced with
+    message_count: int  # Conversation message count the next turn must start from
+
+
+def _sizeof_context(context: KVContext) -> int:
+    return sys.getsizeof(context) + sys.getsizeof(context.tokens)
+
+
+class KVContextStore:
+    """LRU store of Ollama context arrays, capped by entries and memory."""
+
+    def __init__(
+        self,
+        maxsize: int = OLLAMA_CONTEXT_CACHE_SIZE,
+        max_memory_mb: float = OLLAMA_CONTEXT_CACHE_MB,
+        max_tokens: int = OLLAMA_CONTEXT_MAX_TOKENS,
+        enabled: bool = OLLAMA_CONTEXT_REUSE,
+    ):
+        self.max_tokens = max_tokens
+        self.enabled = enabled
+        self._entries = LRUCache(maxsize, sizeof=_sizeof_context, max_memory=int(max_memory_mb * 1024 * 1024))
+        self._fingerprint: Optional[str] = None
+        self.stale = 0  # Entries dropped because a turn bypassed the model
+        self.overflows = 0  # Contexts too long to keep
+        self.invalidations = 0  # Store clears after a model or system prompt change
+
+    def get(self, conversation_id: uuid.UUID, message_count: Optional[int], fingerprint: str) -> Optional[List[int]]:
+        """Context to send with the turn starting at message_count, if it's still valid."""
+        if not self.enabled or message_count is None:
+            return None
+        self._check_fingerprint(fingerprint)
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+        if entry.message_count != message_count:
+            self.stale += 1
+            self._entries.pop(conversation_id)
+            return None
+        return entry.tokens.tolist()
+
+    def store(
+        self,
+        conversation_id: uuid.UUID,
+        message_count: Optional[int],
+        fingerprint: str,
+        context: Optional[List[int]],
+    ) -> None:
+        """Keep the context returned by the turn that started at message_count."""
+        if not self.enabled or message_count is None or not context:
+            return
+        self._check_fingerprint(fingerprint)
+        if len(context) > self.max_tokens:
+            self.overflows += 1
+            self._entries.pop(conversation_id)
+            return
+        # Each turn adds the user message and the reply
+        self._entries.set(conversation_id, KVContext(array("i", context), fingerprint, message_count + 2))
+
+    def _check_fingerprint(self, fingerprint: str) -> None:
+        if fingerprint != self._fingerprint:
+            if self._fingerprint is not None and len(self._entries):
+                print(f"Ollama model or system prompt changed, dropping {len(self._entries)} KV contexts")
+                self.invalidations += 1
+            self._entries.clear()
+            self._fingerprint = fingerprint
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self._entries.stats(),
+            "stale": self.stale,
+            "overflows": self.overflows,
+            "invalidations": self.invalidations,
+        }
+
+
+kv_context_store = KVContextStore()
@@ -1,16 +1,36 @@
 """
 LLM integration service.
 Uses Ollama for local LLM inference.
+
+All calls share one pooled httpx.AsyncClient (opened and closed by the
+app lifespan), so LLM turns reuse keep-alive connections instead of
+paying TCP setup and pool construction per message.
 """
 
+import hashlib
+import json
 import os
 import httpx
-from typing import Optional
+from typing import AsyncIterator, List, Optional
+
+from app.services.kv_context import kv_context_store
+from app.services.response_cache import response_cache, is_cacheable
 
 # Ollama configuration
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
 
+# HTTP client configuration
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_READ_TIMEOUT = float(os.getenv("OLLAMA_READ_TIMEOUT", "30"))
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "100"))
+OLLAMA_MAX_KEEPALIVE = int(os.getenv("OLLAMA_MAX_KEEPALIVE", "100"))
+OLLAMA_KEEPALIVE_EXPIRY = float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", "30"))
+OLLAMA_HTTP2 = os.getenv("OLLAMA_HTTP2", "true").lower() == "true"
+
+# Shared client, created in the app lifespan
+_client: Optional[httpx.AsyncClient] = None
+
 # System prompt for mental health chatbot
 SYSTEM_PROMPT = """You are a compassionate mental health support companion. You must:
 
@@ -25,37 +45,102 @@ SYSTEM_PROMPT = """You are a compassionate mental health support companion. You
 You are NOT a replacement for professional mental health care. You are a supportive companion for daily check-ins and emotional support."""
 
 
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build a pooled keep-alive client for talking to Ollama."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            connect=OLLAMA_CONNECT_TIMEOUT,
+            read=OLLAMA_READ_TIMEOUT,
+            write=OLLAMA_CONNECT_TIMEOUT,
+            pool=OLLAMA_CONNECT_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=OLLAMA_MAX_KEEPALIVE,
+            keepalive_expiry=OLLAMA_KEEPALIVE_EXPIRY,
+        ),
+        http2=OLLAMA_HTTP2 and _http2_available(),
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Open the shared client (called from the app lifespan)."""
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if the lifespan hasn't run (e.g. scripts)."""
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
+
+
 async def generate_response(
     user_message: str,
     intent: str,
     sentiment,
     conversation_id: int,
     max_tokens: int = 256,
+    crisis_severity: int = 0,
+    history: Optional[str] = None,
+    message_count: Optional[int] = None,
 ) -> str:
     """
     Generate a response using Ollama LLM.
     
-    Falls back to a template response if Ollama is unavailable.
+    history is the conversation memory section (recent turns and rolling
+    summary) to include in the prompt. When the previous turn (ending at
+    message_count) went through the model, its KV context is sent instead
+    and history is left out, since the model has already seen it. Serves
+    repeated messages from the response cache, but only for prompts that
+    carry no conversation (no history or context) and never for
+    crisis-flagged messages. Falls back to a template response if Ollama
+    is unavailable.
     """
+    fingerprint = model_fingerprint()
+    context = kv_context_store.get(conversation_id, message_count, fingerprint)
+    probe = None
+    if _uses_response_cache(intent, crisis_severity, history, context):
+        probe = await response_cache.lookup(user_message, intent, sentiment)
+        if probe.response is not None:
+            return probe.response
+
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{OLLAMA_BASE_URL}/api/generate",
-                json={
-                    "model": OLLAMA_MODEL,
-                    "prompt": _build_prompt(user_message, intent, sentiment),
-                    "system": SYSTEM_PROMPT,
-                    "stream": False,
-                    "options": {
-                        "num_predict": max_tokens,
-                        "temperature": 0.7,
-                    },
-                },
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("response", _get_fallback_response(intent))
+        response = await get_http_client().post(
+            f"{OLLAMA_BASE_URL}/api/generate",
+            json=_build_payload(user_message, intent, sentiment, max_tokens, stream=False,
+                                history=history, context=context),
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            if "response" in data:
+                kv_context_store.store(conversation_id, message_count, fingerprint, data.get("context"))
+                if probe is not None:
+                    response_cache.store(probe, data["response"])
+                return data["response"]
+            return _get_fallback_response(intent)
             
     except Exception as e:
         # Log error but don't expose to user
@@ -64,7 +149,107 @@ async def generate_response(
     return _get_fallback_response(intent)
 
 
-def _build_prompt(user_message: str, intent: str, sentiment) -> str:
+async def stream_response(
+    user_message: str,
+    intent: str,
+    sentiment,
+    conversation_id: int,
+    max_tokens: int = 256,
+    crisis_severity: int = 0,
+    history: Optional[str] = None,
+    message_count: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a response from Ollama token by token.
+    
+    Yields text fragments as Ollama produces them; a cached reply is
+    yielded whole. history and message_count work as in
+    generate_response. If Ollama is unavailable before any text was
+    produced, yields the fallback response instead.
+    """
+    fingerprint = model_fingerprint()
+    context = kv_context_store.get(conversation_id, message_count, fingerprint)
+    probe = None
+    if _uses_response_cache(intent, crisis_severity, history, context):
+        probe = await response_cache.lookup(user_message, intent, sentiment)
+        if probe.response is not None:
+            yield probe.response
+            return
+
+    fragments = []
+    completed = False
+    try:
+        async with get_http_client().stream(
+            "POST",
+            f"{OLLAMA_BASE_URL}/api/generate",
+            json=_build_payload(user_message, intent, sentiment, max_tokens, stream=True,
+                                history=history, context=context),
+        ) as response:
+            if response.status_code == 200:
+                # Ollama streams newline-delimited JSON chunks
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    token = chunk.get("response", "")
+                    if token:
+                        fragments.append(token)
+                        yield token
+                    if chunk.get("done"):
+                        completed = True
+                        # The final chunk carries the context for the next turn
+                        kv_context_store.store(conversation_id, message_count, fingerprint, chunk.get("context"))
+                        break
+    except Exception as e:
+        # Log error but don't expose to user
+        print(f"Ollama error: {e}")
+    
+    if not fragments:
+        yield _get_fallback_response(intent)
+    elif completed and probe is not None:
+        response_cache.store(probe, "".join(fragments))
+
+
+def _uses_response_cache(intent: str, crisis_severity: int, history: Optional[str], context) -> bool:
+    """
+    The response cache is shared across users and keyed on the message
+    alone, so a prompt built from a conversation must neither be answered
+    from it nor stored in it.
+    """
+    return not history and not context and is_cacheable(intent, crisis_severity)
+
+
+def _build_payload(
+    user_message: str,
+    intent: str,
+    sentiment,
+    max_tokens: int,
+    stream: bool,
+    history: Optional[str] = None,
+    context: Optional[List[int]] = None,
+) -> dict:
+    """Build the /api/generate request body (a reused context replaces history)."""
+    payload = {
+        "model": OLLAMA_MODEL,
+        "prompt": _build_prompt(user_message, intent, sentiment, None if context else history),
+        "system": SYSTEM_PROMPT,
+        "stream": stream,
+        "options": {
+            "num_predict": max_tokens,
+            "temperature": 0.7,
+        },
+    }
+    if context:
+        payload["context"] = context
+    return payload
+
+
+def model_fingerprint() -> str:
+    """Identifies the model and system prompt a KV context was produced with."""
+    return hashlib.blake2b(f"{OLLAMA_MODEL}\0{SYSTEM_PROMPT}".encode(), digest_size=8).hexdigest()
+
+
+def _build_prompt(user_message: str, intent: str, sentiment, history: Optional[str] = None) -> str:
     """Build the prompt for the LLM."""
     context = f"""User intent: {intent}
 Emotional tone: {sentiment.label} (score: {sentiment.compound_score:.2f})
@@ -72,7 +257,10 @@ Emotional tone: {sentiment.label} (score: {sentiment.compound_score:.2f})
 User message: {user_message}
 
 Respond with empathy and support. Keep your response concise (2-4 sentences)."""
-    
+
+    if history:
+        # Conversation memory goes first so the newest message stays last
+        context = f"{history}\n\n{context}"
     return context
 
 
@@ -95,12 +283,11 @@ def _get_fallback_response(intent: str) -> str:
 async def check_ollama_health() -> bool:
     """Check if Ollama is available and the model is loaded."""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
-            if response.status_code == 200:
-                data = response.json()
-                models = [m["name"] for m in data.get("models", [])]
-                return OLLAMA_MODEL in models or f"{OLLAMA_MODEL}:latest" in models
+        response = await get_http_client().get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5.0)
+        if response.status_code == 200:
+            data = response.json()
+            models = [m["name"] for m in data.get("models", [])]
+            return OLLAMA_MODEL in models or f"{OLLAMA_MODEL}:latest" in models
     except Exception:
         pass
     return False
@@ -0,0 +1,90 @@
+"""
+Mood rollup service.
+Per-day mood aggregates, so dashboards never scan raw mood entries.
+
+log_mood upserts the entry's (user, UTC day) row of mood_daily_rollup in
+the same transaction that inserts the entry, so rollups are committed (or
+rolled back) together with the entries they count. The upsert is a
+single INSERT ... ON CONFLICT DO UPDATE whose arithmetic runs in SQL, so
+concurrent check-ins on the same day can't lose an update.
+
+Weekly and monthly buckets are merged from the daily rows (at most one
+row per day of the requested window). Existing data is loaded with
+python -m app.utils.backfill_mood_rollups.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import MoodDailyRollup
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+@dataclass
+class MoodBucket:
+    """Aggregates of one day, ISO week (starting Monday) or calendar month."""
+    start: date
+    entry_count: int
+    score_sum: int
+    score_min: int
+    score_max: int
+
+    @property
+    def average(self) -> float:
+        return self.score_sum / self.entry_count
+
+
+def upsert_statement(dialect_name: str, user_id: uuid.UUID, day: date, score: int):
+    """Add one entry with score to the user's rollup for day."""
+    insert = _INSERTS.get(dialect_name)
+    if insert is None:
+        raise ValueError(f"Mood rollups need INSERT ... ON CONFLICT support, not available on {dialect_name}")
+    rollup = MoodDailyRollup.__table__
+    statement = insert(rollup).values(
+        user_id=user_id,
+        day=day,
+        entry_count=1,
+        score_sum=score,
+        score_min=score,
+        score_max=score,
+    )
+    new = statement.excluded
+    return statement.on_conflict_do_update(
+        index_elements=[rollup.c.user_id, rollup.c.day],
+        set_={
+            "entry_count": rollup.c.entry_count + 1,
+            "score_sum": rollup.c.score_sum + new.score_sum,
+            "score_min": case((new.score_min < rollup.c.score_min, new.score_min), else_=rollup.c.score_min),
+            "score_max": case((new.score_max > rollup.c.score_max, new.score_max), else_=rollup.c.score_max),
+        },
+    )
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def merge_buckets(rollups: Iterable[MoodDailyRollup], bucket: str) -> List[MoodBucket]:
+    """Combine daily rollups (in day order) into day, week or month buckets."""
+    buckets: List[MoodBucket] = []
+    current: Optional[MoodBucket] = None
+    for rollup in rollups:
+        start = bucket_start(rollup.day, bucket)
+        if current is None or current.start != start:
+            current = MoodBucket(start, 0, 0, rollup.score_min, rollup.score_max)
+            buckets.append(current)
+        current.entry_count += rollup.entry_count
+        current.score_sum += rollup.score_sum
+        current.score_min = min(current.score_min, rollup.score_min)
+        current.score_max = max(current.score_max, rollup.score_max)
+    return buckets
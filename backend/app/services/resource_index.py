@@ -0,0 +1,311 @@
+"""
+Resource vector index service.
+In-memory semantic search over the resource catalog.
+
+The index is loaded once at startup and holds pre-normalized embeddings
+next to ready-built ResourceResponse objects, so a semantic query is a
+matrix-vector product plus vectorized filter masks with no DB round trip.
+It refreshes incrementally from Resource.updated_at.
+
+When a published embedding store exists (see embedding_store), catalog
+embeddings are read from its shared memory map instead of the per-row JSON
+column; only rows missing from the store or updated after its built_at
+are held locally.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import defer
+
+from app.models import Resource
+from app.schemas import ResourceResponse
+from app.services import embedding_store
+from app.services.embedding_store import EmbeddingStore
+from app.services.embeddings import normalize_rows
+
+# Index configuration
+RESOURCE_PRIORITY_WEIGHT = float(os.getenv("RESOURCE_PRIORITY_WEIGHT", "0.2"))  # 0 = similarity only
+RESOURCE_INDEX_REFRESH_SECONDS = float(os.getenv("RESOURCE_INDEX_REFRESH_SECONDS", "60"))
+
+
+@dataclass
+class _IndexedResource:
+    """One catalog row as held by the index."""
+    response: ResourceResponse
+    category: str
+    is_crisis: bool
+    priority: int
+    embedding: Optional[List[float]]
+    in_store: bool = False  # embedding lives in the shared store, not in `embedding`
+
+
+@dataclass
+class _Snapshot:
+    """Immutable arrays searched by queries; replaced wholesale on change."""
+    responses: List[ResourceResponse]
+    store_matrix: Optional[np.ndarray]  # shared [m, dim] memmap, or None
+    store_rows: np.ndarray  # per resource: row in store_matrix, -1 if not there
+    local_matrix: np.ndarray  # [l, dim] float32 L2-normalized embeddings held in process
+    local_rows: np.ndarray  # per resource: row in local_matrix, -1 if not there
+    categories: np.ndarray
+    is_crisis: np.ndarray
+    priorities: np.ndarray
+    priority_norm: np.ndarray  # priority scaled to [0, 1]
+
+
+def _empty_snapshot() -> _Snapshot:
+    return _Snapshot(
+        responses=[],
+        store_matrix=None,
+        store_rows=np.array([], dtype=np.int64),
+        local_matrix=np.zeros((0, 0), dtype=np.float32),
+        local_rows=np.array([], dtype=np.int64),
+        categories=np.array([], dtype=object),
+        is_crisis=np.array([], dtype=bool),
+        priorities=np.array([], dtype=np.int64),
+        priority_norm=np.array([], dtype=np.float32),
+    )
+
+
+def _to_indexed(resource: Resource, embedding: Optional[List[float]], in_store: bool = False) -> _IndexedResource:
+    return _IndexedResource(
+        response=ResourceResponse(
+            id=str(resource.id),
+            title=resource.title,
+            description=resource.description,
+            category=resource.category,
+            url=resource.url,
+            phone=resource.phone,
+            tags=resource.tags or [],
+            is_crisis_resource=resource.is_crisis_resource,
+        ),
+        category=resource.category,
+        is_crisis=bool(resource.is_crisis_resource),
+        priority=resource.priority or 0,
+        embedding=embedding,
+        in_store=in_store,
+    )
+
+
+class ResourceIndex:
+    """Semantic resource search held entirely in process memory."""
+
+    def __init__(self, priority_weight: float = RESOURCE_PRIORITY_WEIGHT):
+        self.priority_weight = priority_weight
+        self.loaded = False
+        self._rows: Dict[str, _IndexedResource] = {}
+        self._snapshot = _empty_snapshot()
+        self._watermark: Optional[datetime] = None
+        self._store: Optional[EmbeddingStore] = None
+
+    def __len__(self) -> int:
+        return len(self._snapshot.responses)
+
+    @property
+    def store_version(self) -> Optional[str]:
+        return self._store.version if self._store is not None else None
+
+    async def load(self, db: AsyncSession) -> None:
+        """Full load of every resource."""
+        try:
+            self._store = embedding_store.open_store()
+        except Exception as e:
+            print(f"Error opening embedding store: {e}")
+            self._store = None
+
+        if self._store is None:
+            resources = (await db.execute(select(Resource))).scalars().all()
+            self._rows = {str(r.id): _to_indexed(r, r.embedding) for r in resources}
+        else:
+            # Skip the JSON embedding column; fetch it only for rows the store
+            # lacks or that were edited after it was built
+            stmt = select(Resource).options(defer(Resource.embedding))
+            resources = (await db.execute(stmt)).scalars().all()
+            missing = [r.id for r in resources if not self._store_is_current(r)]
+            local = {}
+            if missing:
+                stmt = select(Resource.id, Resource.embedding).where(Resource.id.in_(missing))
+                local = {str(rid): emb for rid, emb in (await db.execute(stmt)).all()}
+            self._rows = {
+                str(r.id): _to_indexed(r, local.get(str(r.id)), in_store=str(r.id) not in local)
+                for r in resources
+            }
+        self._watermark = max((r.updated_at for r in resources if r.updated_at), default=None)
+        self._rebuild()
+        self.loaded = True
+
+    def _store_is_current(self, resource: Resource) -> bool:
+        """Whether the store holds this row's embedding as of its last edit."""
+        if str(resource.id) not in self._store.rows:
+            return False
+        return resource.updated_at is None or resource.updated_at <= self._store.built_at
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        Apply changes since the last load/refresh.
+
+        Fetches only rows updated after the watermark, plus the id list to
+        drop deleted resources. Returns the number of rows changed.
+        """
+        if not self.loaded or self.store_version != embedding_store.current_version():
+            # First load, or a new store version was published: swap everything
+            await self.load(db)
+            return len(self)
+
+        stmt = select(Resource)
+        if self._watermark is not None:
+            # >= so rows sharing the watermark timestamp are never missed
+            stmt = stmt.where(Resource.updated_at >= self._watermark)
+        previous_watermark = self._watermark
+        changed = [
+            r for r in (await db.execute(stmt)).scalars().all()
+            if str(r.id) not in self._rows or r.updated_at != previous_watermark
+        ]
+        live_ids = {str(i) for i in (await db.execute(select(Resource.id))).scalars()}
+
+        removed = [rid for rid in self._rows if rid not in live_ids]
+        for rid in removed:
+            del self._rows[rid]
+        for resource in changed:
+            # Changed since the store was built, so its stored row may be stale
+            self._rows[str(resource.id)] = _to_indexed(resource, resource.embedding)
+            if resource.updated_at and (self._watermark is None or resource.updated_at > self._watermark):
+                self._watermark = resource.updated_at
+
+        if changed or removed:
+            self._rebuild()
+        return len(changed) + len(removed)
+
+    def upsert(self, resource: Resource) -> None:
+        """Add or replace a single resource (e.g. right after an admin edit)."""
+        self._rows[str(resource.id)] = _to_indexed(resource, resource.embedding)
+        self._rebuild()
+
+    def remove(self, resource_id) -> None:
+        if self._rows.pop(str(resource_id), None) is not None:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Build a new snapshot and swap it in atomically for readers."""
+        rows = list(self._rows.values())
+        if not rows:
+            self._snapshot = _empty_snapshot()
+            return
+
+        store = self._store
+        store_rows = np.array(
+            [store.rows[rid] if r.in_store else -1 for rid, r in self._rows.items()]
+            if store is not None else [-1] * len(rows),
+            dtype=np.int64,
+        )
+
+        local = [r for r in rows if not r.in_store and r.embedding]
+        dims = [len(r.embedding) for r in local]
+        dim = store.dim if store is not None else (max(set(dims), key=dims.count) if dims else 0)
+        local = [r for r in local if len(r.embedding) == dim]
+        local_positions = {id(r): i for i, r in enumerate(local)}
+        # Rows without a usable embedding score 0 and rank by priority
+        local_rows = np.array([local_positions.get(id(r), -1) for r in rows], dtype=np.int64)
+        local_matrix = np.array([r.embedding for r in local], dtype=np.float32).reshape(len(local), dim)
+
+        priorities = np.array([r.priority for r in rows], dtype=np.int64)
+        max_priority = priorities.max()
+        self._snapshot = _Snapshot(
+            responses=[r.response for r in rows],
+            store_matrix=store.matrix if store is not None else None,
+            store_rows=store_rows,
+            local_matrix=normalize_rows(local_matrix),
+            local_rows=local_rows,
+            categories=np.array([r.category for r in rows], dtype=object),
+            is_crisis=np.array([r.is_crisis for r in rows], dtype=bool),
+            priorities=priorities,
+            priority_norm=(
+                np.clip(priorities, 0, None) / max_priority if max_priority > 0
+                else np.zeros(len(rows))
+            ).astype(np.float32),
+        )
+
+    def search(
+        self,
+        query_embedding: Optional[Sequence[float]],
+        limit: int = 5,
+        category: Optional[str] = None,
+        is_crisis: Optional[bool] = None,
+        min_priority: Optional[int] = None,
+    ) -> List[ResourceResponse]:
+        """
+        Rank resources by similarity blended with priority.
+
+        score = (1 - w) * cosine_similarity + w * normalized_priority
+        Without a query embedding, results are ordered by priority alone.
+        """
+        snapshot = self._snapshot
+        n = len(snapshot.responses)
+        if n == 0 or limit <= 0:
+            return []
+
+        mask = np.ones(n, dtype=bool)
+        if category is not None:
+            mask &= snapshot.categories == category
+        if is_crisis is not None:
+            mask &= snapshot.is_crisis == is_crisis
+        if min_priority is not None:
+            mask &= snapshot.priorities >= min_priority
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+
+        if query_embedding is not None and snapshot.local_matrix.shape[1] == len(query_embedding):
+            query = normalize_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+            similarity = _similarity(snapshot, candidates, query)
+            weight = self.priority_weight
+        else:
+            similarity = np.zeros(candidates.size, dtype=np.float32)
+            weight = 1.0
+        scores = (1 - weight) * similarity + weight * snapshot.priority_norm[candidates]
+
+        k = min(limit, candidates.size)
+        if k < candidates.size:
+            top = np.sort(np.argpartition(-scores, k - 1)[:k])
+        else:
+            top = np.arange(candidates.size)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [snapshot.responses[i] for i in candidates[top]]
+
+
+def _similarity(snapshot: _Snapshot, candidates: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each candidate, reading from the store or local rows."""
+    similarity = np.zeros(candidates.size, dtype=np.float32)
+    for matrix, rows in (
+        (snapshot.store_matrix, snapshot.store_rows[candidates]),
+        (snapshot.local_matrix, snapshot.local_rows[candidates]),
+    ):
+        present = rows >= 0
+        if matrix is not None and present.any():
+            # Full mat-vec over the (shared) matrix, then gather: no row copies
+            similarity[present] = (matrix @ query)[rows[present]]
+    return similarity
+
+
+resource_index = ResourceIndex()
+
+
+async def run_refresh_loop(
+    session_maker: async_sessionmaker,
+    interval: float = RESOURCE_INDEX_REFRESH_SECONDS,
+) -> None:
+    """Periodically pull resource changes into the index (runs until cancelled)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_maker() as session:
+                await resource_index.refresh(session)
+        except Exception as e:
+            print(f"Resource index refresh failed: {e}")
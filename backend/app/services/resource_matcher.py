@@ -3,18 +3,21 @@ Resource matching service.
 Semantic search for mental health resources.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Resource
 from app.schemas import ResourceResponse
+from app.services.embedding_service import embedding_service
+from app.services.embeddings import calculate_similarity
+from app.services.resource_index import resource_index
 
 
 # Crisis resources (always available even without DB)
 CRISIS_RESOURCES = [
     ResourceResponse(
-        id=0,
+        id="0",
         title="988 Suicide & Crisis Lifeline",
         description="Free, confidential support 24/7. Call or text 988.",
         category="hotline",
@@ -24,7 +27,7 @@ CRISIS_RESOURCES = [
         is_crisis_resource=True,
     ),
     ResourceResponse(
-        id=0,
+        id="0",
         title="Crisis Text Line",
         description="Text HOME to 741741 to connect with a counselor.",
         category="hotline",
@@ -34,7 +37,7 @@ CRISIS_RESOURCES = [
         is_crisis_resource=True,
     ),
     ResourceResponse(
-        id=0,
+        id="0",
         title="SAMHSA National Helpline",
         description="Treatment referrals and information 24/7. Call 1-800-662-4357.",
         category="hotline",
@@ -46,6 +49,22 @@ CRISIS_RESOURCES = [
 ]
 
 
+# Active crisis resource list; replaced by the artifact registry when a
+# resources.json version is published
+_crisis_resources: List[ResourceResponse] = CRISIS_RESOURCES
+_crisis_resources_version = "builtin"
+
+
+def set_crisis_resources(resources: List[ResourceResponse], version: str) -> None:
+    """Swap in a validated crisis resource list."""
+    global _crisis_resources, _crisis_resources_version
+    _crisis_resources, _crisis_resources_version = list(resources), version
+
+
+def crisis_resources_version() -> str:
+    return _crisis_resources_version
+
+
 async def get_relevant_resources(
     query: str,
     is_crisis: bool = False,
@@ -62,7 +81,7 @@ async def get_relevant_resources(
     
     # Always include crisis resources for crisis queries
     if is_crisis:
-        results.extend(CRISIS_RESOURCES)
+        results.extend(_crisis_resources)
     
     # Try to get additional resources from database
     if db is not None:
@@ -86,30 +105,34 @@ async def get_relevant_resources(
 
 async def search_resources_semantic(
     query: str,
-    query_embedding: List[float],
+    query_embedding: Optional[Sequence[float]],
     db: AsyncSession,
     limit: int = 5,
+    category: Optional[str] = None,
+    is_crisis: Optional[bool] = None,
+    min_priority: Optional[int] = None,
 ) -> List[ResourceResponse]:
     """
     Search resources using semantic similarity.
     
-    Requires resources to have pre-computed embeddings.
-    Uses cosine similarity for matching.
+    Answered in-process from the resource index (cosine similarity blended
+    with priority). Falls back to the DB query until the index is loaded.
     """
-    # TODO: Implement once sentence-transformers embeddings are set up
-    # For now, fall back to keyword search
-    return await get_relevant_resources(query, is_crisis=False, db=db, limit=limit)
+    if not resource_index.loaded:
+        return await get_relevant_resources(query, is_crisis=bool(is_crisis), db=db, limit=limit)
+    
+    if query_embedding is None:
+        query_embedding = await embedding_service.embed(query)
+    
+    return resource_index.search(
+        query_embedding,
+        limit=limit,
+        category=category,
+        is_crisis=is_crisis,
+        min_priority=min_priority,
+    )
 
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """Calculate cosine similarity between two vectors."""
-    import math
-    
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    magnitude1 = math.sqrt(sum(a ** 2 for a in vec1))
-    magnitude2 = math.sqrt(sum(b ** 2 for b in vec2))
-    
-    if magnitude1 == 0 or magnitude2 == 0:
-        return 0.0
-    
-    return dot_product / (magnitude1 * magnitude2)
+    return calculate_similarity(vec1, vec2)
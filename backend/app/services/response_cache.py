@@ -0,0 +1,147 @@
+"""
+LLM response cache service.
+Reuses generated replies for repeated or near-identical messages.
+
+Entries are keyed on the normalized message plus intent plus a coarse
+sentiment bucket, so exact repeats are an O(1) lookup. When
+LLM_CACHE_SIMILARITY is set, a miss falls back to comparing the message
+embedding against cached entries with the same intent and bucket.
+Crisis-flagged messages are never read from or written to the cache.
+"""
+
+import os
+import re
+import sys
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+import numpy as np
+
+from app.services.embedding_service import embedding_service
+from app.services.embeddings import EmbeddingMatrix
+from app.utils.cache import LRUCache
+
+# Cache configuration
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))  # Seconds
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0"))  # 0 disables near-duplicate hits
+
+_NON_WORD_RE = re.compile(r"[^\w\s']+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class CachedResponse:
+    """A cached LLM reply and (optionally) the embedding of its message."""
+    text: str
+    embedding: Optional[np.ndarray] = None
+
+
+@dataclass
+class CacheProbe:
+    """Result of a cache lookup, reused to store the reply on a miss."""
+    key: Hashable
+    normalized: str
+    embedding: Optional[np.ndarray] = None
+    response: Optional[str] = None
+
+
+def normalize_message(text: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace."""
+    text = _NON_WORD_RE.sub(" ", text.lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def sentiment_bucket(sentiment) -> str:
+    """Coarse sentiment band so near-identical tones share entries."""
+    score = sentiment.compound_score
+    if score <= -0.5:
+        return "very_negative"
+    if score < -0.1:
+        return "negative"
+    if score <= 0.1:
+        return "neutral"
+    if score < 0.5:
+        return "positive"
+    return "very_positive"
+
+
+def is_cacheable(intent: str, crisis_severity: int) -> bool:
+    """Crisis-flagged messages must always get a fresh response."""
+    return LLM_CACHE_ENABLED and crisis_severity == 0 and intent != "crisis"
+
+
+def _sizeof_entry(entry: CachedResponse) -> int:
+    size = sys.getsizeof(entry.text)
+    if entry.embedding is not None:
+        size += entry.embedding.nbytes
+    return size
+
+
+class ResponseCache:
+    """LRU/TTL cache of LLM replies with optional near-duplicate matching."""
+
+    def __init__(
+        self,
+        maxsize: int = LLM_CACHE_SIZE,
+        ttl: float = LLM_CACHE_TTL,
+        similarity_threshold: float = LLM_CACHE_SIMILARITY,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self._entries = LRUCache(maxsize, ttl=ttl, sizeof=_sizeof_entry)
+        self.semantic_hits = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.similarity_threshold > 0
+
+    async def lookup(self, message: str, intent: str, sentiment) -> CacheProbe:
+        """Find a cached reply; probe.response is None on a miss."""
+        normalized = normalize_message(message)
+        bucket = sentiment_bucket(sentiment)
+        probe = CacheProbe(key=(normalized, intent, bucket), normalized=normalized)
+
+        entry = self._entries.get(probe.key)
+        if entry is not None:
+            probe.response = entry.text
+            return probe
+
+        if self.semantic_enabled:
+            probe.embedding = await embedding_service.embed(normalized)
+            match = self._nearest(probe.embedding, intent, bucket)
+            if match is not None:
+                self.semantic_hits += 1
+                probe.response = match.text
+        return probe
+
+    def _nearest(self, embedding, intent: str, bucket: str) -> Optional[CachedResponse]:
+        """Most similar cached entry with the same intent and bucket, if close enough."""
+        if embedding is None:
+            return None
+        candidates = [
+            entry for (_, entry_intent, entry_bucket), entry in self._entries.items()
+            if entry_intent == intent and entry_bucket == bucket and entry.embedding is not None
+        ]
+        if not candidates:
+            return None
+        matrix = EmbeddingMatrix([entry.embedding for entry in candidates])
+        [(index, score)] = matrix.top_k(embedding, 1)
+        return candidates[index] if score >= self.similarity_threshold else None
+
+    def store(self, probe: CacheProbe, response: str) -> None:
+        """Cache a freshly generated reply for the probed message."""
+        self._entries.set(probe.key, CachedResponse(response, probe.embedding))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        stats = self._entries.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["semantic_hits"] = self.semantic_hits
+        stats["hit_rate"] = round((stats["hits"] + self.semantic_hits) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+response_cache = ResponseCache()
@@ -1,10 +1,27 @@
 """
 Sentiment analysis service.
-Uses TextBlob for polarity and subjectivity analysis.
+Scores polarity and subjectivity with TextBlob's pattern lexicon.
+
+The en-sentiment.xml lexicon that ships with TextBlob is parsed once into
+a flat {word: (polarity, subjectivity, intensity, is_adverb)} dict, and
+messages are tokenized with precompiled regexes. Scoring reproduces
+TextBlob's PatternAnalyzer (negations, adverb modifiers, "!" boosts,
+emoticons, "(!)" sarcasm) without building a TextBlob per message or
+importing TextBlob/NLTK at all.
 """
 
+import importlib.util
+import os
+import re
 from dataclasses import dataclass
-from textblob import TextBlob
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+# Defaults to the lexicon bundled with the textblob package
+SENTIMENT_LEXICON_PATH = os.getenv("SENTIMENT_LEXICON_PATH", "")
+
+# (polarity, subjectivity, intensity, is_adverb)
+LexiconEntry = Tuple[float, float, float, bool]
 
 
 @dataclass
@@ -16,17 +33,267 @@ class SentimentResult:
     label: str  # "positive", "negative", "neutral"
 
 
-def analyze_sentiment(text: str) -> SentimentResult:
+# ============== Tokenizer (pattern's find_tokens) ==============
+
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+_LEADING_PUNCTUATION = tuple(PUNCTUATION.replace(".", ""))
+_TRAILING_PUNCTUATION = _LEADING_PUNCTUATION + (".",)
+_SENTENCE_END = {"...", ".", "!", "?"}
+_SENTENCE_TAIL = {"'", '"', "”", "’", "...", ".", "!", "?", ")"}
+
+_CONTRACTIONS = ("'d", "'m", "'s", "'ll", "'re", "'ve", "n't")
+_CONTRACTION_RE = re.compile("|".join(_CONTRACTIONS))
+_QUOTES = str.maketrans({quote: f" {quote} " for quote in "“”‘’'\""})
+_PARAGRAPH_RE = re.compile(r"\r?\n(?:\r?\n)+")
+_EOS = "END-OF-SENTENCE"
+
+ABBREVIATIONS = {
+    "a.", "adj.", "adv.", "al.", "a.m.", "c.", "cf.", "comp.", "conf.", "def.",
+    "ed.", "e.g.", "esp.", "etc.", "ex.", "f.", "fig.", "gen.", "id.", "i.e.",
+    "int.", "l.", "m.", "Med.", "Mil.", "Mr.", "n.", "n.q.", "orig.", "pl.",
+    "pred.", "pres.", "p.m.", "ref.", "v.", "vs.", "w/",
+}
+_ABBREVIATION_RE = re.compile(
+    r"^[A-Za-z]\.$"  # single letter, "T. De Smedt"
+    r"|^(?:[A-Za-z]\.)+$"  # alternating letters, "U.S."
+    r"|^[A-Z][b|c|d|f|g|h|j|k|l|m|n|p|q|r|s|t|v|w|x|z]+.$"  # capital + consonants, "Mr."
+)
+
+EMOTICONS = {
+    1.00: ("<3", "♥", ">:D", ":-D", ":D", "=-D", "=D", "X-D", "x-D", "XD", "xD", "8-D"),
+    0.75: (">:P", ":-P", ":P", ":-p", ":p", ":-b", ":b", ":c)", ":o)", ":^)"),
+    0.50: (">:)", ":-)", ":)", "=)", "=]", ":]", ":}", ":>", ":3", "8)", "8-)"),
+    0.25: (">;]", ";-)", ";)", ";-]", ";]", ";D", ";^)", "*-)", "*)"),
+    0.05: (">:o", ":-O", ":O", ":o", ":-o", "o_O", "o.O", "°O°", "°o°"),
+    -0.25: (">:/", ":-/", ":/", ":\\", ">:\\", ":-.", ":-s", ":s", ":S", ":-S", ">.>"),
+    -0.75: (">:[", ":-(", ":(", "=(", ":-[", ":[", ":{", ":-<", ":c", ":-c", "=/"),
+    -1.00: (":'(", ":'''(", ";'("),
+}
+_EMOTICON_SCORES: Dict[str, float] = {}
+for _score, _faces in EMOTICONS.items():
+    for _face in _faces:
+        _EMOTICON_SCORES.setdefault(_face.lower(), _score)
+
+# Emoticons the tokenizer split apart (": )") are glued back together
+_EMOTICON_RE = re.compile(r"(%s)($|\s)" % "|".join(
+    " ?".join(re.escape(char) for char in face) for faces in EMOTICONS.values() for face in faces
+))
+_SARCASM_RE = re.compile(r"\( ?\! ?\)")
+
+
+def _split_punctuation(token: str, tokens: List[str]) -> None:
+    """Split leading/trailing punctuation and sentence periods off one token."""
+    tail = []
+    while token.startswith(_LEADING_PUNCTUATION) and token not in _CONTRACTIONS:
+        tokens.append(token[0])
+        token = token[1:]
+    while token.endswith(_TRAILING_PUNCTUATION) and token not in _CONTRACTIONS:
+        if token.endswith(_LEADING_PUNCTUATION):
+            tail.append(token[-1])
+            token = token[:-1]
+        if token.endswith("..."):
+            tail.append("...")
+            token = token[:-3].rstrip(".")
+        if token.endswith("."):
+            if token in ABBREVIATIONS or _ABBREVIATION_RE.match(token):
+                break
+            tail.append(".")
+            token = token[:-1]
+    if token:
+        tokens.append(token)
+    tokens.extend(reversed(tail))
+
+
+def tokenize(text: str) -> List[str]:
     """
-    Analyze the sentiment of text using TextBlob.
-    
-    Returns SentimentResult with polarity, subjectivity, and label.
+    Lowercased tokens exactly as TextBlob's sentiment analyzer sees them.
+
+    Note that, as in TextBlob, quotes are split off after contractions, so
+    "don't" becomes "do", "n", "'", "t".
+    """
+    text = _CONTRACTION_RE.sub(r" \g<0>", text).translate(_QUOTES)
+    text = _PARAGRAPH_RE.sub(f" {_EOS} ", text)
+
+    tokens: List[str] = []
+    for token in text.split():
+        if token.isalnum():
+            tokens.append(token)
+        else:
+            _split_punctuation(token, tokens)
+
+    # Sentences end at . ! ? ... (plus closing quotes/brackets); the sarcasm
+    # and emoticon fix-ups never cross a sentence boundary
+    sentences, start, i = [], 0, 0
+    while i < len(tokens):
+        if tokens[i] in _SENTENCE_END or tokens[i] == _EOS:
+            while i < len(tokens) and (tokens[i] in _SENTENCE_TAIL or tokens[i] == _EOS):
+                if tokens[i] in ("'", '"'):
+                    break  # Quotes open the next sentence
+                i += 1
+            sentences.append([t for t in tokens[start:i] if t != _EOS])
+            start = i
+        i += 1
+    sentences.append(tokens[start:i])
+
+    words: List[str] = []
+    for sentence in sentences:
+        if not sentence:
+            continue
+        joined = " ".join(sentence)
+        if "(" in joined:
+            joined = _SARCASM_RE.sub("(!)", joined)
+        joined = _EMOTICON_RE.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), joined)
+        words.extend(joined.lower().split())
+    return words
+
+
+# ============== Lexicon ==============
+
+def _mean(scores: List[Tuple[float, ...]]) -> List[float]:
+    return [sum(column) / float(len(column) or 1) for column in zip(*scores)]
+
+
+def _default_lexicon_path() -> str:
+    # find_spec locates the package without importing it (and NLTK with it)
+    spec = importlib.util.find_spec("textblob")
+    if spec is None or not spec.submodule_search_locations:
+        return ""
+    return os.path.join(list(spec.submodule_search_locations)[0], "en", "en-sentiment.xml")
+
+
+def load_lexicon(path: str) -> Tuple[Dict[str, LexiconEntry], str]:
+    """
+    Parse a pattern sentiment XML file into {word: LexiconEntry}.
+
+    Senses are averaged per part-of-speech tag, then across tags, and every
+    adjective also yields its -ly adverb ("terrible" -> "terribly"), as
+    TextBlob's English Sentiment does. Returns (lexicon, version).
+    """
+    root = ElementTree.parse(path).getroot()
+    senses: Dict[str, Dict[Optional[str], List[Tuple[float, float, float]]]] = {}
+    for node in root.findall("word"):
+        form = node.get("form")
+        if form:
+            senses.setdefault(form, {}).setdefault(node.get("pos"), []).append((
+                float(node.get("polarity", 0.0)),
+                float(node.get("subjectivity", 0.0)),
+                float(node.get("intensity", 1.0)),
+            ))
+
+    by_tag: Dict[str, Dict[Optional[str], List[float]]] = {}
+    for word, tags in senses.items():
+        averaged = {tag: _mean(scores) for tag, scores in tags.items()}
+        averaged[None] = _mean(list(averaged.values()))
+        by_tag[word] = averaged
+
+    for word, tags in list(by_tag.items()):
+        if "JJ" in tags:
+            stem = word[:-1] + "i" if word.endswith("y") else word
+            stem = stem[:-2] if stem.endswith("le") else stem
+            adverb = by_tag.setdefault(stem + "ly", {})
+            adverb["RB"] = adverb[None] = tags["JJ"]
+
+    lexicon = {
+        word: (tags[None][0], tags[None][1], tags[None][2], "RB" in tags)
+        for word, tags in by_tag.items()
+    }
+    return lexicon, f"{root.get('language', 'en')}-{root.get('version', 'unknown')}"
+
+
+# Global lexicon cache
+_lexicon: Optional[Dict[str, LexiconEntry]] = None
+_lexicon_version: Optional[str] = None
+_lexicon_error: Optional[str] = None
+
+
+def _load_lexicon() -> Dict[str, LexiconEntry]:
     """
-    blob = TextBlob(text)
-    
-    polarity = blob.sentiment.polarity
-    subjectivity = blob.sentiment.subjectivity
-    
+    Load the sentiment lexicon once.
+
+    If it can't be loaded, every message scores neutral; the error is kept
+    for lexicon_error() so warm-up marks sentiment as failed in /ready.
+    """
+    global _lexicon, _lexicon_version, _lexicon_error
+    if _lexicon is not None:
+        return _lexicon
+
+    path = SENTIMENT_LEXICON_PATH or _default_lexicon_path()
+    try:
+        if not path:
+            raise FileNotFoundError("textblob is not installed and SENTIMENT_LEXICON_PATH is not set")
+        _lexicon, _lexicon_version = load_lexicon(path)
+    except (OSError, ElementTree.ParseError) as e:
+        _lexicon_error = f"{path or 'no lexicon path'}: {e}"
+        print(f"❌ Sentiment lexicon failed to load, scoring every message neutral: {_lexicon_error}")
+        _lexicon, _lexicon_version = {}, None
+    return _lexicon
+
+
+def lexicon_error() -> Optional[str]:
+    """Why the lexicon failed to load, or None if it loaded (or wasn't loaded yet)."""
+    return _lexicon_error
+
+
+def lexicon_version() -> Optional[str]:
+    """Version of the loaded lexicon (e.g. "en-1.3"), None if not loaded (yet)."""
+    return _lexicon_version
+
+
+# ============== Scoring ==============
+
+NEGATIONS = ("no", "not", "n't", "never")
+
+
+def _score(words: List[str], lexicon: Dict[str, LexiconEntry]) -> Tuple[float, float]:
+    """(polarity, subjectivity) of tokenized text, as pattern's Sentiment."""
+    assessments: List[list] = []  # [polarity, subjectivity, intensity, negated]
+    modifier: Optional[str] = None  # preceding known adverb ("really good")
+    negation: Optional[str] = None  # preceding negation ("not good")
+    for word in words:
+        entry = lexicon.get(word)
+        if entry is not None:
+            polarity, subjectivity, intensity, is_adverb = entry
+            if modifier is None:
+                assessments.append([polarity, subjectivity, intensity, False])
+            else:
+                last = assessments[-1]
+                last[0] = max(-1.0, min(polarity * last[2], 1.0))
+                last[1] = max(-1.0, min(subjectivity * last[2], 1.0))
+                last[2] = intensity
+            if negation is not None:
+                assessments[-1][2] = 1.0 / assessments[-1][2]
+                assessments[-1][3] = True
+            modifier = word if is_adverb else None
+            negation = word if word in NEGATIONS else None
+            continue
+
+        if word in NEGATIONS:
+            negation = word
+        elif negation and len(word.strip("'")) > 1:
+            negation = None  # Negation carries over small words ("not a good")
+        if negation is not None and modifier is not None and modifier.endswith("ly"):
+            assessments[-1][3] = True  # "really not good"
+            negation = None
+        elif modifier and len(word) > 2:
+            modifier = None
+        if word == "!" and assessments:
+            assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+        if word == "(!)":
+            assessments.append([0.0, 1.0, 1.0, False])
+        if not word.isalpha() and len(word) <= 5 and word not in PUNCTUATION:
+            emoticon = _EMOTICON_SCORES.get(word)
+            if emoticon is not None:
+                assessments.append([emoticon, 1.0, 1.0, False])
+
+    if not assessments:
+        return 0.0, 0.0
+    # "not good" = slightly bad, "not bad" = slightly good
+    polarity = sum(p * -0.5 if negated else p for p, _, _, negated in assessments)
+    subjectivity = sum(s for _, s, _, _ in assessments)
+    return polarity / len(assessments), subjectivity / len(assessments)
+
+
+def _result(polarity: float, subjectivity: float) -> SentimentResult:
     # Determine label based on polarity
     if polarity > 0.1:
         label = "positive"
@@ -34,7 +301,7 @@ def analyze_sentiment(text: str) -> SentimentResult:
         label = "negative"
     else:
         label = "neutral"
-    
+
     return SentimentResult(
         compound_score=polarity,
         polarity=polarity,
@@ -43,17 +310,43 @@ def analyze_sentiment(text: str) -> SentimentResult:
     )
 
 
-def get_emotional_tone(text: str) -> dict:
+def analyze_sentiment(text: str) -> SentimentResult:
+    """
+    Analyze the sentiment of text.
+
+    Returns SentimentResult with polarity, subjectivity, and label.
+    """
+    return _result(*_score(tokenize(text), _load_lexicon()))
+
+
+def analyze_sentiment_batch(texts: List[str]) -> List[SentimentResult]:
+    """
+    Analyze the sentiment of several texts in one call.
+
+    Lets callers amortize executor hand-offs across a batch of messages;
+    repeated texts within a batch are scored once.
+    """
+    lexicon = _load_lexicon()
+    scores: Dict[str, Tuple[float, float]] = {}
+    for text in texts:
+        if text not in scores:
+            scores[text] = _score(tokenize(text), lexicon)
+    return [_result(*scores[text]) for text in texts]
+
+
+def get_emotional_tone(text: str, sentiment: Optional[SentimentResult] = None) -> dict:
     """
     Get a more detailed emotional analysis.
-    
-    Returns dict with various emotional indicators.
+
+    Pass the SentimentResult if the text was already analyzed, so it isn't
+    scored twice. Returns dict with various emotional indicators.
     """
-    sentiment = analyze_sentiment(text)
-    
+    if sentiment is None:
+        sentiment = analyze_sentiment(text)
+
     # Simple heuristic-based emotional indicators
     text_lower = text.lower()
-    
+
     indicators = {
         "sentiment": sentiment.label,
         "intensity": abs(sentiment.polarity),
@@ -62,5 +355,5 @@ def get_emotional_tone(text: str) -> dict:
             word in text_lower for word in ["help", "struggling", "hard", "difficult"]
         ),
     }
-    
+
     return indicators
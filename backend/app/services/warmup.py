@@ -0,0 +1,163 @@
+"""
+Model warm-up service.
+Loads every model concurrently in the background after startup.
+
+The app starts serving (and /ready reports ready) as soon as the database
+and HTTP client are up; ML models load in parallel on their own executors
+so the first chat after a deploy doesn't pay for them. Each component's
+state and the import time of the heavy libraries are kept for /ready.
+"""
+
+import asyncio
+import importlib
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.database import async_session_maker
+from app.services.embedding_service import embedding_executor
+from app.services.executor import nlp_executor
+from app.services.resource_index import resource_index
+
+# Component states
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+UNAVAILABLE = "unavailable"  # Optional model not installed/trained; fallback in use
+FAILED = "failed"
+
+# Warm-up result: (model available, {module: import ms})
+WarmResult = Tuple[bool, Dict[str, float]]
+
+
+@dataclass
+class ComponentStatus:
+    """Warm-up state of one model or index."""
+    state: str = PENDING
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+def _timed_import(module: str, times: Dict[str, float]) -> None:
+    """Import module, recording how long it took if it wasn't loaded yet."""
+    if module in sys.modules:
+        return
+    start = time.perf_counter()
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        return
+    times[module] = round((time.perf_counter() - start) * 1000, 1)
+
+
+# Warm-up functions run on executors (process workers too), so they are
+# module-level and return picklable results.
+
+def _warm_intent() -> WarmResult:
+    from app.services.intent import _load_model
+    times: Dict[str, float] = {}
+    had_sklearn = "sklearn" in sys.modules
+    start = time.perf_counter()
+    available = _load_model() is not None
+    if not had_sklearn and "sklearn" in sys.modules:
+        # Only the pickle fallback imports it (timing includes the unpickle)
+        times["sklearn"] = round((time.perf_counter() - start) * 1000, 1)
+    return available, times
+
+
+def _warm_sentiment() -> WarmResult:
+    from app.services.sentiment import _load_lexicon, lexicon_error
+    times: Dict[str, float] = {}
+    start = time.perf_counter()
+    if not _load_lexicon():
+        # Not a fallback: without the lexicon every message scores neutral
+        raise RuntimeError(f"sentiment lexicon unavailable ({lexicon_error() or 'empty lexicon'})")
+    times["sentiment_lexicon"] = round((time.perf_counter() - start) * 1000, 1)
+    return True, times
+
+
+def _warm_crisis() -> WarmResult:
+    from app.services.crisis import detect_crisis
+    detect_crisis("warm up")
+    return True, {}
+
+
+def _warm_embeddings() -> WarmResult:
+    times: Dict[str, float] = {}
+    _timed_import("sentence_transformers", times)
+    from app.services.embeddings import encode_batch
+    # First encode also initializes the tokenizer and torch kernels
+    return encode_batch(["warm up"]) is not None, times
+
+
+async def _warm_resource_index() -> WarmResult:
+    async with async_session_maker() as session:
+        await resource_index.load(session)
+    return True, {}
+
+
+class ModelWarmup:
+    """Runs warm-up steps concurrently and records their status."""
+
+    def __init__(self, steps: Dict[str, Callable[[], Awaitable[WarmResult]]]):
+        self.steps = steps
+        self.components = {name: ComponentStatus() for name in steps}
+        self.import_times: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record_import(self, module: str, duration_ms: float) -> None:
+        self.import_times[module] = round(duration_ms, 1)
+
+    def start(self) -> None:
+        """Begin warming in the background (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        await asyncio.gather(*(self._run_step(name, step) for name, step in self.steps.items()))
+
+    async def _run_step(self, name: str, step: Callable[[], Awaitable[WarmResult]]) -> None:
+        status = self.components[name]
+        status.state = WARMING
+        start = time.perf_counter()
+        try:
+            available, import_times = await step()
+            status.state = READY if available else UNAVAILABLE
+            self.import_times.update(import_times)
+        except Exception as e:
+            print(f"Warm-up of {name} failed: {e}")
+            status.state = FAILED
+            status.error = str(e)
+        status.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def done(self) -> bool:
+        return all(s.state in (READY, UNAVAILABLE, FAILED) for s in self.components.values())
+
+    @property
+    def warm(self) -> bool:
+        """Every component is loaded or deliberately running on its fallback."""
+        return all(s.state in (READY, UNAVAILABLE) for s in self.components.values())
+
+    def report(self) -> dict:
+        return {
+            "models_warm": self.warm,
+            "models": {name: asdict(s) for name, s in self.components.items()},
+            "import_times_ms": dict(sorted(self.import_times.items(), key=lambda kv: -kv[1])),
+        }
+
+
+model_warmup = ModelWarmup({
+    "intent": lambda: nlp_executor.run(_warm_intent),
+    "sentiment": lambda: nlp_executor.run(_warm_sentiment),
+    "crisis": lambda: nlp_executor.run(_warm_crisis),
+    "embeddings": lambda: embedding_executor.run(_warm_embeddings),
+    "resource_index": _warm_resource_index,
+})
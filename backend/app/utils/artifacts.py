@@ -0,0 +1,65 @@
+"""
+Versioned on-disk artifact directories.
+
+Layout:
+    <root>/v0001/...    one directory per published version
+    <root>/CURRENT      name of the active version
+
+Publishing writes the new version directory first and then atomically
+replaces CURRENT, so readers see either the old or the new version and
+never a half-written one. Processes that still have old files open
+(e.g. memory-mapped) keep working until they switch over.
+"""
+
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+_VERSION_RE = re.compile(r"^v(\d+)$")
+
+
+def list_versions(root: Path) -> List[str]:
+    """Published version names, oldest first."""
+    if not root.exists():
+        return []
+    versions = [p.name for p in root.iterdir() if p.is_dir() and _VERSION_RE.match(p.name)]
+    return sorted(versions, key=lambda v: int(v[1:]))
+
+
+def next_version(root: Path) -> str:
+    """Name for the next version directory (v0001, v0002, ...)."""
+    versions = list_versions(root)
+    number = int(versions[-1][1:]) + 1 if versions else 1
+    return f"v{number:04d}"
+
+
+def read_current(root: Path) -> Optional[str]:
+    """Active version name, or None if nothing has been published."""
+    try:
+        version = (root / "CURRENT").read_text().strip()
+    except FileNotFoundError:
+        return None
+    return version if (root / version).is_dir() else None
+
+
+def publish(root: Path, version: str) -> None:
+    """Atomically make version the active one."""
+    if not (root / version).is_dir():
+        raise FileNotFoundError(f"Artifact version {version} not found under {root}")
+    tmp = root / f".CURRENT.{os.getpid()}.tmp"
+    tmp.write_text(version)
+    os.replace(tmp, root / "CURRENT")
+
+
+def prune(root: Path, keep: int = 3) -> List[str]:
+    """Delete all but the newest `keep` versions, never the active one."""
+    current = read_current(root)
+    versions = list_versions(root)
+    removed = []
+    for version in versions[:-keep] if keep > 0 else versions:
+        if version != current:
+            shutil.rmtree(root / version, ignore_errors=True)
+            removed.append(version)
+    return removed
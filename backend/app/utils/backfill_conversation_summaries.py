@@ -0,0 +1,129 @@
+"""
+Conversation summary backfill script.
+Recomputes the denormalized conversation columns from the messages table.
+
+Adds any Conversation column or index missing from a database created
+before they existed (create_all never alters tables), then sets
+message_count, last_message_preview and max_crisis_severity of every
+conversation from its messages, in a single transaction. updated_at is
+left as it is, so the history order doesn't change. On PostgreSQL the
+conversations table is locked for the rebuild, so chat turns finishing
+meanwhile wait and are counted on top afterwards. Safe to run again at
+any time.
+
+Usage:
+    poetry run python -m app.utils.backfill_conversation_summaries
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import bindparam, func, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateColumn
+
+from app.database import engine
+from app.models import Conversation, Message
+from app.services.chatbot import _preview
+
+# Conversations whose preview is written per UPDATE round trip
+PREVIEW_BATCH_SIZE = 1000
+
+
+async def _add_missing_columns(conn: AsyncConnection) -> list:
+    """ALTER TABLE ... ADD COLUMN for model columns the table lacks; returns their names."""
+    conversations = Conversation.__table__
+    existing = await conn.run_sync(
+        lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns(conversations.name)}
+    )
+    added = []
+    for column in conversations.columns:
+        if column.name not in existing:
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            await conn.execute(text(f"ALTER TABLE {conversations.name} ADD COLUMN {ddl}"))
+            added.append(column.name)
+    for index in (*conversations.indexes, *Message.__table__.indexes):
+        await conn.run_sync(index.create, checkfirst=True)
+    return added
+
+
+async def backfill(db_engine: AsyncEngine = engine) -> int:
+    """Recompute every conversation's summary columns; returns the number of conversations."""
+    conversations = Conversation.__table__
+    messages = Message.__table__
+
+    async with db_engine.begin() as conn:
+        # Step 1: Bring tables created before the summary columns up to date
+        added = await _add_missing_columns(conn)
+        if added:
+            print(f"    Added columns: {', '.join(added)}")
+
+        # Step 2: Hold concurrent chat turns until the rebuild commits
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("LOCK TABLE conversations IN EXCLUSIVE MODE"))
+
+        # Step 3: Counts and peak severity in one UPDATE with correlated subqueries
+        of_conversation = messages.c.conversation_id == conversations.c.id
+        result = await conn.execute(
+            conversations.update().values(
+                message_count=select(func.count()).where(of_conversation).scalar_subquery(),
+                max_crisis_severity=select(func.coalesce(func.max(messages.c.crisis_severity), 0))
+                .where(of_conversation)
+                .scalar_subquery(),
+                # Keep the history order: don't let onupdate bump it to now
+                updated_at=conversations.c.updated_at,
+            )
+        )
+        total = result.rowcount
+
+        # Step 4: Previews of each conversation's newest message, written in batches
+        ranked = select(
+            messages.c.conversation_id,
+            messages.c.content,
+            func.row_number().over(
+                partition_by=messages.c.conversation_id,
+                order_by=(messages.c.created_at.desc(), messages.c.id.desc()),
+            ).label("rn"),
+        ).subquery()
+        latest = await conn.execute(
+            select(ranked.c.conversation_id, ranked.c.content).where(ranked.c.rn == 1)
+        )
+        update_preview = (
+            conversations.update()
+            .where(conversations.c.id == bindparam("conversation_id"))
+            .values(last_message_preview=bindparam("preview"), updated_at=conversations.c.updated_at)
+        )
+        batch = []
+        for conversation_id, content in latest:
+            batch.append({"conversation_id": conversation_id, "preview": _preview(content)})
+            if len(batch) >= PREVIEW_BATCH_SIZE:
+                await conn.execute(update_preview, batch)
+                batch = []
+        if batch:
+            await conn.execute(update_preview, batch)
+        return total
+
+
+def main():
+    """Entry point for the script."""
+    print("🚀 Backfilling conversation summaries...")
+    print(f"    Engine: {engine.url}")
+
+    async def run():
+        try:
+            return await backfill()
+        finally:
+            await engine.dispose()
+
+    start = time.perf_counter()
+    try:
+        count = asyncio.run(run())
+    except Exception as e:
+        print(f"❌ Failed to backfill conversation summaries: {e}")
+        sys.exit(1)
+    print(f"✅ Updated {count} conversations in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Mood rollup backfill script.
+Rebuilds mood_daily_rollup from the raw mood entries.
+
+Creates the table if needed, then replaces every rollup row with one
+INSERT ... SELECT ... GROUP BY (user, UTC day) in a single transaction.
+On PostgreSQL the rollup table is locked for the rebuild, so mood
+check-ins logged meanwhile wait and are added on top afterwards. Safe to
+run again at any time.
+
+Usage:
+    poetry run python -m app.utils.backfill_mood_rollups
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import Base, engine
+from app.models import MoodDailyRollup, MoodEntry
+
+
+async def backfill(db_engine: AsyncEngine = engine) -> int:
+    """Rebuild all daily rollups; returns the number of rows written."""
+    rollup = MoodDailyRollup.__table__
+    # UTC day of each entry: a type cast on PostgreSQL, a function on SQLite
+    day = func.date(MoodEntry.created_at)
+
+    async with db_engine.begin() as conn:
+        # Step 1: Create the table on databases initialized before it existed
+        await conn.run_sync(Base.metadata.create_all, tables=[rollup])
+
+        # Step 2: Hold concurrent log_mood upserts until the rebuild commits
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("LOCK TABLE mood_daily_rollup IN EXCLUSIVE MODE"))
+
+        # Step 3: Replace every row with aggregates of the raw entries
+        await conn.execute(rollup.delete())
+        result = await conn.execute(
+            rollup.insert().from_select(
+                ["user_id", "day", "entry_count", "score_sum", "score_min", "score_max"],
+                select(
+                    MoodEntry.user_id,
+                    day,
+                    func.count(),
+                    func.sum(MoodEntry.score),
+                    func.min(MoodEntry.score),
+                    func.max(MoodEntry.score),
+                ).group_by(MoodEntry.user_id, day),
+            )
+        )
+        return result.rowcount
+
+
+def main():
+    """Entry point for the script."""
+    print("🚀 Backfilling mood rollups...")
+    print(f"    Engine: {engine.url}")
+
+    async def run():
+        try:
+            return await backfill()
+        finally:
+            await engine.dispose()
+
+    start = time.perf_counter()
+    try:
+        rows = asyncio.run(run())
+    except Exception as e:
+        print(f"❌ Failed to backfill mood rollups: {e}")
+        sys.exit(1)
+    print(f"✅ Wrote {rows} daily rollups in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
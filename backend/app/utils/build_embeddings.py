@@ -0,0 +1,78 @@
+"""
+Embedding store build script.
+Writes the resource embeddings to a new memory-mapped store version.
+
+Resources that already have an embedding column value reuse it; the rest
+are encoded with the sentence-transformer model (pass --reencode to encode
+everything). Running workers pick up the new version on their next
+resource index refresh.
+
+Usage:
+    poetry run python -m app.utils.build_embeddings [--reencode] [--keep N]
+"""
+
+import asyncio
+import sys
+
+import numpy as np
+from sqlalchemy import select
+
+from app.database import async_session_maker, engine
+from app.models import Resource
+from app.services import embedding_store
+from app.services.embeddings import generate_embeddings_batch
+
+
+async def build_store(reencode: bool = False, keep: int = 3) -> str:
+    """Collect (or encode) resource embeddings and publish a new store version."""
+    async with async_session_maker() as session:
+        resources = (await session.execute(select(Resource))).scalars().all()
+    if not resources:
+        raise RuntimeError("No resources found; seed the catalog first")
+
+    # Step 1: Reuse stored embeddings where possible
+    embeddings = [None if reencode else r.embedding for r in resources]
+    to_encode = [i for i, emb in enumerate(embeddings) if not emb]
+
+    # Step 2: Encode the rest in one batch
+    if to_encode:
+        print(f"🧮 Encoding {len(to_encode)} resources...")
+        texts = [f"{resources[i].title}. {resources[i].description}" for i in to_encode]
+        encoded = generate_embeddings_batch(texts)
+        if encoded is None:
+            raise RuntimeError("sentence-transformers not installed; cannot encode resources")
+        for i, emb in zip(to_encode, encoded):
+            embeddings[i] = emb
+
+    dims = {len(emb) for emb in embeddings}
+    if len(dims) != 1:
+        raise RuntimeError(f"Inconsistent embedding dimensions: {sorted(dims)}")
+
+    # Step 3: Write and publish
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    # Rows edited after the newest one read here are stale in this version
+    built_at = max((r.updated_at for r in resources if r.updated_at), default=None)
+    return embedding_store.write_store([str(r.id) for r in resources], matrix, keep=keep, built_at=built_at)
+
+
+def main():
+    """Entry point for the script."""
+    reencode = "--reencode" in sys.argv
+    keep = int(sys.argv[sys.argv.index("--keep") + 1]) if "--keep" in sys.argv else 3
+
+    async def run():
+        try:
+            return await build_store(reencode=reencode, keep=keep)
+        finally:
+            await engine.dispose()
+
+    try:
+        version = asyncio.run(run())
+    except Exception as e:
+        print(f"❌ Failed to build embedding store: {e}")
+        sys.exit(1)
+    print(f"✅ Published embedding store {version} in {embedding_store.EMBEDDING_STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+In-process caching utilities.
+
+LRUCache is a size-bounded least-recently-used map with optional TTL,
+an optional memory cap, hit/miss/eviction counters and an approximate
+memory total. It is meant
+to be used from the event loop thread only.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterator, Optional, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Size-bounded LRU cache with optional per-entry TTL."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        max_memory: Optional[int] = None,  # Bytes, as measured by sizeof
+    ):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.max_memory = max_memory
+
+        # key -> (value, expires_at, size_bytes)
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (marking it recently used) or default."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        value, expires_at, _ = entry
+        if expires_at and expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Insert or replace a value, evicting least recently used entries."""
+        if key in self._data:
+            self._remove(key)
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+        size = self.sizeof(value)
+        self._data[key] = (value, expires_at, size)
+        self._memory += size
+        while len(self._data) > self.maxsize or (
+            self.max_memory is not None and self._memory > self.max_memory and self._data
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key (explicit invalidation) and return its value."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        self._remove(key)
+        return entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._memory = 0
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Iterate live entries without affecting recency or counters."""
+        now = time.monotonic()
+        for key, (value, expires_at, _) in list(self._data.items()):
+            if not expires_at or expires_at > now:
+                yield key, value
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self._memory -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key, _MISSING)
+        return entry is not _MISSING and (not entry[1] or entry[1] > time.monotonic())
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "memory_bytes": self._memory,
+            "max_memory_bytes": self.max_memory,
+        }
@@ -0,0 +1,51 @@
+"""
+Intent model export script.
+Converts the pickled sklearn Pipeline to the compact memory-mapped format.
+
+Checks that the exported model predicts the same labels and probabilities
+as the pickle on every training pattern before reporting success.
+
+Usage:
+    poetry run python -m app.utils.export_intent_model
+"""
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from app.services.intent import COMPACT_MODEL_PATH, MODEL_PATH
+from app.services.intent_model import export_pipeline, load_model
+
+INTENTS_PATH = Path(__file__).parent.parent / "ml" / "intents.json"
+
+
+def main():
+    """Entry point for the script."""
+    if not MODEL_PATH.exists():
+        print(f"❌ No pickled model at {MODEL_PATH}")
+        sys.exit(1)
+
+    with open(MODEL_PATH, "rb") as f:
+        pipeline = pickle.load(f)
+    export_pipeline(pipeline, COMPACT_MODEL_PATH)
+    compact = load_model(COMPACT_MODEL_PATH)
+
+    # Parity check on the training patterns
+    with open(INTENTS_PATH) as f:
+        texts = [p for intent in json.load(f)["intents"] for p in intent["patterns"]]
+    expected = pipeline.predict_proba(texts)
+    actual = compact.predict_proba(texts)
+    if list(pipeline.classes_) != list(compact.classes_) or not np.allclose(expected, actual, atol=1e-9):
+        COMPACT_MODEL_PATH.unlink()
+        print("❌ Exported model does not match the pickle; removed it")
+        sys.exit(1)
+
+    print(f"✅ Exported {MODEL_PATH.name} -> {COMPACT_MODEL_PATH.name} "
+          f"({len(compact.vocab)} terms, {len(compact.classes_)} classes, parity on {len(texts)} patterns)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import sys # Cmnd line arguments
 from sqlalchemy import text # SQLAlchemy handles raw SQL strings safely
 
 from app.database import engine, Base
-from app.models import User, Conversation, Message, MoodEntry, Assessment, Resource  # noqa: F401
+from app.models import User, Conversation, Message, MoodEntry, MoodDailyRollup, Assessment, Resource  # noqa: F401
 
 
 async def check_connection() -> bool:
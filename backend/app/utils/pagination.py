@@ -0,0 +1,48 @@
+"""
+Keyset pagination helpers.
+
+A cursor is the (timestamp, id) sort key of the last row a client saw,
+encoded as URL-safe base64 JSON. The next page is the rows strictly after
+it in (timestamp DESC, id DESC) order, which a composite index on
+(parent, timestamp, id) serves without an OFFSET scan.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.sql import ColumnElement
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(timestamp: datetime, row_id: uuid.UUID) -> str:
+    payload = json.dumps([timestamp.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Sort key of a cursor; raises a 400 if it was not produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), uuid.UUID(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def before_cursor(timestamp_column, id_column, cursor: Optional[str]) -> Optional[ColumnElement]:
+    """WHERE clause for the rows after cursor in descending order, or None for the first page."""
+    if cursor is None:
+        return None
+    timestamp, row_id = decode_cursor(cursor)
+    return tuple_(timestamp_column, id_column) < tuple_(timestamp, row_id)
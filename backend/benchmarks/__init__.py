@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks for performance-sensitive services.
+
+Run from the backend directory, e.g.:
+    poetry run python -m benchmarks.crisis_scanner
+"""
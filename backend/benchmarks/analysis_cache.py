@@ -0,0 +1,96 @@
+"""
+NLP analysis cache benchmark.
+
+Replays a chat-like traffic mix (a Zipf-distributed set of short phrases
+plus unique longer messages and a few crisis messages) through the
+intent/sentiment/crisis stages, once with the analysis cache disabled and
+once enabled, and reports hit rate, CPU time and per-message latency.
+
+Usage:
+    poetry run python -m benchmarks.analysis_cache
+"""
+
+import asyncio
+import random
+import statistics
+import time
+
+from app.services import chatbot
+from app.services.analysis_cache import AnalysisCache
+from app.services.batching import intent_batcher, sentiment_batcher
+from app.services.executor import nlp_executor
+
+MESSAGES = 5000
+SHORT_PHRASES = [
+    "hi", "hello", "hey", "thanks", "thank you", "ok", "okay", "yes", "no",
+    "not really", "sure", "bye", "good night", "i'm fine", "i feel sad",
+    "i'm stressed", "can't sleep", "kind of", "maybe", "i don't know",
+    "that helps", "not sure", "nope", "i'm tired", "so anxious",
+]
+CRISIS_MESSAGES = ["i want to die", "i am thinking about suicide"]
+SHORT_SHARE = 0.8  # the rest are unique, longer messages
+CRISIS_SHARE = 0.01
+
+
+def traffic(rng: random.Random) -> list:
+    weights = [1 / (rank + 1) for rank in range(len(SHORT_PHRASES))]
+    messages = []
+    for i in range(MESSAGES):
+        roll = rng.random()
+        if roll < CRISIS_SHARE:
+            messages.append(rng.choice(CRISIS_MESSAGES))
+        elif roll < SHORT_SHARE:
+            phrase = rng.choices(SHORT_PHRASES, weights)[0]
+            messages.append(phrase.capitalize() if rng.random() < 0.3 else phrase)
+        else:
+            messages.append(f"message {i}: work has been really hard this week and i keep overthinking it")
+    return messages
+
+
+async def replay(messages: list, cache: AnalysisCache) -> dict:
+    chatbot.analysis_cache = cache
+    latencies = []
+    cpu_start = time.process_time()
+    for message in messages:
+        start = time.perf_counter()
+        cached = cache.get(message)
+        run = await chatbot.StageGraph(chatbot._analysis_stages(message, cached)).run()
+        if cached is None:
+            chatbot._remember_analysis(message, run)
+        assert run.results["crisis"].severity >= 8 or message not in CRISIS_MESSAGES
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        "cpu_s": time.process_time() - cpu_start,
+        "p50_ms": statistics.median(latencies),
+        "mean_ms": statistics.fmean(latencies),
+        "stats": cache.stats(),
+    }
+
+
+async def run_benchmark():
+    messages = traffic(random.Random(0))
+    await replay(messages[:200], AnalysisCache(enabled=False))  # warm models and executors
+
+    off = await replay(messages, AnalysisCache(enabled=False))
+    on = await replay(messages, AnalysisCache())
+
+    await intent_batcher.close()
+    await sentiment_batcher.close()
+    nlp_executor.shutdown()
+
+    stats = on["stats"]
+    print(f"{len(messages)} messages ({nlp_executor.kind} NLP executor)")
+    print(f"{'':>10} {'CPU s':>7} {'p50 ms':>8} {'mean ms':>8}")
+    for name, result in (("no cache", off), ("cache", on)):
+        print(f"{name:>10} {result['cpu_s']:>7.2f} {result['p50_ms']:>8.3f} {result['mean_ms']:>8.3f}")
+    print(f"\nhit rate {stats['hit_rate']:.1%}, {stats['size']} entries, {stats['skipped']} skipped "
+          f"(long or crisis-positive), audit failures {stats['audit_failures']}")
+    print(f"stage time saved {stats['ms_saved']:.0f} ms, crisis re-checks on hits {stats['audit_ms']:.1f} ms")
+
+
+def main():
+    asyncio.run(run_benchmark())
+
+
+if __name__ == "__main__":
+    main()
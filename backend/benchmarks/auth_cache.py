@@ -0,0 +1,118 @@
+"""
+Auth cache benchmark.
+
+Runs concurrent clients against GET /auth/me and GET /mood/today (mounted
+on a throwaway SQLite database) with the auth cache off and on, counting
+the SQL statements each request issues. Also checks that deactivating a
+user through the ORM takes effect on the very next request.
+
+Usage:
+    poetry run python -m benchmarks.auth_cache
+"""
+
+import asyncio
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base, get_db
+from app.models import User
+from app.routes import auth, mood
+from app.routes.auth import create_access_token
+from app.services.auth_cache import auth_cache
+
+USERS = 50
+CLIENTS = 32
+REQUESTS_PER_CLIENT = 100
+PATHS = ["/auth/me", "/mood/today"]
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+async def load(client: httpx.AsyncClient, tokens: list, counter: StatementCounter) -> dict:
+    async def worker(i: int):
+        for n in range(REQUESTS_PER_CLIENT):
+            token = tokens[(i + n) % len(tokens)]
+            response = await client.get(PATHS[n % len(PATHS)], headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200, response.text
+
+    statements = counter.count
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(CLIENTS)))
+    elapsed = time.perf_counter() - start
+    requests = CLIENTS * REQUESTS_PER_CLIENT
+    return {
+        "rps": requests / elapsed,
+        "queries_per_request": (counter.count - statements) / requests,
+    }
+
+
+async def run_benchmark(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_maker() as session:
+        users = [User(email=f"user{i}@example.com", username=f"user{i}", hashed_password="x") for i in range(USERS)]
+        session.add_all(users)
+        await session.commit()
+    tokens = [create_access_token({"sub": str(u.id)}, timedelta(hours=1)) for u in users]
+
+    async def sqlite_db():
+        async with session_maker() as session:
+            yield session
+            await session.commit()
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/auth")
+    app.include_router(mood.router, prefix="/mood")
+    app.dependency_overrides[get_db] = sqlite_db
+    counter = StatementCounter(engine)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        auth_cache.enabled = False
+        await load(client, tokens, counter)  # warm-up
+        off = await load(client, tokens, counter)
+        auth_cache.enabled = True
+        auth_cache.clear()
+        on = await load(client, tokens, counter)
+
+        print(f"{CLIENTS} clients x {REQUESTS_PER_CLIENT} requests, {USERS} users, paths {PATHS}")
+        print(f"{'':>10} {'req/s':>8} {'queries/req':>12}")
+        for name, result in (("no cache", off), ("cache", on)):
+            print(f"{name:>10} {result['rps']:>8.0f} {result['queries_per_request']:>12.2f}")
+        print(f"queries saved per request: {off['queries_per_request'] - on['queries_per_request']:.2f}")
+        print(f"cache stats: {auth_cache.stats()}")
+
+        # Deactivation must be visible immediately, not after the TTL
+        async with session_maker() as session:
+            user = (await session.execute(select(User).where(User.id == users[0].id))).scalar_one()
+            user.is_active = False
+            await session.commit()
+        response = await client.get("/auth/me", headers={"Authorization": f"Bearer {tokens[0]}"})
+        print(f"after deactivating user0: GET /auth/me -> {response.status_code}")
+        assert response.status_code == 401
+
+    await engine.dispose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_benchmark(Path(tmp) / "auth.db"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Cold start benchmark.
+
+Imports app.main in fresh interpreters and reports the wall time, whether
+any heavy ML library got imported along the way, and the slowest
+top-level imports from `python -X importtime`.
+
+Usage:
+    poetry run python -m benchmarks.cold_start
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ["sklearn", "textblob", "nltk", "sentence_transformers", "torch"]
+RUNS = 5
+TOP = 10
+
+PROBE = (
+    "import sys; import app.main; "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def main():
+    timings = []
+    loaded = ""
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+        loaded = result.stdout.strip()
+    print(f"import app.main: median {statistics.median(timings):.0f} ms over {RUNS} runs "
+          f"(min {min(timings):.0f} ms)")
+    print(f"heavy modules imported: {loaded or 'none'}")
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, check=True,
+    )
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    top_level = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        if not name.startswith("  "):  # nested imports are indented
+            top_level.append((int(parts[1]) / 1000, name.strip()))
+    print(f"\n{'cumulative ms':>14}  module")
+    for ms, name in sorted(top_level, reverse=True)[:TOP]:
+        print(f"{ms:>14.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
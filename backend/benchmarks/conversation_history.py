@@ -0,0 +1,179 @@
+"""
+Conversation history benchmark.
+
+Seeds a throwaway SQLite database with one long-running user (many
+conversations, many messages each), then compares the old history query
+(selectinload of every message of 20 conversations) and the old
+unbounded conversation fetch with the keyset-paginated endpoints:
+latency and response size. Finally sends a few messages
+through /chat/send and checks the denormalized summary columns.
+
+Usage:
+    poetry run python -m benchmarks.conversation_history
+"""
+
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.database import Base, get_db
+from app.models import Conversation, Message, User
+from app.routes import chat
+from app.routes.auth import create_access_token
+
+CONVERSATIONS = 200
+MESSAGES_PER_CONVERSATION = 300
+MESSAGE_TEXT = "I have been feeling a bit overwhelmed at work lately and I can't switch off in the evenings. " * 3
+REPEATS = 20
+
+
+async def seed(session_maker) -> User:
+    start = datetime(2024, 1, 1)
+    async with session_maker() as session:
+        user = User(email="long@example.com", username="long", hashed_password="x")
+        session.add(user)
+        await session.flush()
+        for c in range(CONVERSATIONS):
+            created = start + timedelta(days=c)
+            conversation = Conversation(
+                user_id=user.id,
+                created_at=created,
+                updated_at=created + timedelta(minutes=MESSAGES_PER_CONVERSATION),
+                message_count=MESSAGES_PER_CONVERSATION,
+                last_message_preview=MESSAGE_TEXT[:120],
+            )
+            session.add(conversation)
+            await session.flush()
+            session.add_all([
+                Message(
+                    conversation_id=conversation.id,
+                    role="user" if m % 2 == 0 else "assistant",
+                    content=MESSAGE_TEXT,
+                    crisis_severity=0,
+                    created_at=created + timedelta(minutes=m),
+                )
+                for m in range(MESSAGES_PER_CONVERSATION)
+            ])
+        await session.commit()
+    return user
+
+
+async def measure(name: str, fetch) -> None:
+    latencies = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        payload = await fetch()
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(f"{name:>34} {statistics.median(latencies):>8.1f} {len(payload) / 1024:>9.1f}")
+
+
+async def run_benchmark(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user = await seed(session_maker)
+    token = create_access_token({"sub": str(user.id)}, timedelta(hours=1))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def sqlite_db():
+        async with session_maker() as session:
+            yield session
+            await session.commit()
+
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/chat")
+    app.dependency_overrides[get_db] = sqlite_db
+
+    async def old_history():
+        async with session_maker() as session:
+            result = await session.execute(
+                select(Conversation)
+                .where(Conversation.user_id == user.id)
+                .options(selectinload(Conversation.messages))
+                .order_by(Conversation.updated_at.desc())
+                .limit(20)
+            )
+            return json.dumps([
+                {"id": str(c.id), "messages": [{"id": str(m.id), "content": m.content} for m in c.messages]}
+                for c in result.scalars().all()
+            ])
+
+    async def old_conversation():
+        async with session_maker() as session:
+            result = await session.execute(
+                select(Conversation)
+                .where(Conversation.id == newest_id)
+                .options(selectinload(Conversation.messages))
+            )
+            conversation = result.scalar_one()
+            return json.dumps([{"id": str(m.id), "content": m.content} for m in conversation.messages])
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        first = (await client.get("/chat/history", headers=headers)).json()
+        newest_id = uuid.UUID(first["items"][0]["id"])
+
+        async def new_history():
+            return (await client.get("/chat/history", headers=headers)).content
+
+        async def deep_history():
+            return (await client.get(f"/chat/history?cursor={first['next_cursor']}", headers=headers)).content
+
+        async def new_conversation():
+            return (await client.get(f"/chat/conversation/{newest_id}", headers=headers)).content
+
+        print(f"{CONVERSATIONS} conversations x {MESSAGES_PER_CONVERSATION} messages, median of {REPEATS} calls")
+        print(f"{'':>34} {'ms':>8} {'KiB':>9}")
+        await measure("history, selectinload (old)", old_history)
+        await measure("history, first page", new_history)
+        await measure("history, second page", deep_history)
+        await measure("conversation, all messages (old)", old_conversation)
+        await measure("conversation, first page", new_conversation)
+
+        # Walk the whole history; every conversation must appear exactly once
+        seen, cursor = [], None
+        while True:
+            url = "/chat/history?limit=37" + (f"&cursor={cursor}" if cursor else "")
+            page = (await client.get(url, headers=headers)).json()
+            seen += [item["id"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == CONVERSATIONS
+        print(f"\npaged through {len(seen)} conversations without gaps or repeats")
+
+        # Summary columns are maintained by the chat pipeline
+        conversation_id = None
+        for text in ("hello", "i feel hopeless and want to die", "thanks"):
+            body = {"content": text, "conversation_id": conversation_id}
+            response = await client.post("/chat/send", json=body, headers=headers)
+            assert response.status_code == 200, response.text
+            conversation_id = response.json()["conversation_id"]
+        summary = (await client.get("/chat/history?limit=1", headers=headers)).json()["items"][0]
+        assert summary["id"] == conversation_id
+        print(f"after 3 sends: message_count={summary['message_count']}, "
+              f"max_crisis_severity={summary['max_crisis_severity']}, "
+              f"preview={summary['last_message_preview']!r}")
+        assert summary["message_count"] == 6 and summary["max_crisis_severity"] >= 8
+
+    await engine.dispose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_benchmark(Path(tmp) / "history.db"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Conversation memory benchmark.
+
+Plays a 100-turn conversation through generate_response against the fake
+Ollama server (with a per-token prefill delay, so prompt size shows up as
+latency) on a throwaway SQLite database, three ways:
+- no memory: each message sent alone (the old behavior)
+- full history: every previous turn re-sent verbatim
+- bounded memory: recent turns plus the rolling summary
+
+Reports prompt tokens and per-turn latency (memory load, LLM call and
+persistence), then checks that a cold load rebuilds the same context.
+
+Usage:
+    poetry run python -m benchmarks.conversation_memory
+"""
+
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import Conversation, Message, User
+from app.services import chatbot, llm
+from app.services.conversation_memory import ConversationMemory, Turn
+from app.services.response_cache import response_cache
+from app.services.sentiment import SentimentResult
+from benchmarks.fake_ollama import FakeOllama
+
+TURNS = 100
+REPORT_AT = [1, 5, 10, 25, 50, 100]
+PREFILL_MS_PER_TOKEN = 1.0
+REPLY = (
+    "That sounds really draining, and it makes sense that you're feeling worn down. "
+    "What part of it has been weighing on you the most? "
+    "Sometimes naming one small thing helps it feel more manageable."
+)
+SENTENCES = [
+    "Work has been piling up and my manager keeps adding deadlines.",
+    "I haven't been sleeping well, maybe five hours a night.",
+    "My sister and I argued about taking care of our mom again.",
+    "I tried the breathing exercise you mentioned and it helped a little.",
+    "Honestly I just feel tired all the time.",
+    "ok",
+    "thanks",
+    "I keep replaying the conversation with my friend in my head.",
+    "Running in the morning used to help but I stopped going.",
+    "I'm worried I'll lose my job if this project slips.",
+    "Weekends feel empty since I moved to the new city.",
+    "I don't know, it's hard to explain.",
+]
+SENTIMENT = SentimentResult(compound_score=-0.3, polarity=-0.3, subjectivity=0.6, label="negative")
+
+
+def conversation(rng: random.Random) -> list:
+    return [
+        " ".join(rng.sample(SENTENCES, rng.randint(1, 3)))
+        for _ in range(TURNS)
+    ]
+
+
+async def play(strategy: str, messages: list, session_maker, fake: FakeOllama, memory: ConversationMemory) -> dict:
+    async with session_maker() as db:
+        user = User(email=f"{strategy}@example.com", username=strategy.replace(" ", "_"), hashed_password="x")
+        db.add(user)
+        await db.flush()
+        conversation = Conversation(user_id=user.id)
+        db.add(conversation)
+        await db.commit()
+    conversation_id = conversation.id
+
+    latencies, prompt_tokens = [], []
+    for message in messages:
+        start = time.perf_counter()
+        async with session_maker() as db:
+            state, history = None, None
+            if strategy == "bounded memory":
+                state = await memory.load(conversation_id, db)
+                history = memory.context(state)
+            elif strategy == "full history":
+                result = await db.execute(
+                    select(Message.role, Message.content)
+                    .where(Message.conversation_id == conversation_id)
+                    .order_by(Message.created_at, Message.id)
+                )
+                rows = result.all()
+                users = [content for role, content in rows if role == "user"]
+                replies = [content for role, content in rows if role == "assistant"]
+                turns = [Turn(user=u, assistant=a) for u, a in zip(users, replies)]
+                history = "\n".join(turn.render() for turn in turns) or None
+
+            response_cache.clear()  # Measure the model call, not repeats of earlier messages
+            reply = await llm.generate_response(
+                user_message=message,
+                intent="unknown",
+                sentiment=SENTIMENT,
+                conversation_id=conversation_id,
+                history=history,
+            )
+            user_msg = Message(conversation_id=conversation_id, role="user", content=message)
+            bot_msg = Message(conversation_id=conversation_id, role="assistant", content=reply)
+            db.add_all([user_msg, bot_msg])
+            await db.flush()
+            state = memory.record(conversation_id, state, message, reply)
+            await db.execute(chatbot._touch_conversation(conversation_id, user_msg, bot_msg, state))
+            await db.commit()
+        latencies.append((time.perf_counter() - start) * 1000)
+        prompt_tokens.append(fake.prompt_tokens[-1])
+    return {"latency_ms": latencies, "prompt_tokens": prompt_tokens, "conversation_id": conversation_id}
+
+
+async def run_benchmark(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    fake = await FakeOllama(response_text=REPLY, prefill_ms_per_token=PREFILL_MS_PER_TOKEN).start()
+    llm.OLLAMA_BASE_URL = fake.url
+    messages = conversation(random.Random(0))
+    memory = ConversationMemory()
+
+    results = {}
+    for strategy in ("no memory", "full history", "bounded memory"):
+        results[strategy] = await play(strategy, messages, session_maker, fake, memory)
+
+    print(f"{TURNS}-turn conversation, fake LLM prefill {PREFILL_MS_PER_TOKEN} ms/token, "
+          f"memory: {memory.recent_turns} recent turns, {memory.token_budget}-token budget")
+    print("\nprompt tokens at turn")
+    print(f"{'':>16}" + "".join(f"{n:>7}" for n in REPORT_AT) + f"{'total':>9}")
+    for strategy, result in results.items():
+        tokens = result["prompt_tokens"]
+        print(f"{strategy:>16}" + "".join(f"{tokens[n - 1]:>7}" for n in REPORT_AT) + f"{sum(tokens):>9}")
+    print("\nlatency ms at turn")
+    print(f"{'':>16}" + "".join(f"{n:>7}" for n in REPORT_AT) + f"{'p50':>9}")
+    for strategy, result in results.items():
+        latency = result["latency_ms"]
+        print(f"{strategy:>16}" + "".join(f"{latency[n - 1]:>7.0f}" for n in REPORT_AT)
+              + f"{statistics.median(latency):>9.0f}")
+
+    # A cold load (another worker, or after eviction) rebuilds the same context
+    conversation_id = results["bounded memory"]["conversation_id"]
+    async with session_maker() as db:
+        warm = memory.context(await memory.load(conversation_id, db))
+        memory.clear()
+        cold = memory.context(await memory.load(conversation_id, db))
+    assert warm == cold, "cold load differs from warm state"
+    print(f"\ncold reload matches warm state; cache stats {memory.stats()}")
+    print(f"\nfinal bounded context:\n{cold}")
+
+    await llm.close_http_client()
+    await fake.stop()
+    await engine.dispose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_benchmark(Path(tmp) / "memory.db"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Crisis scanner micro-benchmark.
+
+Compares the compiled Aho-Corasick scanner in detect_crisis against the
+previous per-keyword substring loop, at 1x, 10x and 100x the shipped
+lexicon size.
+
+Usage:
+    poetry run python -m benchmarks.crisis_scanner
+"""
+
+import copy
+import random
+import re
+import string
+import time
+
+from app.services import crisis
+from app.services.crisis import CRISIS_KEYWORDS, NEGATION_PATTERNS, CONTEXT_PATTERNS, detect_crisis
+
+SCALES = [1, 10, 100]
+MESSAGE_LENGTHS = [200, 5000]
+ITERATIONS = 200
+
+FILLER = (
+    "today was long and i keep thinking about work and my family, "
+    "i am not sure what to do next but talking helps a little. "
+)
+
+
+def legacy_detect(text: str, keywords: dict) -> list:
+    """The original O(keywords x length) loop, kept for comparison."""
+    text_lower = text.lower()
+    any(re.search(pattern, text_lower) for pattern in NEGATION_PATTERNS)
+    any(re.search(pattern, text_lower) for pattern in CONTEXT_PATTERNS)
+    matched = []
+    for config in keywords.values():
+        for keyword in config["keywords"]:
+            if keyword in text_lower:
+                matched.append(keyword)
+    return matched
+
+
+def scaled_lexicon(scale: int, rng: random.Random) -> dict:
+    """Pad every category with synthetic phrases up to scale x its size."""
+    keywords = copy.deepcopy(CRISIS_KEYWORDS)
+    for config in keywords.values():
+        extra = len(config["keywords"]) * (scale - 1)
+        for _ in range(extra):
+            words = [
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+                for _ in range(rng.randint(1, 3))
+            ]
+            config["keywords"].append(" ".join(words))
+    return keywords
+
+
+def make_message(length: int) -> str:
+    text = (FILLER * (length // len(FILLER) + 1))[: length - 40]
+    return text + " i feel hopeless and overwhelmed today"
+
+
+def _throughput(fn, text: str) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(text)
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'lexicon':>8} {'msg chars':>9} {'legacy msg/s':>14} {'compiled msg/s':>15} {'speedup':>8}")
+    try:
+        for scale in SCALES:
+            keywords = scaled_lexicon(scale, rng)
+            crisis.reload_lexicon(keywords=keywords)
+            size = sum(len(c["keywords"]) for c in keywords.values())
+            for length in MESSAGE_LENGTHS:
+                message = make_message(length)
+                legacy = _throughput(lambda t: legacy_detect(t, keywords), message)
+                compiled = _throughput(detect_crisis, message)
+                print(f"{size:>8} {length:>9} {legacy:>14,.0f} {compiled:>15,.0f} {compiled / legacy:>7.1f}x")
+    finally:
+        crisis.reload_lexicon()
+
+
+if __name__ == "__main__":
+    main()
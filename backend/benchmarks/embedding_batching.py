@@ -0,0 +1,73 @@
+"""
+Embedding batching benchmark.
+
+Measures encodes per second for the sentence-transformer model at batch
+sizes 1, 8, 32 and 128: first calling encode_batch directly, then going
+through EmbeddingService with that many concurrent embed() calls so the
+batcher has to coalesce them. A final pass repeats the same texts to show
+the query-embedding cache.
+
+Usage:
+    poetry run python -m benchmarks.embedding_batching
+"""
+
+import asyncio
+import time
+
+from app.services.batching import MicroBatcher
+from app.services.embedding_service import EmbeddingService, _encode_rows
+from app.services.embeddings import EMBEDDING_MODEL, encode_batch
+from app.services.executor import BoundedExecutor
+
+BATCH_SIZES = [1, 8, 32, 128]
+TOTAL = 512
+
+
+def make_texts(n: int, offset: int = 0) -> list:
+    return [f"I have been feeling anxious about work lately, message {offset + i}" for i in range(n)]
+
+
+def direct_rate(batch_size: int) -> float:
+    texts = make_texts(TOTAL)
+    start = time.perf_counter()
+    for i in range(0, TOTAL, batch_size):
+        encode_batch(texts[i:i + batch_size])
+    return TOTAL / (time.perf_counter() - start)
+
+
+async def service_rate(batch_size: int) -> tuple:
+    executor = BoundedExecutor("bench", "thread", max_workers=1, max_queue=TOTAL)
+    service = EmbeddingService(
+        MicroBatcher("bench", _encode_rows, max_batch_size=batch_size, max_wait_ms=2, executor=executor),
+        cache_size=TOTAL,
+    )
+    texts = make_texts(TOTAL, offset=batch_size * TOTAL)
+    start = time.perf_counter()
+    for i in range(0, TOTAL, batch_size):
+        # batch_size concurrent callers, like simultaneous requests
+        await service.embed_many(texts[i:i + batch_size])
+    cold = TOTAL / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await service.embed_many(texts)
+    cached = TOTAL / (time.perf_counter() - start)
+
+    await service.close()
+    executor.shutdown()
+    return cold, cached, service.batcher.stats()["avg_batch_size"]
+
+
+def main():
+    if encode_batch(["warm up"]) is None:
+        print("sentence-transformers not installed; nothing to benchmark.")
+        return
+    print(f"model {EMBEDDING_MODEL}, {TOTAL} texts per run")
+    print(f"{'batch':>6} {'direct enc/s':>13} {'service enc/s':>14} {'avg batch':>10} {'cached enc/s':>13}")
+    for batch_size in BATCH_SIZES:
+        direct = direct_rate(batch_size)
+        cold, cached, avg_batch = asyncio.run(service_rate(batch_size))
+        print(f"{batch_size:>6} {direct:>13.0f} {cold:>14.0f} {avg_batch:>10.1f} {cached:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
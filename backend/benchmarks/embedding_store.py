@@ -0,0 +1,104 @@
+"""
+Embedding store memory benchmark.
+
+Starts several worker processes (standing in for uvicorn workers) that
+each load the same catalog embeddings, either the old way (JSON lists
+parsed into Python floats plus a private float32 matrix) or by memory-
+mapping a published embedding store, then runs one query so every page
+is touched. Reports per-worker RSS and PSS growth; PSS divides shared
+pages between the processes mapping them, so it shows the real cost.
+
+Usage:
+    poetry run python -m benchmarks.embedding_store [--rows N] [--workers N]
+"""
+
+import json
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services import embedding_store
+from app.services.embeddings import normalize_rows
+
+DIM = 384
+
+
+def memory_kb() -> dict:
+    """Rss and Pss of this process in kB (Linux /proc)."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key.lower()] = int(rest.split()[0])
+    return values
+
+
+def worker(mode: str, source: str, start_barrier, done_barrier, results) -> None:
+    before = memory_kb()
+    start = time.perf_counter()
+    start_barrier.wait()
+    if mode == "json":
+        with open(source) as f:
+            lists = json.load(f)
+        matrix = normalize_rows(np.asarray(lists, dtype=np.float32))
+        keep = (lists, matrix)
+    else:
+        store = embedding_store.open_store(Path(source))
+        matrix = store.matrix
+        keep = store
+    load_ms = (time.perf_counter() - start) * 1000
+    matrix @ np.ones(DIM, dtype=np.float32)  # fault in every page
+    # Measure once all workers have mapped the file so PSS reflects sharing
+    done_barrier.wait()
+    after = memory_kb()
+    results.put((mode, load_ms, after["rss"] - before["rss"], after["pss"] - before["pss"]))
+    done_barrier.wait()
+    del keep
+
+
+def run_workers(mode: str, source: str, workers: int) -> list:
+    ctx = mp.get_context("spawn")
+    start_barrier, done_barrier = ctx.Barrier(workers), ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker, args=(mode, source, start_barrier, done_barrier, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    out = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return out
+
+
+def main():
+    rows = int(sys.argv[sys.argv.index("--rows") + 1]) if "--rows" in sys.argv else 20_000
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 4
+
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((rows, DIM)).astype(np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "embeddings.json"
+        json_path.write_text(json.dumps(embeddings.tolist()))
+        store_root = Path(tmp) / "store"
+        version = embedding_store.write_store([str(i) for i in range(rows)], embeddings, root=store_root)
+
+        print(f"{rows:,} x {DIM} float32 ({embeddings.nbytes / 2**20:.1f} MiB), "
+              f"{workers} workers, store {version}")
+        print(f"{'mode':>6} {'load ms':>9} {'RSS MiB/worker':>15} {'PSS MiB/worker':>15} {'PSS total MiB':>14}")
+        for mode, source in (("json", json_path), ("mmap", store_root)):
+            results = run_workers(mode, str(source), workers)
+            load_ms = np.mean([r[1] for r in results])
+            rss = np.mean([r[2] for r in results]) / 1024
+            pss = np.mean([r[3] for r in results]) / 1024
+            print(f"{mode:>6} {load_ms:>9.1f} {rss:>15.1f} {pss:>15.1f} {pss * workers:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Embedding similarity benchmark.
+
+Compares the previous pure-Python cosine/top-k implementation with the
+NumPy EmbeddingMatrix at 1k, 10k and 100k candidates of 384 dimensions
+(all-MiniLM-L6-v2 size), for single and batched queries.
+
+Usage:
+    poetry run python -m benchmarks.embeddings
+"""
+
+import math
+import time
+
+import numpy as np
+
+from app.services.embeddings import EmbeddingMatrix, find_most_similar
+
+DIM = 384
+CANDIDATES = [1_000, 10_000, 100_000]
+TOP_K = 5
+BATCH = 32
+
+
+def legacy_similarity(embedding1, embedding2) -> float:
+    dot_product = sum(a * b for a, b in zip(embedding1, embedding2))
+    magnitude1 = math.sqrt(sum(a ** 2 for a in embedding1))
+    magnitude2 = math.sqrt(sum(b ** 2 for b in embedding2))
+    if magnitude1 == 0 or magnitude2 == 0:
+        return 0.0
+    return dot_product / (magnitude1 * magnitude2)
+
+
+def legacy_find_most_similar(query, candidates, top_k=5):
+    similarities = [(i, legacy_similarity(query, emb)) for i, emb in enumerate(candidates)]
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+def timed(fn, repeat: int) -> float:
+    """Best-of-repeat wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'candidates':>10} {'legacy ms':>10} {'wrapper ms':>11} {'matrix ms':>10} "
+          f"{'batch/query ms':>15} {'speedup':>8}")
+    for n in CANDIDATES:
+        array = rng.standard_normal((n, DIM)).astype(np.float32)
+        queries = rng.standard_normal((BATCH, DIM)).astype(np.float32)
+        as_lists = array.tolist()
+        query = queries[0].tolist()
+
+        matrix = EmbeddingMatrix(array)
+        expected = [i for i, _ in legacy_find_most_similar(query, as_lists, TOP_K)]
+        assert [i for i, _ in matrix.top_k(query, TOP_K)] == expected
+
+        repeat = 1 if n >= 100_000 else 3
+        legacy = timed(lambda: legacy_find_most_similar(query, as_lists, TOP_K), repeat)
+        wrapper = timed(lambda: find_most_similar(query, as_lists, TOP_K), repeat)
+        prebuilt = timed(lambda: matrix.top_k(query, TOP_K), 20)
+        batched = timed(lambda: matrix.top_k(queries, TOP_K), 10) / BATCH
+        print(f"{n:>10,} {legacy:>10.1f} {wrapper:>11.2f} {prebuilt:>10.3f} "
+              f"{batched:>15.3f} {legacy / prebuilt:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
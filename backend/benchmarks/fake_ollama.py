@@ -0,0 +1,103 @@
+"""
+Minimal in-process stand-in for the Ollama HTTP API.
+
+Speaks just enough HTTP/1.1 (with keep-alive) to serve /api/generate and
+/api/tags, so benchmarks can measure client-side overhead without a model.
+An optional per-token prefill delay makes longer prompts proportionally
+slower, like a real model evaluating its prompt. Responses carry a
+`context` array; when a request passes one back, its tokens count as
+already evaluated (an ideal runner that still holds that prefix in its KV
+cache) and only the new prompt is charged.
+"""
+
+import asyncio
+import json
+import math
+from typing import List, Optional
+
+
+class FakeOllama:
+    """Async HTTP server answering like Ollama after a fixed generation delay."""
+
+    def __init__(
+        self,
+        response_text: str = "I hear you. Tell me more.",
+        delay: float = 0.0,
+        prefill_ms_per_token: float = 0.0,
+    ):
+        self.response_text = response_text
+        self.delay = delay
+        self.prefill_ms_per_token = prefill_ms_per_token
+        self.prompt_tokens: List[int] = []  # Tokens evaluated per generate (estimated at 4 chars/token)
+        self.connections = 0
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> "FakeOllama":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=1024)
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                body = b""
+                if "content-length" in headers:
+                    body = await reader.readexactly(int(headers["content-length"]))
+
+                self.requests += 1
+                payload = await self.respond(method, path, json.loads(body) if body else {})
+                data = json.dumps(payload).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(data)).encode() + b"\r\n"
+                    b"Connection: keep-alive\r\n\r\n" + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method: str, path: str, body: dict) -> dict:
+        if path == "/api/tags":
+            return {"models": [{"name": "llama3.2:latest"}]}
+        context = body.get("context") or []
+        evaluated = math.ceil(len(body.get("prompt", "")) / 4)
+        if not context:
+            # The system prompt is only applied to a fresh context
+            evaluated += math.ceil(len(body.get("system", "")) / 4)
+        self.prompt_tokens.append(evaluated)
+        prefill = evaluated * self.prefill_ms_per_token / 1000
+        if self.delay + prefill:
+            await asyncio.sleep(self.delay + prefill)
+        new_tokens = evaluated + math.ceil(len(self.response_text) / 4)
+        return {
+            "model": body.get("model"),
+            "response": self.response_text,
+            "done": True,
+            "context": context + list(range(len(context), len(context) + new_tokens)),
+            "prompt_eval_count": evaluated,
+            "prompt_eval_duration": int(prefill * 1e9),  # Nanoseconds, like Ollama
+        }
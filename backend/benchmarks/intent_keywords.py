@@ -0,0 +1,87 @@
+"""
+Keyword intent fallback benchmark.
+
+Compares the compiled KeywordIntentClassifier with the previous
+first-substring-hit loop over INTENT_KEYWORDS, at the shipped keyword set
+and at 10x and 100x its size, and shows where the two disagree on the
+shipped set (substring false positives such as "hi" inside "this").
+
+Usage:
+    poetry run python -m benchmarks.intent_keywords
+"""
+
+import copy
+import random
+import string
+import time
+
+from app.services.intent import INTENT_KEYWORDS, KeywordIntentClassifier
+
+SCALES = [1, 10, 100]
+ITERATIONS = 2000
+
+MESSAGES = [
+    "hello there, how are you",
+    "i know this is silly but i think i need to talk",
+    "thanks so much, that really helps",
+    "can you recommend something for sleep",
+    "i have been feeling really low today and nothing helps",
+    "nope, not really, never mind",
+    "this week has been long and i keep thinking about everything that happened at work",
+    "ok bye for now, take care",
+]
+
+
+def legacy_classify(text: str, keywords: dict) -> str:
+    """The original loop: first substring hit in dict order wins."""
+    text_lower = text.lower()
+    for intent, words in keywords.items():
+        for keyword in words:
+            if keyword in text_lower:
+                return intent
+    return "unknown"
+
+
+def scaled_keywords(scale: int, rng: random.Random) -> dict:
+    """Pad every intent with synthetic keywords up to scale x its size."""
+    keywords = copy.deepcopy(INTENT_KEYWORDS)
+    for words in keywords.values():
+        for _ in range(len(words) * (scale - 1)):
+            n_words = rng.randint(1, 3)
+            words.append(" ".join(
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 8))) for _ in range(n_words)
+            ))
+    return keywords
+
+
+def per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for message in MESSAGES:
+            fn(message)
+    return (time.perf_counter() - start) / (ITERATIONS * len(MESSAGES)) * 1e6
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'scale':>6} {'keywords':>9} {'loop us':>8} {'compiled us':>12} {'speedup':>8}")
+    for scale in SCALES:
+        keywords = scaled_keywords(scale, rng)
+        classifier = KeywordIntentClassifier(keywords)
+        legacy = per_call_us(lambda m: legacy_classify(m, keywords))
+        compiled = per_call_us(classifier.classify)
+        total = sum(len(words) for words in keywords.values())
+        print(f"{scale:>5}x {total:>9} {legacy:>8.2f} {compiled:>12.2f} {legacy / compiled:>7.1f}x")
+
+    print("\nLabel differences on the shipped keywords:")
+    classifier = KeywordIntentClassifier(INTENT_KEYWORDS)
+    for message in MESSAGES:
+        old, new = legacy_classify(message, INTENT_KEYWORDS), classifier.classify(message)
+        if old != new.label:
+            alternatives = ", ".join(f"{label} {conf:.2f}" for label, conf in new.alternatives)
+            print(f"  {message!r}: loop={old} compiled={new.label} {new.confidence:.2f}"
+                  + (f" (alt: {alternatives})" if alternatives else ""))
+
+
+if __name__ == "__main__":
+    main()
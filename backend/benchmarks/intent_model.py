@@ -0,0 +1,111 @@
+"""
+Intent model format benchmark.
+
+Fits the intent pipeline on ml/intents.json, saves it both as a pickle and
+in the compact memory-mapped format, checks that labels and probabilities
+match, then compares load time and single/batched prediction latency.
+
+Usage:
+    poetry run python -m benchmarks.intent_model
+"""
+
+import json
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services.intent import fit_intent_pipeline
+from app.services.intent_model import export_pipeline, load_model
+
+INTENTS_PATH = Path(__file__).parent.parent / "app" / "ml" / "intents.json"
+EXTRA_TEXTS = [
+    "I can't stop worrying about my exams",
+    "thanks so much, that really helped",
+    "where can I find a therapist near me",
+    "completely unrelated words zebra quantum",
+    "",
+]
+BATCH = 32
+COLD_RUNS = 5
+
+# Fresh interpreter: includes importing sklearn for the pickle path
+COLD_LOAD = {
+    "pickle": "import pickle; pickle.load(open({path!r}, 'rb'))",
+    "compact": "from app.services.intent_model import load_model; load_model({path!r})",
+}
+
+
+def timed_ms(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def cold_load_ms(kind: str, path: Path) -> float:
+    code = (
+        "import time; start = time.perf_counter(); "
+        + COLD_LOAD[kind].format(path=str(path))
+        + "; print((time.perf_counter() - start) * 1000)"
+    )
+    samples = [
+        float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+        for _ in range(COLD_RUNS)
+    ]
+    return statistics.median(samples)
+
+
+def main():
+    with open(INTENTS_PATH) as f:
+        intents = json.load(f)["intents"]
+    data = [(p, intent["tag"]) for intent in intents for p in intent["patterns"]]
+    pipeline = fit_intent_pipeline(data)
+    texts = [text for text, _ in data] + EXTRA_TEXTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path, compact_path = Path(tmp) / "model.pkl", Path(tmp) / "model.bin"
+        with open(pickle_path, "wb") as f:
+            pickle.dump(pipeline, f)
+        export_pipeline(pipeline, compact_path)
+        compact = load_model(compact_path)
+
+        # Parity
+        expected, actual = pipeline.predict_proba(texts), compact.predict_proba(texts)
+        assert list(pipeline.classes_) == list(compact.classes_)
+        assert (pipeline.predict(texts) == compact.predict(texts)).all()
+        max_diff = float(np.abs(expected - actual).max())
+        assert max_diff < 1e-9, max_diff
+        print(f"parity: {len(texts)} texts, identical labels, max |p diff| = {max_diff:.1e}")
+        print(f"file size: pickle {pickle_path.stat().st_size / 1024:.1f} KiB, "
+              f"compact {compact_path.stat().st_size / 1024:.1f} KiB")
+
+        def load_pickle():
+            with open(pickle_path, "rb") as f:
+                pickle.load(f)
+
+        cold = (cold_load_ms("pickle", pickle_path), cold_load_ms("compact", compact_path))
+        rows = [
+            ("load (warm)", timed_ms(load_pickle, 50), timed_ms(lambda: load_model(compact_path), 50)),
+            ("predict x1", timed_ms(lambda: pipeline.predict_proba(texts[:1]), 500),
+             timed_ms(lambda: compact.predict_proba(texts[:1]), 500)),
+            (f"predict x{BATCH}", timed_ms(lambda: pipeline.predict_proba(texts[:BATCH]), 200),
+             timed_ms(lambda: compact.predict_proba(texts[:BATCH]), 200)),
+        ]
+
+    print(f"\n{'':>12} {'pickle p50 ms':>14} {'compact p50 ms':>15} {'speedup':>8}")
+    print(f"{'load (cold)':>12} {cold[0]:>14.1f} {cold[1]:>15.1f} {cold[0] / cold[1]:>7.1f}x")
+    for name, legacy, new in rows:
+        legacy_ms, new_ms = statistics.median(legacy), statistics.median(new)
+        print(f"{name:>12} {legacy_ms:>14.3f} {new_ms:>15.3f} {legacy_ms / new_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Ollama KV context reuse benchmark.
+
+Plays the 100-turn conversation from benchmarks.conversation_memory
+(every fifth turn answered by a template, as the chatbot does for known
+intents) against the fake Ollama server, with and without reusing the
+returned `context`. The fake charges a per-token prefill delay only for
+tokens not already in the passed context, so the difference is the
+prompt evaluation a real runner would skip.
+
+Also checks that changing the system prompt drops every stored context.
+
+Usage:
+    poetry run python -m benchmarks.kv_context
+"""
+
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import Conversation, Message, User
+from app.services import chatbot, llm
+from app.services.conversation_memory import ConversationMemory
+from app.services.kv_context import kv_context_store
+from app.services.response_cache import response_cache
+from benchmarks.conversation_memory import PREFILL_MS_PER_TOKEN, REPLY, SENTIMENT, conversation
+from benchmarks.fake_ollama import FakeOllama
+
+TEMPLATE_EVERY = 5
+TEMPLATE_REPLY = "Thank you for sharing. It takes courage to express how we feel."
+
+
+async def play(name: str, messages: list, session_maker, fake: FakeOllama) -> dict:
+    memory = ConversationMemory()
+    async with session_maker() as db:
+        user = User(email=f"{name}@example.com", username=name, hashed_password="x")
+        db.add(user)
+        await db.flush()
+        conversation = Conversation(user_id=user.id)
+        db.add(conversation)
+        await db.commit()
+    conversation_id = conversation.id
+
+    latencies, evaluated = [], []
+    for n, message in enumerate(messages, start=1):
+        start = time.perf_counter()
+        async with session_maker() as db:
+            state = await memory.load(conversation_id, db)
+            if n % TEMPLATE_EVERY == 0:
+                reply = TEMPLATE_REPLY
+            else:
+                response_cache.clear()  # Measure the model call, not repeats of earlier messages
+                reply = await llm.generate_response(
+                    user_message=message,
+                    intent="unknown",
+                    sentiment=SENTIMENT,
+                    conversation_id=conversation_id,
+                    history=memory.context(state),
+                    message_count=state.message_count,
+                )
+                evaluated.append(fake.prompt_tokens[-1])
+            user_msg = Message(conversation_id=conversation_id, role="user", content=message)
+            bot_msg = Message(conversation_id=conversation_id, role="assistant", content=reply)
+            db.add_all([user_msg, bot_msg])
+            await db.flush()
+            state = memory.record(conversation_id, state, message, reply)
+            await db.execute(chatbot._touch_conversation(conversation_id, user_msg, bot_msg, state))
+            await db.commit()
+        if n % TEMPLATE_EVERY:
+            latencies.append((time.perf_counter() - start) * 1000)
+    return {"latency_ms": latencies, "evaluated": evaluated}
+
+
+async def run_benchmark(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    fake = await FakeOllama(response_text=REPLY, prefill_ms_per_token=PREFILL_MS_PER_TOKEN).start()
+    llm.OLLAMA_BASE_URL = fake.url
+    messages = conversation(random.Random(0))
+
+    kv_context_store.enabled = False
+    off = await play("no_reuse", messages, session_maker, fake)
+    kv_context_store.enabled = True
+    on = await play("reuse", messages, session_maker, fake)
+
+    print(f"{len(messages)} turns ({len(off['evaluated'])} through the model), "
+          f"fake prefill {PREFILL_MS_PER_TOKEN} ms/token, context cap {kv_context_store.max_tokens} tokens")
+    print(f"{'':>18} {'eval tokens':>12} {'prefill s':>10} {'p50 ms':>8} {'mean ms':>8}")
+    for name, result in (("memory prompt", off), ("KV context reuse", on)):
+        tokens = sum(result["evaluated"])
+        print(f"{name:>18} {tokens:>12} {tokens * PREFILL_MS_PER_TOKEN / 1000:>10.2f} "
+              f"{statistics.median(result['latency_ms']):>8.0f} {statistics.fmean(result['latency_ms']):>8.0f}")
+    saved = 1 - sum(on["evaluated"]) / sum(off["evaluated"])
+    print(f"prompt evaluation saved: {saved:.0%}")
+    print(f"store stats: {kv_context_store.stats()}")
+
+    # A new system prompt must not be answered from contexts built with the old one
+    llm.SYSTEM_PROMPT += "\n8. Be brief."
+    await play("new_prompt", messages[:2], session_maker, fake)
+    assert kv_context_store.stats()["invalidations"] == 1
+    print(f"after a system prompt change: {kv_context_store.stats()['invalidations']} invalidation, "
+          f"first turn evaluated {fake.prompt_tokens[-2]} tokens, second {fake.prompt_tokens[-1]}")
+
+    await llm.close_http_client()
+    await fake.stop()
+    await engine.dispose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_benchmark(Path(tmp) / "kv.db"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Ollama client pooling benchmark.
+
+Runs 100+ concurrent chats against a local fake Ollama server and compares
+the old client-per-request pattern with the shared pooled client used by
+generate_response, reporting per-request overhead and connections opened.
+The response cache is disabled so every pooled turn reaches the server.
+
+Usage:
+    poetry run python -m benchmarks.llm_client
+"""
+
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.services import llm, response_cache
+from app.services.sentiment import SentimentResult
+from benchmarks.fake_ollama import FakeOllama
+
+CONCURRENCY = [100, 200]
+REQUESTS_PER_CHAT = 5
+
+SENTIMENT = SentimentResult(compound_score=-0.2, polarity=-0.2, subjectivity=0.5, label="negative")
+
+
+async def per_request_client(url: str) -> None:
+    """The previous pattern: a fresh AsyncClient for every LLM turn."""
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.post(
+            f"{url}/api/generate",
+            json={"model": llm.OLLAMA_MODEL, "prompt": "hi", "stream": False},
+        )
+        response.json()
+
+
+async def pooled_client(url: str) -> None:
+    await llm.generate_response(
+        user_message="I just feel off today",
+        intent="unknown",
+        sentiment=SENTIMENT,
+        conversation_id=0,
+    )
+
+
+async def run(fn, url: str, concurrency: int) -> dict:
+    latencies = []
+
+    async def chat():
+        for _ in range(REQUESTS_PER_CHAT):
+            start = time.perf_counter()
+            await fn(url)
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(chat() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "req_s": len(latencies) / elapsed,
+    }
+
+
+async def main():
+    # Every pooled turn repeats one message; measure the HTTP round trip, not cache hits
+    response_cache.LLM_CACHE_ENABLED = False
+    print(f"{'chats':>5} {'client':>12} {'mean ms':>8} {'p99 ms':>8} {'req/s':>8} {'conns':>6}")
+    for concurrency in CONCURRENCY:
+        for name in ("per-request", "pooled"):
+            server = await FakeOllama().start()
+            llm.OLLAMA_BASE_URL = server.url
+            await llm.start_http_client()
+            try:
+                fn = per_request_client if name == "per-request" else pooled_client
+                r = await run(fn, server.url, concurrency)
+            finally:
+                await llm.close_http_client()
+                await server.stop()
+            print(
+                f"{concurrency:>5} {name:>12} {r['mean_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+                f"{r['req_s']:>8,.0f} {server.connections:>6}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Login storm benchmark.
+
+Drives the real app (on a throwaway SQLite database) with a burst of
+concurrent /auth/login requests while one client keeps calling
+/chat/send, and probes event-loop lag with a 1 ms sleep ticker. Runs the
+storm once with bcrypt on the event loop (password executor "inline", the
+old behavior) and once on the bounded password executor.
+
+Usage:
+    poetry run python -m benchmarks.login_storm
+"""
+
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base, get_db
+from app.main import app
+from app.models import User
+from app.routes.auth import create_access_token, get_password_hash
+from app.services.executor import password_executor
+
+PASSWORD = "correct horse battery"
+LOGIN_CLIENTS = 16
+PHASE_SECONDS = 3.0
+PROBE_INTERVAL = 0.001
+
+
+def percentiles(samples: list) -> str:
+    if not samples:
+        return "-"
+    p50, p99 = statistics.median(samples), statistics.quantiles(samples, n=100)[98] if len(samples) > 1 else samples[0]
+    return f"{p50:7.1f} {p99:7.1f}"
+
+
+async def phase(client: httpx.AsyncClient, token: str, storm: bool) -> dict:
+    stop = time.perf_counter() + PHASE_SECONDS
+    chat_ms, lag_ms, logins = [], [], {"ok": 0, "rejected": 0}
+
+    async def probe():
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lag_ms.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+    async def chatter():
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            response = await client.post(
+                "/chat/send", json={"content": "hello"}, headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 200, response.text
+            chat_ms.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.01)
+
+    async def login():
+        while time.perf_counter() < stop:
+            response = await client.post("/auth/login", data={"username": "storm@example.com", "password": PASSWORD})
+            if response.status_code == 429:
+                logins["rejected"] += 1
+                await asyncio.sleep(0.05)
+            else:
+                logins["ok"] += 1
+
+    tasks = [probe(), chatter()] + ([login() for _ in range(LOGIN_CLIENTS)] if storm else [])
+    await asyncio.gather(*tasks)
+    return {"chat": chat_ms, "lag": lag_ms, **logins}
+
+
+async def run_benchmark(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_maker() as session:
+        user = User(email="storm@example.com", username="storm", hashed_password=get_password_hash(PASSWORD))
+        session.add(user)
+        await session.commit()
+    token = create_access_token({"sub": str(user.id)}, timedelta(hours=1))
+
+    async def sqlite_db():
+        async with session_maker() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = sqlite_db
+    rows = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=60) as client:
+        await phase(client, token, storm=False)  # warm up models and caches
+        rows.append(("idle", await phase(client, token, storm=False)))
+        password_executor.kind = "inline"
+        rows.append(("storm, bcrypt on loop", await phase(client, token, storm=True)))
+        password_executor.kind = "thread"
+        rows.append(("storm, executor", await phase(client, token, storm=True)))
+    await engine.dispose()
+    password_executor.shutdown()
+
+    print(f"{LOGIN_CLIENTS} login clients, {PHASE_SECONDS:.0f}s per phase, "
+          f"password executor {password_executor.max_workers} workers + {password_executor.max_queue} queued")
+    print(f"{'':>22} {'chat p50':>8} {'p99 ms':>7} {'lag p50':>8} {'p99 ms':>7} {'logins':>7} {'429s':>5}")
+    for name, result in rows:
+        print(f"{name:>22} {percentiles(result['chat']):>16} {percentiles(result['lag']):>16} "
+              f"{result['ok']:>7} {result['rejected']:>5}")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_benchmark(Path(tmp) / "storm.db"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Mood history benchmark.
+
+Seeds a throwaway SQLite database with users holding 10k+ hourly mood
+entries and times the /mood/history handler against the previous
+implementation (entries query, separate AVG query, trend computed over
+the ORM list), both building the same response model: the default 30-day
+window, the full history, and entries=false. Checks that both
+implementations agree.
+
+Usage:
+    poetry run python -m benchmarks.mood_history
+"""
+
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import MoodEntry, User
+from app.routes.mood import get_mood_history
+from app.schemas import MoodHistoryResponse, MoodResponse
+
+USERS = 3
+ENTRIES_PER_USER = 12_000  # Hourly check-ins, about 16 months
+REPEATS = 10
+
+
+async def old_history(db: AsyncSession, user_id, days: int) -> MoodHistoryResponse:
+    """The previous get_mood_history: two queries and a Python-side trend."""
+    since = datetime.utcnow() - timedelta(days=days)
+    result = await db.execute(
+        select(MoodEntry)
+        .where(MoodEntry.user_id == user_id, MoodEntry.created_at >= since)
+        .order_by(MoodEntry.created_at.desc())
+    )
+    entries = result.scalars().all()
+    avg_result = await db.execute(
+        select(func.avg(MoodEntry.score))
+        .where(MoodEntry.user_id == user_id, MoodEntry.created_at >= since)
+    )
+    average_score = avg_result.scalar()
+    trend = None
+    if len(entries) >= 4:
+        mid = len(entries) // 2
+        recent_avg = sum(e.score for e in entries[:mid]) / mid
+        older_avg = sum(e.score for e in entries[mid:]) / (len(entries) - mid)
+        if recent_avg > older_avg + 0.5:
+            trend = "improving"
+        elif recent_avg < older_avg - 0.5:
+            trend = "declining"
+        else:
+            trend = "stable"
+    return MoodHistoryResponse(
+        entries=[MoodResponse.model_validate(e) for e in entries],
+        average_score=round(average_score, 1) if average_score else None,
+        trend=trend,
+    )
+
+
+async def timed(fn) -> tuple:
+    latencies = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = await fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), result
+
+
+async def run_benchmark(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    async with session_maker() as session:
+        users = [User(email=f"mood{i}@example.com", username=f"mood{i}", hashed_password="x") for i in range(USERS)]
+        session.add_all(users)
+        await session.flush()
+        for user in users:
+            await session.execute(insert(MoodEntry), [
+                {
+                    "user_id": user.id,
+                    "score": min(10, max(1, round(5 + 2 * rng.gauss(0, 1) + (h < 300) * 1.5))),
+                    "notes": "slept ok, busy day" if h % 7 == 0 else None,
+                    "created_at": now - timedelta(hours=h),
+                }
+                for h in range(ENTRIES_PER_USER)
+            ])
+        await session.commit()
+    user = users[0]
+
+    print(f"{USERS} users x {ENTRIES_PER_USER} hourly entries, median of {REPEATS} calls")
+    print(f"{'':>28} {'old ms':>8} {'new ms':>8}")
+    for days in (30, 600):
+        async def old():
+            async with session_maker() as session:
+                return await old_history(session, user.id, days)
+
+        async def new(entries: bool = True):
+            async with session_maker() as session:
+                return await get_mood_history(user_id=user.id, db=session, days=days, entries=entries)
+
+        old_ms, old_result = await timed(old)
+        new_ms, new_result = await timed(new)
+        aggregates_ms, aggregates = await timed(lambda: new(entries=False))
+
+        assert [e.id for e in new_result.entries] == [e.id for e in old_result.entries]
+        for result in (new_result, aggregates):
+            assert result.average_score == old_result.average_score
+            assert result.trend == old_result.trend
+        label = f"{days} days ({new_result.entry_count} entries)"
+        print(f"{label:>28} {old_ms:>8.1f} {new_ms:>8.1f}")
+        print(f"{'entries=false':>28} {'':>8} {aggregates_ms:>8.1f}")
+    print(f"\nresults match the old implementation (trend {new_result.trend!r}, "
+          f"recent {aggregates.recent_average} vs older {aggregates.older_average})")
+
+    await engine.dispose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_benchmark(Path(tmp) / "mood.db"))
+
+
+if __name__ == "__main__":
+    main()
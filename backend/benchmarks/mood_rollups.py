@@ -0,0 +1,140 @@
+"""
+Mood rollup benchmark.
+
+Seeds a throwaway SQLite database with users checking in hourly for a
+year, backfills mood_daily_rollup, then times one-year day/week/month
+summaries read from the rollups (the /mood/summary handler) against the
+same aggregates recomputed from raw mood entries. Also logs new entries
+through the /mood/log handler and checks that the upserted rollup still
+matches the raw data.
+
+Usage:
+    poetry run python -m benchmarks.mood_rollups
+"""
+
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import MoodDailyRollup, MoodEntry, User
+from app.routes.mood import get_mood_summary, log_mood
+from app.schemas import MoodCreate
+from app.services.mood_rollup import merge_buckets
+from app.utils.backfill_mood_rollups import backfill
+
+USERS = 5
+HOURS = 365 * 24  # Hourly check-ins for a year
+WINDOW_DAYS = 365
+REPEATS = 20
+NEW_ENTRIES = 50
+
+
+async def raw_summary(db: AsyncSession, user_id, bucket: str) -> list:
+    """The same buckets recomputed from raw entries (GROUP BY day over the window)."""
+    since = (datetime.utcnow() - timedelta(days=WINDOW_DAYS)).date()
+    day = func.date(MoodEntry.created_at)
+    result = await db.execute(
+        select(
+            day.label("day"),
+            func.count().label("entry_count"),
+            func.sum(MoodEntry.score).label("score_sum"),
+            func.min(MoodEntry.score).label("score_min"),
+            func.max(MoodEntry.score).label("score_max"),
+        )
+        .where(MoodEntry.user_id == user_id, MoodEntry.created_at >= datetime.combine(since, datetime.min.time()))
+        .group_by(day)
+        .order_by(day)
+    )
+    rows = [
+        MoodDailyRollup(day=datetime.strptime(r.day, "%Y-%m-%d").date(), entry_count=r.entry_count,
+                        score_sum=r.score_sum, score_min=r.score_min, score_max=r.score_max)
+        for r in result.all()
+    ]
+    return merge_buckets(rows, bucket)
+
+
+async def timed(fn) -> tuple:
+    latencies = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = await fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), result
+
+
+async def run_benchmark(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    async with session_maker() as session:
+        users = [User(email=f"hourly{i}@example.com", username=f"hourly{i}", hashed_password="x")
+                 for i in range(USERS)]
+        session.add_all(users)
+        await session.flush()
+        for user in users:
+            await session.execute(insert(MoodEntry), [
+                {"user_id": user.id, "score": rng.randint(1, 10), "created_at": now - timedelta(hours=h)}
+                for h in range(HOURS)
+            ])
+        await session.commit()
+    user = users[0]
+
+    start = time.perf_counter()
+    rows = await backfill(engine)
+    print(f"backfill: {rows} daily rollups from {USERS * HOURS} entries in {time.perf_counter() - start:.2f}s")
+
+    print(f"\n{WINDOW_DAYS}-day summary, {HOURS} hourly entries, median of {REPEATS} calls")
+    print(f"{'bucket':>8} {'buckets':>8} {'raw ms':>8} {'rollup ms':>10}")
+    for bucket in ("day", "week", "month"):
+        async def raw():
+            async with session_maker() as session:
+                return await raw_summary(session, user.id, bucket)
+
+        async def rollup():
+            async with session_maker() as session:
+                return await get_mood_summary(user_id=user.id, db=session, bucket=bucket, days=WINDOW_DAYS)
+
+        raw_ms, expected = await timed(raw)
+        rollup_ms, summary = await timed(rollup)
+        assert [(b.start, b.entry_count, b.score_min, b.score_max) for b in expected] == [
+            (b.start, b.entry_count, b.min_score, b.max_score) for b in summary.buckets
+        ]
+        print(f"{bucket:>8} {len(summary.buckets):>8} {raw_ms:>8.1f} {rollup_ms:>10.1f}")
+
+    # New check-ins go through log_mood and land in today's rollup
+    for _ in range(NEW_ENTRIES):
+        async with session_maker() as session:
+            await log_mood(MoodCreate(score=rng.randint(1, 10)), user_id=user.id, db=session)
+    async with session_maker() as session:
+        expected = (await raw_summary(session, user.id, "day"))[-1]
+        summary = await get_mood_summary(user_id=user.id, db=session, bucket="day", days=1)
+    today = summary.buckets[-1]
+    assert (today.start, today.entry_count, today.min_score, today.max_score) == (
+        expected.start, expected.entry_count, expected.score_min, expected.score_max
+    )
+    assert today.average_score == round(expected.average, 2)
+    print(f"\nafter {NEW_ENTRIES} logged check-ins today's rollup matches the raw entries "
+          f"({today.entry_count} entries, avg {today.average_score})")
+
+    await engine.dispose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_benchmark(Path(tmp) / "rollups.db"))
+
+
+if __name__ == "__main__":
+    main()
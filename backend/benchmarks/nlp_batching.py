@@ -0,0 +1,94 @@
+"""
+Intent micro-batching benchmark.
+
+Drives the intent classifier with concurrent closed-loop clients and
+reports throughput against p50/p99 latency for several batch-size and
+wait-time settings. Batch size 1 is the unbatched baseline.
+
+Usage:
+    poetry run python -m benchmarks.nlp_batching
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from app.services import intent
+from app.services.batching import MicroBatcher
+from app.services.intent import classify_intent_batch
+
+CLIENTS = 64
+DURATION_SECONDS = 3.0
+CONFIGS = [  # (max_batch_size, max_wait_ms)
+    (1, 0),
+    (8, 1),
+    (16, 2),
+    (32, 2),
+    (64, 5),
+]
+
+INTENTS_PATH = Path(intent.__file__).parent.parent / "ml" / "intents.json"
+
+
+def build_model() -> tuple:
+    """Fit the production pipeline on intents.json without saving it."""
+    with open(INTENTS_PATH) as f:
+        intents = json.load(f)["intents"]
+    texts = [p for i in intents for p in i["patterns"]]
+    labels = [i["tag"] for i in intents for _ in i["patterns"]]
+    model = Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), max_features=5000)),
+        ("classifier", MultinomialNB()),
+    ])
+    model.fit(texts, labels)
+    return model, texts
+
+
+async def run_config(batch_size: int, wait_ms: float, texts: list) -> dict:
+    batcher = MicroBatcher("bench", classify_intent_batch, batch_size, wait_ms)
+    latencies = []
+    deadline = time.perf_counter() + DURATION_SECONDS
+
+    async def client(seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await batcher.submit(rng.choice(texts))
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(CLIENTS)))
+    elapsed = time.perf_counter() - started
+    await batcher.close()
+
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "avg_batch": batcher.stats()["avg_batch_size"],
+    }
+
+
+async def main():
+    model, texts = build_model()
+    intent._model = model
+    print(f"{CLIENTS} concurrent clients, {DURATION_SECONDS:.0f}s per config")
+    print(f"{'batch':>5} {'wait ms':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'avg batch':>9}")
+    for batch_size, wait_ms in CONFIGS:
+        r = await run_config(batch_size, wait_ms, texts)
+        print(
+            f"{batch_size:>5} {wait_ms:>7} {r['throughput']:>9,.0f} "
+            f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['avg_batch']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+Sentiment engine benchmark.
+
+Checks that the precomputed-lexicon analyzer gives the same polarity and
+subjectivity as TextBlob on ml/intents.json, hand-written edge cases
+(negation, modifiers, "!", emoticons, quotes, abbreviations) and random
+word/punctuation mixes, then compares per-message and batched throughput.
+
+Usage:
+    poetry run python -m benchmarks.sentiment
+"""
+
+import json
+import random
+import time
+from pathlib import Path
+
+from app.services.sentiment import _load_lexicon, analyze_sentiment, analyze_sentiment_batch
+
+INTENTS_PATH = Path(__file__).parent.parent / "app" / "ml" / "intents.json"
+EDGE_CASES = [
+    "",
+    "I am not happy",
+    "this is not a good day",
+    "really not good",
+    "I'm very very sad!!",
+    "I don't feel great, honestly.",
+    "what a terribly long week :( but the weekend was nice :-)",
+    "It's fine (!) totally fine",
+    "\"Great\" she said... 'awful' he said.",
+    "U.S. etc. e.g. Mr. Smith was never happy.\n\nNew paragraph: wonderful!",
+    "<3 <3 xD :D : ) ;-) :'(",
+    "NO!!! Not again... never again?!",
+    "extremely bad, incredibly good, hardly ideal",
+]
+FUZZ_TEXTS = 3000
+ROUNDS = 5
+
+
+def fuzz_corpus(rng: random.Random) -> list:
+    """Random mixes of lexicon words, negations, fillers and punctuation."""
+    vocabulary = list(_load_lexicon())
+    extras = ["not", "no", "never", "n't", "a", "is", "the", "i", "it", "very", "really",
+              "!", "!!", "?", ".", "...", ",", "'", '"', "(!)", ":)", ": (", ":-D", "--", "e.g."]
+    texts = []
+    for _ in range(FUZZ_TEXTS):
+        words = [rng.choice(extras if rng.random() < 0.4 else vocabulary) for _ in range(rng.randint(1, 25))]
+        texts.append(
+            "".join(w if rng.random() < 0.2 else " " + w for w in words).strip()
+            .replace("  ", "\n\n")
+            .capitalize()
+        )
+    return texts
+
+
+def throughput(fn, texts: list) -> float:
+    """Messages per second, best of ROUNDS."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    from textblob import TextBlob
+
+    with open(INTENTS_PATH) as f:
+        patterns = [p for intent in json.load(f)["intents"] for p in intent["patterns"]]
+    texts = patterns + EDGE_CASES + fuzz_corpus(random.Random(0))
+
+    # Parity
+    max_diff, mismatches = 0.0, []
+    for text, result in zip(texts, analyze_sentiment_batch(texts)):
+        expected = TextBlob(text).sentiment
+        diff = max(abs(expected.polarity - result.polarity),
+                   abs(expected.subjectivity - result.subjectivity))
+        max_diff = max(max_diff, diff)
+        if diff > 1e-9:
+            mismatches.append((text, tuple(expected), (result.polarity, result.subjectivity)))
+    print(f"parity: {len(texts)} texts, {len(mismatches)} mismatches, max diff {max_diff:.1e}")
+    for text, expected, actual in mismatches[:10]:
+        print(f"  {text!r}: textblob={expected} engine={actual}")
+
+    # Throughput on realistic chat messages
+    messages = (patterns + EDGE_CASES) * 20
+    rows = [
+        ("TextBlob", throughput(lambda batch: [TextBlob(t).sentiment for t in batch], messages)),
+        ("engine x1", throughput(lambda batch: [analyze_sentiment(t) for t in batch], messages)),
+        ("engine batch (repeats)", throughput(analyze_sentiment_batch, messages)),
+        ("engine batch (unique)", throughput(analyze_sentiment_batch, list(dict.fromkeys(messages)))),
+    ]
+    print(f"\n{'':>22} {'msgs/s':>10} {'us/msg':>8} {'speedup':>8}")
+    for name, rate in rows:
+        print(f"{name:>22} {rate:>10.0f} {1e6 / rate:>8.1f} {rate / rows[0][1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
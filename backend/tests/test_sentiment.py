@@ -0,0 +1,62 @@
+"""
+Sentiment engine tests.
+
+The precomputed-lexicon analyzer must score exactly like TextBlob; the
+corpus is the one benchmarks.sentiment uses (ml/intents.json patterns,
+hand-written edge cases and random word/punctuation mixes).
+
+Usage:
+    poetry run python -m unittest discover tests
+"""
+
+import importlib.util
+import json
+import random
+import unittest
+from unittest import mock
+
+from app.services import sentiment, warmup
+from benchmarks.sentiment import EDGE_CASES, INTENTS_PATH, fuzz_corpus
+
+HAS_TEXTBLOB = importlib.util.find_spec("textblob") is not None
+
+
+@unittest.skipUnless(HAS_TEXTBLOB, "textblob not installed")
+class TextBlobParityTest(unittest.TestCase):
+    def test_matches_textblob(self):
+        from textblob import TextBlob
+
+        with open(INTENTS_PATH) as f:
+            patterns = [p for intent in json.load(f)["intents"] for p in intent["patterns"]]
+        texts = patterns + EDGE_CASES + fuzz_corpus(random.Random(0))
+
+        for text, result in zip(texts, sentiment.analyze_sentiment_batch(texts)):
+            expected = TextBlob(text).sentiment
+            with self.subTest(text=text):
+                self.assertAlmostEqual(result.polarity, expected.polarity, places=9)
+                self.assertAlmostEqual(result.subjectivity, expected.subjectivity, places=9)
+
+
+class MissingLexiconTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            sentiment,
+            SENTIMENT_LEXICON_PATH="/nonexistent/en-sentiment.xml",
+            _lexicon=None,
+            _lexicon_version=None,
+            _lexicon_error=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_error_is_recorded(self):
+        self.assertEqual(sentiment.analyze_sentiment("what a wonderful day").label, "neutral")
+        self.assertIn("/nonexistent/en-sentiment.xml", sentiment.lexicon_error())
+
+    def test_warm_up_fails(self):
+        with self.assertRaisesRegex(RuntimeError, "sentiment lexicon unavailable"):
+            warmup._warm_sentiment()
+
+
+if __name__ == "__main__":
+    unittest.main()